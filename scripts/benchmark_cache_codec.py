@@ -0,0 +1,61 @@
+"""Benchmark the cache codec against pickle for big integers.
+
+Integers are never compressed by the codec, so only the raw layout is
+compared here.
+"""
+
+import argparse
+import pickle
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from infra.codec import decode_value, encode_value  # noqa: E402
+
+FORMATS = {
+    "pickle": (pickle.dumps, pickle.loads),
+    "codec": (encode_value, decode_value),
+}
+
+
+def bench(func, arg, number: int) -> float:
+    """Return the best time per call in microseconds."""
+    timings = timeit.repeat(lambda: func(arg), number=number, repeat=5)
+    return min(timings) / number * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description="Cache codec benchmark")
+    parser.add_argument(
+        "--digits",
+        type=int,
+        nargs="+",
+        default=[1000, 20000],
+        help="Decimal digit counts of the benchmarked integers",
+    )
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        f"{'digits':>8} {'format':>12} {'bytes':>8} "
+        f"{'encode us':>10} {'decode us':>10}"
+    )
+    for digits in args.digits:
+        # A value with the requested digit count and no repeated pattern
+        value = 7 ** int(digits / 0.8450980400142568)
+        for name, (encode, decode) in FORMATS.items():
+            data = encode(value)
+            assert decode(data) == value
+            encode_us = bench(encode, value, args.number)
+            decode_us = bench(decode, data, args.number)
+            print(
+                f"{digits:>8} {name:>12} {len(data):>8} "
+                f"{encode_us:>10.2f} {decode_us:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
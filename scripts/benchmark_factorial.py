@@ -0,0 +1,56 @@
+"""Benchmark factorial engines against the naive loop and math.factorial."""
+
+import argparse
+import math
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.factorial import (  # noqa: E402
+    factorial_binary_split,
+    factorial_iterative,
+)
+
+ENGINES = {
+    "iterative": factorial_iterative,
+    "binary_split": factorial_binary_split,
+    "math.factorial": math.factorial,
+}
+
+
+def bench(func, n: int, repeat: int) -> float:
+    """Return the best time per call in milliseconds."""
+    number = max(1, 2000 // max(n, 1))
+    timings = timeit.repeat(
+        lambda: func(n), number=number, repeat=repeat
+    )
+    return min(timings) / number * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description="Factorial benchmark")
+    parser.add_argument(
+        "--n",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 5000, 20000, 50000],
+        help="Values of n to benchmark",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'n':>8} " + " ".join(f"{name:>16}" for name in ENGINES))
+    for n in args.n:
+        expected = math.factorial(n)
+        timings = []
+        for func in ENGINES.values():
+            assert func(n) == expected
+            timings.append(bench(func, n, args.repeat))
+        print(f"{n:>8} " + " ".join(f"{t:>13.3f} ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
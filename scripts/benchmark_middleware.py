@@ -0,0 +1,126 @@
+"""Benchmark per-request overhead of the request logging middleware.
+
+Drives a bare ASGI endpoint directly (no server, no HTTP parsing) through
+no middleware, the previous BaseHTTPMiddleware implementation and the
+pure ASGI RequestMetricsMiddleware, and reports the added time per
+request. Logging is raised to WARNING so log I/O is not measured.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import PlainTextResponse  # noqa: E402
+
+from api.middleware import RequestMetricsMiddleware  # noqa: E402
+from infra import (  # noqa: E402
+    configure_logging,
+    get_logger,
+    request_count,
+    request_duration,
+)
+
+logger = get_logger(__name__)
+
+
+async def endpoint(scope, receive, send) -> None:
+    """Minimal ASGI app answering every request with 200."""
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+async def log_requests(request, call_next):
+    """The BaseHTTPMiddleware implementation this benchmark compares to."""
+    start_time = time.time()
+    response = await call_next(request)
+    duration = time.time() - start_time
+    logger.info(
+        "HTTP request processed",
+        method=request.method,
+        url=str(request.url),
+        status_code=response.status_code,
+        duration_seconds=duration,
+    )
+    request_count.labels(
+        method=request.method,
+        endpoint=request.url.path,
+        status_code=response.status_code,
+    ).inc()
+    request_duration.labels(
+        method=request.method,
+        endpoint=request.url.path,
+    ).observe(duration)
+    return response
+
+
+APPS = {
+    "none": endpoint,
+    "base_http": BaseHTTPMiddleware(endpoint, dispatch=log_requests),
+    "asgi": RequestMetricsMiddleware(endpoint),
+}
+
+
+def make_scope() -> dict:
+    """Build the scope of a GET request."""
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/fibonacci/10",
+        "raw_path": b"/api/v1/fibonacci/10",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 12345),
+    }
+
+
+async def run(app, requests: int) -> float:
+    """Return the mean time per request in microseconds."""
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter_ns()
+    for _ in range(requests):
+        await app(make_scope(), receive, send)
+    return (time.perf_counter_ns() - start) / requests / 1000
+
+
+async def main_async(requests: int, repeat: int) -> None:
+    """Run every variant and print a table."""
+    baseline = None
+    print(f"{'middleware':>12} {'us/request':>12} {'overhead us':>12}")
+    for name, app in APPS.items():
+        await run(app, min(requests, 1000))  # Warm up
+        best = min([await run(app, requests) for _ in range(repeat)])
+        if baseline is None:
+            baseline = best
+        print(f"{name:>12} {best:>12.2f} {best - baseline:>12.2f}")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="Middleware benchmark")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    configure_logging()
+    asyncio.run(main_async(args.requests, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Load test SQLite write/read throughput with and without tuning.
+
+Runs concurrent writers (one INSERT + COMMIT per operation, like the
+sync durability mode) and readers against a fresh database file, once
+with SQLite defaults and once with the configured PRAGMA profile.
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+
+from domain.models import MathOperation  # noqa: E402
+from infra.db import build_engine, sqlite_pragmas  # noqa: E402
+from repositories.sqlite_repo import (  # noqa: E402
+    Base,
+    MathOperationModel,
+    SqliteRepository,
+)
+
+
+async def run_profile(name: str, pragmas, args) -> None:
+    """Run the workload against a fresh database with the given PRAGMAs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{tmp}/bench.db", pragmas=pragmas)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        errors = 0
+        writes = 0
+        reads = 0
+
+        async def writer(worker: int) -> None:
+            nonlocal errors, writes
+            for i in range(args.writes):
+                operation = MathOperation(
+                    operation_type="fibonacci",
+                    parameters={"n": i, "worker": worker},
+                    result=i,
+                    duration_ms=1.0,
+                    timestamp=datetime.now(timezone.utc),
+                )
+                try:
+                    async with session_factory() as session:
+                        repository = SqliteRepository(
+                            session, durability="sync"
+                        )
+                        await repository.save_operation(operation)
+                    writes += 1
+                except OperationalError:
+                    errors += 1
+
+        async def reader() -> None:
+            nonlocal errors, reads
+            for _ in range(args.reads):
+                try:
+                    async with session_factory() as session:
+                        await session.execute(
+                            select(func.count(MathOperationModel.id))
+                        )
+                    reads += 1
+                except OperationalError:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(writer(w) for w in range(args.writers)),
+            *(reader() for _ in range(args.readers)),
+        )
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+
+    print(
+        f"{name:>8} {writes / elapsed:>12.0f} {reads / elapsed:>12.0f} "
+        f"{errors:>8} {elapsed:>9.2f}s"
+    )
+
+
+async def main() -> None:
+    """Run the load test for both profiles."""
+    parser = argparse.ArgumentParser(description="SQLite load test")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=400)
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':>8} {'writes/s':>12} {'reads/s':>12} "
+        f"{'errors':>8} {'elapsed':>10}"
+    )
+    await run_profile("default", [], args)
+    await run_profile("tuned", sqlite_pragmas(), args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
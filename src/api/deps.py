@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from config import settings
 from domain.models import User
 from infra.db import get_db_session
-from infra.auth import get_username_from_token
+from infra.auth import principal_cache, verify_token
 from repositories.sqlite_repo import SqliteRepository, SqliteUserRepository
 from services.factorial import FactorialService
 from services.fibonacci import FibonacciService
@@ -56,7 +56,11 @@ async def get_current_user(
         SqliteUserRepository, Depends(get_user_repository)
     ] = None,
 ) -> User:
-    """Get current user from JWT token."""
+    """Get current user from JWT token.
+
+    Tokens verified earlier are served from the principal cache without
+    decoding or a user lookup.
+    """
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,7 +68,14 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    username = get_username_from_token(credentials.credentials)
+    token = credentials.credentials
+    if settings.principal_cache_enabled:
+        cached_user = principal_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+
+    payload = verify_token(token)
+    username = payload.get("sub") if payload else None
     if not username:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -81,6 +92,9 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if settings.principal_cache_enabled:
+        principal_cache.set(token, user, token_exp=payload.get("exp"))
+
     return user
 
 
@@ -0,0 +1,116 @@
+"""ASGI middleware for request logging, metrics and API events."""
+
+import time
+from typing import Any, Awaitable, Callable, Dict, MutableMapping
+
+from infra import get_logger, kafka_producer, request_count, request_duration
+
+logger = get_logger(__name__)
+
+# Metric label for requests that matched no route (404s, scanners)
+UNMATCHED_ROUTE = "unmatched"
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+def route_template(scope: Scope) -> str:
+    """Return the path template of the route that handled a request.
+
+    The router stores the matched route in the scope, which this
+    middleware shares with the app it wraps. For routes reached through
+    nested include_router() calls, the route's path_format lacks the
+    outer prefixes; they are the part of the request path in front of
+    what the route matched.
+    """
+    template = getattr(scope.get("route"), "path_format", None)
+    if not template:
+        return UNMATCHED_ROUTE
+
+    try:
+        matched = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope.get("path", "")
+    if not path.endswith(matched):
+        return template
+    return path[: len(path) - len(matched)] + template
+
+
+class RequestMetricsMiddleware:
+    """Log, count and time every HTTP request.
+
+    A plain ASGI middleware: the response streams straight through, and
+    the only per-request work is one perf_counter_ns() pair, a log call,
+    two metric updates and a non-blocking API event enqueue.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
+        response: Dict[str, int] = {"status_code": 500}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status_code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._record(
+                scope["method"],
+                scope["path"],
+                route_template(scope),
+                response["status_code"],
+                (time.perf_counter_ns() - start_ns) / 1e9,
+            )
+
+    @staticmethod
+    def _record(
+        method: str,
+        path: str,
+        route: str,
+        status_code: int,
+        duration: float,
+    ) -> None:
+        """Log the request, update metrics and queue its API event.
+
+        Metrics are labelled by route template so that e.g. every
+        /api/v1/fibonacci/{n} request shares one series.
+        """
+        logger.info(
+            "HTTP request processed",
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_seconds=duration,
+        )
+
+        # Never awaited: dropped if the Kafka pipeline is down or full
+        kafka_producer.submit_api_event(
+            method=method,
+            endpoint=path,
+            status_code=status_code,
+            duration_ms=duration * 1000,
+        )
+
+        request_count.labels(
+            method=method,
+            endpoint=route,
+            status_code=status_code,
+        ).inc()
+
+        request_duration.labels(
+            method=method,
+            endpoint=route,
+        ).observe(duration)
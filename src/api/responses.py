@@ -0,0 +1,34 @@
+"""JSON responses that reuse rendered decimal text."""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+
+def render_json(value: Any) -> str:
+    """Render a JSON document, writing ints through str().
+
+    json.dumps converts int subclasses with int.__repr__, so a DecimalInt
+    result would be converted to decimal again; str() reuses its text.
+    """
+    if isinstance(value, bool) or value is None:
+        return json.dumps(value)
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, dict):
+        items = (
+            f"{json.dumps(str(key))}: {render_json(item)}"
+            for key, item in value.items()
+        )
+        return "{" + ", ".join(items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(render_json(item) for item in value) + "]"
+    return json.dumps(value)
+
+
+class DecimalJSONResponse(JSONResponse):
+    """JSON response whose big-int results are rendered at most once."""
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content).encode("utf-8")
@@ -0,0 +1,30 @@
+"""Helpers for streaming sequence responses."""
+
+from typing import AsyncIterator, Tuple
+
+from fastapi import Request
+
+# How many terms are written between client disconnect checks
+DISCONNECT_CHECK_EVERY = 64
+
+
+async def ndjson_terms(
+    request: Request, terms: AsyncIterator[Tuple[int, int]]
+) -> AsyncIterator[str]:
+    """Render (n, result) terms as NDJSON lines until done or disconnected.
+
+    Lines are written as soon as each term is produced, and the term
+    iterator is closed early when the client goes away.
+    """
+    written = 0
+    try:
+        async for n, result in terms:
+            yield f'{{"n": {n}, "result": {result}}}\n'
+            written += 1
+            if (
+                written % DISCONNECT_CHECK_EVERY == 0
+                and await request.is_disconnected()
+            ):
+                break
+    finally:
+        await terms.aclose()
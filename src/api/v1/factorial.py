@@ -1,11 +1,14 @@
 """Factorial operation API endpoints."""
 
-from typing import Annotated
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, NonNegativeInt
 
 from api.deps import get_factorial_service, get_current_user
+from api.responses import DecimalJSONResponse
+from api.streaming import ndjson_terms
 from domain.models import FactorialRequest, User
 from services.factorial import FactorialService
 
@@ -27,6 +30,25 @@ class FactorialResponseModel(BaseModel):
     result: int = Field(..., description="Factorial result")
 
 
+class FactorialBatchRequestModel(BaseModel):
+    """Request model for a batch of factorial calculations."""
+
+    values: List[NonNegativeInt] = Field(
+        ...,
+        min_length=1,
+        description="Numbers to calculate factorials for",
+        example=[5, 10, 20],
+    )
+
+
+class FactorialBatchResponseModel(BaseModel):
+    """Response model for a batch of factorial calculations."""
+
+    results: List[FactorialResponseModel] = Field(
+        ..., description="Results in request order"
+    )
+
+
 @router.post(
     "/",
     response_model=FactorialResponseModel,
@@ -37,7 +59,7 @@ async def calculate_factorial(
     request: FactorialRequestModel,
     current_user: Annotated[User, Depends(get_current_user)],
     service: Annotated[FactorialService, Depends(get_factorial_service)],
-) -> FactorialResponseModel:
+) -> DecimalJSONResponse:
     """Calculate n! (factorial)."""
     try:
         # Convert to domain model
@@ -46,13 +68,71 @@ async def calculate_factorial(
         # Calculate result
         result = await service.calculate_factorial(domain_request)
 
+        # Return response, reusing the result's rendered decimal text
+        return DecimalJSONResponse({"n": result.n, "result": result.result})
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post(
+    "/batch",
+    response_model=FactorialBatchResponseModel,
+    summary="Calculate factorials in bulk",
+    description="Calculate the factorials of several numbers",
+)
+async def calculate_factorial_batch(
+    request: FactorialBatchRequestModel,
+    current_user: Annotated[User, Depends(get_current_user)],
+    service: Annotated[FactorialService, Depends(get_factorial_service)],
+) -> DecimalJSONResponse:
+    """Calculate factorials of several numbers."""
+    try:
+        # Convert to domain models
+        domain_requests = [FactorialRequest(n=n) for n in request.values]
+
+        # Calculate results
+        results = await service.calculate_factorial_batch(domain_requests)
+
         # Return response
-        return FactorialResponseModel(
-            n=result.n,
-            result=result.result,
+        return DecimalJSONResponse(
+            {
+                "results": [
+                    {"n": result.n, "result": result.result}
+                    for result in results
+                ]
+            }
         )
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Stream a range of factorials",
+    description="Stream start!..end! as newline-delimited JSON",
+)
+async def stream_factorial(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user)],
+    service: Annotated[FactorialService, Depends(get_factorial_service)],
+    end: Annotated[int, Query(ge=0, description="Last number (inclusive)")],
+    start: Annotated[
+        int, Query(ge=0, description="First number (inclusive)")
+    ] = 0,
+) -> StreamingResponse:
+    """Stream factorials for a range of numbers."""
+    try:
+        terms = service.stream_factorial(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        ndjson_terms(request, terms), media_type="application/x-ndjson"
+    )
@@ -1,11 +1,14 @@
 """Fibonacci operation API endpoints."""
 
-from typing import Annotated
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException, Path
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, NonNegativeInt
 
 from api.deps import get_fibonacci_service, get_current_user
+from api.responses import DecimalJSONResponse
+from api.streaming import ndjson_terms
 from domain.models import User
 from services.fibonacci import FibonacciService
 
@@ -19,6 +22,52 @@ class FibonacciResponseModel(BaseModel):
     result: int = Field(..., description="Fibonacci result")
 
 
+class FibonacciBatchRequestModel(BaseModel):
+    """Request model for a batch of Fibonacci calculations."""
+
+    values: List[NonNegativeInt] = Field(
+        ...,
+        min_length=1,
+        description="Positions in Fibonacci sequence",
+        example=[10, 20, 30],
+    )
+
+
+class FibonacciBatchResponseModel(BaseModel):
+    """Response model for a batch of Fibonacci calculations."""
+
+    results: List[FibonacciResponseModel] = Field(
+        ..., description="Results in request order"
+    )
+
+
+# Registered before /{n} so "stream" is not parsed as a position
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Stream a range of Fibonacci numbers",
+    description="Stream F(start)..F(end) as newline-delimited JSON",
+)
+async def stream_fibonacci(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user)],
+    service: Annotated[FibonacciService, Depends(get_fibonacci_service)],
+    end: Annotated[int, Query(ge=0, description="Last position (inclusive)")],
+    start: Annotated[
+        int, Query(ge=0, description="First position (inclusive)")
+    ] = 0,
+) -> StreamingResponse:
+    """Stream Fibonacci numbers for a range of positions."""
+    try:
+        terms = service.stream_fibonacci(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        ndjson_terms(request, terms), media_type="application/x-ndjson"
+    )
+
+
 @router.get(
     "/{n}",
     response_model=FibonacciResponseModel,
@@ -31,16 +80,45 @@ async def calculate_fibonacci(
     ],
     current_user: Annotated[User, Depends(get_current_user)],
     service: Annotated[FibonacciService, Depends(get_fibonacci_service)],
-) -> FibonacciResponseModel:
+) -> DecimalJSONResponse:
     """Calculate nth Fibonacci number."""
     try:
         # Calculate result
         result = await service.calculate_fibonacci(n)
 
+        # Return response, reusing the result's rendered decimal text
+        return DecimalJSONResponse({"n": result.n, "result": result.result})
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post(
+    "/batch",
+    response_model=FibonacciBatchResponseModel,
+    summary="Calculate Fibonacci numbers in bulk",
+    description="Calculate the Fibonacci numbers for several positions",
+)
+async def calculate_fibonacci_batch(
+    request: FibonacciBatchRequestModel,
+    current_user: Annotated[User, Depends(get_current_user)],
+    service: Annotated[FibonacciService, Depends(get_fibonacci_service)],
+) -> DecimalJSONResponse:
+    """Calculate Fibonacci numbers for several positions."""
+    try:
+        # Calculate results
+        results = await service.calculate_fibonacci_batch(request.values)
+
         # Return response
-        return FibonacciResponseModel(
-            n=result.n,
-            result=result.result,
+        return DecimalJSONResponse(
+            {
+                "results": [
+                    {"n": result.n, "result": result.result}
+                    for result in results
+                ]
+            }
         )
 
     except ValueError as e:
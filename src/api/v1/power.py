@@ -1,11 +1,12 @@
 """Power operation API endpoints."""
 
-from typing import Annotated
+from typing import Annotated, List
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 
 from api.deps import get_power_service, get_current_user
+from api.responses import DecimalJSONResponse
 from domain.models import PowerRequest, User
 from services.power import PowerService
 
@@ -29,6 +30,22 @@ class PowerResponseModel(BaseModel):
     result: int = Field(..., description="Calculation result")
 
 
+class PowerBatchRequestModel(BaseModel):
+    """Request model for a batch of power calculations."""
+
+    items: List[PowerRequestModel] = Field(
+        ..., min_length=1, description="Base and exponent pairs"
+    )
+
+
+class PowerBatchResponseModel(BaseModel):
+    """Response model for a batch of power calculations."""
+
+    results: List[PowerResponseModel] = Field(
+        ..., description="Results in request order"
+    )
+
+
 @router.post(
     "/",
     response_model=PowerResponseModel,
@@ -39,7 +56,7 @@ async def calculate_power(
     request: PowerRequestModel,
     current_user: Annotated[User, Depends(get_current_user)],
     service: Annotated[PowerService, Depends(get_power_service)],
-) -> PowerResponseModel:
+) -> DecimalJSONResponse:
     """Calculate base^exponent."""
     try:
         # Convert to domain model
@@ -50,11 +67,55 @@ async def calculate_power(
         # Calculate result
         result = await service.calculate_power(domain_request)
 
+        # Return response, reusing the result's rendered decimal text
+        return DecimalJSONResponse(
+            {
+                "base": result.base,
+                "exponent": result.exponent,
+                "result": result.result,
+            }
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post(
+    "/batch",
+    response_model=PowerBatchResponseModel,
+    summary="Calculate powers in bulk",
+    description="Calculate base raised to exponent for several pairs",
+)
+async def calculate_power_batch(
+    request: PowerBatchRequestModel,
+    current_user: Annotated[User, Depends(get_current_user)],
+    service: Annotated[PowerService, Depends(get_power_service)],
+) -> DecimalJSONResponse:
+    """Calculate base^exponent for several pairs."""
+    try:
+        # Convert to domain models
+        domain_requests = [
+            PowerRequest(base=item.base, exponent=item.exponent)
+            for item in request.items
+        ]
+
+        # Calculate results
+        results = await service.calculate_power_batch(domain_requests)
+
         # Return response
-        return PowerResponseModel(
-            base=result.base,
-            exponent=result.exponent,
-            result=result.result,
+        return DecimalJSONResponse(
+            {
+                "results": [
+                    {
+                        "base": result.base,
+                        "exponent": result.exponent,
+                        "result": result.result,
+                    }
+                    for result in results
+                ]
+            }
         )
 
     except ValueError as e:
@@ -1,6 +1,6 @@
 """Configuration management using Pydantic Settings."""
 
-from typing import Literal
+from typing import Dict, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -14,11 +14,85 @@ class Settings(BaseSettings):
         default="sqlite:///./math_service.db",
         description="Database connection URL",
     )
+    db_pool_size: int = Field(
+        default=5, description="Pooled database connections kept open"
+    )
+    db_max_overflow: int = Field(
+        default=10, description="Extra connections allowed above the pool"
+    )
+
+    # SQLite performance profile (applied to every connection)
+    sqlite_tuning_enabled: bool = Field(
+        default=True, description="Apply the SQLite PRAGMA profile"
+    )
+    sqlite_journal_mode: Literal[
+        "WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"
+    ] = Field(default="WAL", description="SQLite journal mode")
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = Field(
+        default="NORMAL", description="SQLite synchronous level"
+    )
+    sqlite_mmap_size: int = Field(
+        default=256 * 1024 * 1024,
+        description="Bytes of the database file to memory-map",
+    )
+    sqlite_cache_size: int = Field(
+        default=-65536,
+        description="Page cache size (negative values are KiB)",
+    )
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = Field(
+        default="MEMORY", description="Where SQLite keeps temporary tables"
+    )
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000,
+        description="How long a connection waits on a locked database",
+    )
+
+    db_durability_mode: Literal["sync", "write_behind"] = Field(
+        default="write_behind",
+        description=(
+            "Persist math operations immediately (sync) or through the "
+            "batched write-behind buffer"
+        ),
+    )
+    db_write_batch_size: int = Field(
+        default=100, description="Operations per write-behind flush"
+    )
+    db_write_flush_interval_ms: int = Field(
+        default=200, description="Maximum delay before buffered writes flush"
+    )
+    db_write_max_pending: int = Field(
+        default=10000,
+        description="Buffered operations kept before the oldest are dropped",
+    )
 
     # Logging
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = Field(
         default="INFO", description="Logging level"
     )
+    log_max_int_digits: int = Field(
+        default=64,
+        description="Longer integers are logged as a digest, not in full",
+    )
+    log_async_enabled: bool = Field(
+        default=True,
+        description="Write logs from a background thread through a queue",
+    )
+    log_queue_size: int = Field(
+        default=10000,
+        description="Log records buffered before new ones are dropped",
+    )
+    log_sample_rate: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of high-volume info/debug events that are kept",
+    )
+
+    # Metrics
+    metrics_max_series: int = Field(
+        default=1000,
+        description="Series per metric before new label sets share one",
+    )
 
     # API
     api_title: str = Field(default="Math Service API", description="API title")
@@ -40,6 +114,22 @@ class Settings(BaseSettings):
         default=30, description="JWT token expiration in minutes"
     )
 
+    principal_cache_enabled: bool = Field(
+        default=True,
+        description="Cache verified users by token to skip per-request lookups",
+    )
+    principal_cache_ttl: int = Field(
+        default=300,
+        description="Maximum seconds a verified user is cached (never past exp)",
+    )
+    principal_cache_max_entries: int = Field(
+        default=10000, description="Maximum cached verified users"
+    )
+    password_hash_workers: int = Field(
+        default=4,
+        description="Threads running bcrypt; caps concurrent hash/verify calls",
+    )
+
     # Server
     host: str = Field(default="0.0.0.0", description="Server host")
     port: int = Field(default=8000, description="Server port")
@@ -48,9 +138,25 @@ class Settings(BaseSettings):
     max_fibonacci_n: int = Field(
         default=10000, description="Maximum value for Fibonacci computation"
     )
+    fibonacci_engine: Literal["fast_doubling", "linear"] = Field(
+        default="fast_doubling",
+        description="Fibonacci algorithm (fast_doubling or linear reference)",
+    )
+    fibonacci_memo_interval: int = Field(
+        default=1024,
+        description="Index spacing between shared Fibonacci checkpoints",
+    )
+    fibonacci_memo_max_checkpoints: int = Field(
+        default=256,
+        description="Maximum number of shared Fibonacci checkpoints kept",
+    )
     max_factorial_n: int = Field(
         default=5000, description="Maximum value for factorial computation"
     )
+    factorial_engine: Literal["binary_split", "iterative"] = Field(
+        default="binary_split",
+        description="Factorial algorithm (binary_split or iterative reference)",
+    )
     max_power_base: int = Field(
         default=1000, description="Maximum base value for power computation"
     )
@@ -58,6 +164,53 @@ class Settings(BaseSettings):
         default=1000,
         description="Maximum exponent value for power computation",
     )
+    max_batch_size: int = Field(
+        default=100, description="Maximum inputs accepted by a batch request"
+    )
+
+    # Precomputed small-n table
+    precomputed_enabled: bool = Field(
+        default=True,
+        description="Build or load the small-n results table at startup",
+    )
+    precomputed_path: str = Field(
+        default="",
+        description="File to memory-map the table from (empty: build in memory)",
+    )
+    precomputed_fibonacci_limit: int = Field(
+        default=1000, description="Fibonacci results kept for n below this"
+    )
+    precomputed_factorial_limit: int = Field(
+        default=500, description="Factorial results kept for n below this"
+    )
+    precomputed_power_max_base: int = Field(
+        default=16, description="Largest power base kept in the table"
+    )
+    precomputed_power_max_exponent: int = Field(
+        default=50, description="Largest power exponent kept in the table"
+    )
+
+    # Compute executor
+    compute_pool_enabled: bool = Field(
+        default=True,
+        description="Offload expensive computations to a process pool",
+    )
+    compute_pool_workers: int = Field(
+        default=2, description="Number of compute pool worker processes"
+    )
+    compute_pool_start_method: Literal["spawn", "fork", "forkserver"] = (
+        Field(
+            default="spawn",
+            description="Multiprocessing start method for pool workers",
+        )
+    )
+    compute_offload_threshold: float = Field(
+        default=50000,
+        description=(
+            "Estimated cost (result digits x log2(n)) above which a "
+            "computation runs in the process pool"
+        ),
+    )
 
     # Redis Configuration
     redis_enabled: bool = Field(
@@ -69,6 +222,85 @@ class Settings(BaseSettings):
     redis_password: str = Field(default="", description="Redis password")
     redis_db: int = Field(default=0, description="Redis database number")
     redis_ttl: int = Field(default=3600, description="Cache TTL in seconds")
+    redis_max_connections: int = Field(
+        default=50, description="Maximum connections in the Redis pool"
+    )
+    redis_socket_timeout: float = Field(
+        default=2.0,
+        description="Seconds to wait on a Redis command (0 waits forever)",
+    )
+    redis_socket_connect_timeout: float = Field(
+        default=2.0,
+        description="Seconds to wait for a Redis connection (0 waits forever)",
+    )
+    redis_health_check_interval: int = Field(
+        default=30,
+        description="Seconds a pooled connection may idle before a PING check",
+    )
+    redis_command_budget_ms: int = Field(
+        default=50,
+        description="Latency budget per Redis call; slower calls fail (0 off)",
+    )
+    redis_breaker_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive Redis failures that open the circuit",
+    )
+    redis_breaker_reset_timeout: float = Field(
+        default=5.0,
+        description="Seconds the Redis circuit stays open before a probe",
+    )
+    redis_reconnect_interval: float = Field(
+        default=5.0,
+        description="Seconds between background reconnect attempts (0 off)",
+    )
+    cache_compression: Literal["none", "zlib", "lz4"] = Field(
+        default="zlib",
+        description="Compression for large cached values (lz4 needs the lz4 package)",
+    )
+    cache_compress_min_bytes: int = Field(
+        default=4096,
+        description="Only compress cached values at least this large",
+    )
+
+    # In-process L1 cache (in front of Redis)
+    l1_cache_enabled: bool = Field(
+        default=True, description="Enable the in-process L1 cache"
+    )
+    l1_cache_max_entries: int = Field(
+        default=10000, description="Maximum number of L1 cache entries"
+    )
+    l1_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Maximum estimated size of all L1 cache values in bytes",
+    )
+    l1_cache_max_item_bytes: int = Field(
+        default=1024 * 1024,
+        description="Values larger than this are only cached in Redis",
+    )
+    l1_cache_ttl: int = Field(
+        default=300, description="L1 cache TTL in seconds"
+    )
+
+    # Request coalescing
+    single_flight_enabled: bool = Field(
+        default=True,
+        description="Share one computation between identical in-flight requests",
+    )
+    distributed_lock_enabled: bool = Field(
+        default=False,
+        description="Use a Redis lock so one worker computes each cold key",
+    )
+    distributed_lock_ttl_ms: int = Field(
+        default=30000, description="Redis computation lock TTL in milliseconds"
+    )
+    distributed_lock_wait_ms: int = Field(
+        default=10000,
+        description="How long to wait for another worker's result",
+    )
+    distributed_lock_poll_ms: int = Field(
+        default=50,
+        description="Cache poll interval while another worker computes",
+    )
 
     # Kafka Configuration
     kafka_enabled: bool = Field(
@@ -83,6 +315,89 @@ class Settings(BaseSettings):
     kafka_group_id: str = Field(
         default="math-service", description="Kafka consumer group ID"
     )
+    kafka_queue_size: int = Field(
+        default=10000, description="Maximum events buffered for sending"
+    )
+    kafka_queue_full_policy: Literal["drop_newest", "drop_oldest", "block"] = (
+        Field(
+            default="drop_newest",
+            description="What to do with an event when the queue is full",
+        )
+    )
+    kafka_enqueue_timeout_ms: int = Field(
+        default=100,
+        description="Maximum wait for queue space with the block policy",
+    )
+    kafka_reconnect_interval: float = Field(
+        default=10.0,
+        description="Seconds between producer restarts while Kafka is down",
+    )
+    kafka_spool_enabled: bool = Field(
+        default=False,
+        description="Spool events to local files while Kafka is unavailable",
+    )
+    kafka_spool_dir: str = Field(
+        default="./kafka-spool", description="Directory of spool segments"
+    )
+    kafka_spool_segment_bytes: int = Field(
+        default=16 * 1024 * 1024, description="Size of one spool segment file"
+    )
+    kafka_spool_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        description="Spool size beyond which new events are dropped",
+    )
+    kafka_spool_fsync: Literal["always", "interval", "never"] = Field(
+        default="interval", description="When spool appends are fsynced"
+    )
+    kafka_spool_fsync_interval_ms: int = Field(
+        default=1000, description="Minimum time between interval fsyncs"
+    )
+    kafka_spool_replay_rate: int = Field(
+        default=1000,
+        description="Spooled events replayed per second (0 for no limit)",
+    )
+    kafka_event_encoding: Literal["json", "binary"] = Field(
+        default="json", description="Event encoding for topics not listed"
+    )
+    kafka_topic_encodings: Dict[str, Literal["json", "binary"]] = Field(
+        default_factory=dict,
+        description="Event encoding per topic, as a JSON object",
+    )
+    kafka_result_encoding: Literal["digest", "raw"] = Field(
+        default="digest",
+        description="Binary events carry a result digest or the full value",
+    )
+    kafka_flush_batch_size: int = Field(
+        default=500, description="Maximum events handed over per flush"
+    )
+    kafka_linger_ms: int = Field(
+        default=10, description="Producer linger time for batching"
+    )
+    kafka_max_batch_bytes: int = Field(
+        default=65536, description="Producer batch size in bytes"
+    )
+    kafka_compression_type: Literal[
+        "none", "gzip", "snappy", "lz4", "zstd"
+    ] = Field(default="gzip", description="Producer compression codec")
+
+    # Rollup consumer
+    rollup_window_seconds: int = Field(
+        default=60, description="Length of one rollup window"
+    )
+    rollup_allowed_lateness_seconds: float = Field(
+        default=10.0,
+        description="How long after its end a window still accepts events",
+    )
+    rollup_max_samples: int = Field(
+        default=10000,
+        description="Durations kept per window and key for percentiles",
+    )
+    rollup_poll_timeout_ms: int = Field(
+        default=1000, description="Maximum wait for records per poll"
+    )
+    rollup_poll_max_records: int = Field(
+        default=500, description="Maximum records fetched per poll"
+    )
 
     class Config:
         env_file = ".env"
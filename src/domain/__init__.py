@@ -1,6 +1,7 @@
 """Domain models and entities for the math service."""
 
 from .models import (
+    DecimalInt,
     FactorialRequest,
     FactorialResult,
     FibonacciResult,
@@ -10,6 +11,7 @@ from .models import (
 )
 
 __all__ = [
+    "DecimalInt",
     "MathOperation",
     "PowerRequest",
     "PowerResult",
@@ -71,6 +71,39 @@ class Token:
     expires_in: int = 1800  # 30 minutes
 
 
+class DecimalInt(int):
+    """Integer result that renders its decimal text at most once.
+
+    CPython converts ints to decimal in quadratic time, so a result is
+    wrapped once and every later str() (persistence, events, responses)
+    reuses the cached text. Arithmetic returns plain ints.
+    """
+
+    def __new__(cls, value: int, text: Optional[str] = None) -> "DecimalInt":
+        if isinstance(value, DecimalInt) and text is None:
+            text = value._text
+        result = super().__new__(cls, value)
+        result._text = text
+        return result
+
+    @classmethod
+    def wrap(cls, value: int) -> "DecimalInt":
+        """Return value as a DecimalInt, reusing it if it already is one."""
+        return value if isinstance(value, DecimalInt) else cls(value)
+
+    @property
+    def rendered(self) -> Optional[str]:
+        """Decimal text if it has been rendered, else None."""
+        return self._text
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = int.__repr__(self)
+        return self._text
+
+    __repr__ = __str__
+
+
 @dataclass(frozen=True)
 class MathOperation:
     """Value object representing a mathematical operation."""
@@ -94,6 +127,46 @@ class MathOperation:
         }
 
 
+@dataclass(frozen=True)
+class OperationRollup:
+    """Aggregate of the events of one kind in one time window.
+
+    name is the operation type of math_operation events and the HTTP
+    method of api_request events; errors counts failed operations or
+    5xx responses.
+    """
+
+    window_start: datetime
+    window_seconds: int
+    event_type: str
+    name: str
+    count: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of events in the window that were errors."""
+        return self.errors / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "window_start": self.window_start.isoformat(),
+            "window_seconds": self.window_seconds,
+            "event_type": self.event_type,
+            "name": self.name,
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "p50_ms": self.p50_ms,
+            "p95_ms": self.p95_ms,
+            "p99_ms": self.p99_ms,
+        }
+
+
 @dataclass(frozen=True)
 class PowerRequest:
     """Value object for power operation request."""
@@ -1,12 +1,22 @@
 """Infrastructure layer components."""
 
 from .cache import RedisCache, cache, cache_key_for_operation
+from .executor import (
+    ComputeExecutor,
+    call_rendered,
+    compute_executor,
+    configure_int_limits,
+    estimate_cost,
+    estimate_digits,
+)
+from .coalescing import SingleFlight, single_flight
 from .db import AsyncSessionLocal, create_tables, get_db_session
 from .logging import configure_logging, get_logger
 from .messaging import (
     KafkaProducer,
     kafka_producer,
     send_operation_event,
+    send_operation_events,
     send_api_event,
 )
 from .metrics import (
@@ -31,8 +41,17 @@ __all__ = [
     "RedisCache",
     "cache",
     "cache_key_for_operation",
+    "SingleFlight",
+    "single_flight",
+    "ComputeExecutor",
+    "call_rendered",
+    "compute_executor",
+    "configure_int_limits",
+    "estimate_cost",
+    "estimate_digits",
     "KafkaProducer",
     "kafka_producer",
     "send_operation_event",
+    "send_operation_events",
     "send_api_event",
 ]
@@ -1,12 +1,19 @@
 """Authentication utilities for JWT and password hashing."""
 
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union
+from typing import Any, Callable, Optional, Tuple, Union
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from config import settings
+from domain.models import User
+from .metrics import password_hash_queue_wait, principal_cache_lookups
 
 
 # Password hashing context
@@ -23,6 +30,63 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# bcrypt runs on its own bounded pool so login storms queue here instead
+# of blocking the event loop or starving the default executor.
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """Get the password hashing pool, creating it on first use."""
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.password_hash_workers),
+                thread_name_prefix="password-hash",
+            )
+        return _hash_executor
+
+
+async def _run_hashing(
+    operation: str, func: Callable[..., Any], *args: Any
+) -> Any:
+    """Run bcrypt work on the hashing pool, recording queue wait."""
+    submitted = time.perf_counter()
+
+    def timed() -> Any:
+        password_hash_queue_wait.labels(operation=operation).observe(
+            time.perf_counter() - submitted
+        )
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_executor(), timed)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_hashing(
+        "verify", verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_hashing("hash", get_password_hash, password)
+
+
+def shutdown_hash_executor(wait: bool = True) -> None:
+    """Shut down the password hashing pool."""
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=wait)
+            _hash_executor = None
+
+
 def create_access_token(
     data: dict, expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -61,3 +125,77 @@ def get_username_from_token(token: str) -> Optional[str]:
     if payload:
         return payload.get("sub")
     return None
+
+
+class PrincipalCache:
+    """Cache of verified users keyed by access token.
+
+    An entry lives for at most principal_cache_ttl seconds and never past
+    the token's exp claim, so a hit needs neither JWT decoding nor a user
+    lookup. Entries are dropped when the user is updated or deleted in
+    this process; other workers rely on the TTL.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: int = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # token -> (user, expires_at as a Unix timestamp)
+        self._entries: OrderedDict[str, Tuple[User, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[User]:
+        """Get the verified user for a token, if cached and unexpired."""
+        entry = self._entries.get(token)
+        if entry is None:
+            principal_cache_lookups.labels(result="miss").inc()
+            return None
+
+        user, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[token]
+            principal_cache_lookups.labels(result="expired").inc()
+            return None
+
+        self._entries.move_to_end(token)
+        principal_cache_lookups.labels(result="hit").inc()
+        return user
+
+    def set(
+        self, token: str, user: User, token_exp: Optional[float] = None
+    ) -> None:
+        """Cache a verified user until min(now + ttl, token exp)."""
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+
+        self._entries[token] = (user, expires_at)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(
+        self, user_id: Optional[int] = None, username: Optional[str] = None
+    ) -> int:
+        """Drop every cached token of a user; return how many."""
+        stale = [
+            token
+            for token, (user, _) in self._entries.items()
+            if (user_id is not None and user.id == user_id)
+            or (username is not None and user.username == username)
+        ]
+        for token in stale:
+            del self._entries[token]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all cached users."""
+        self._entries.clear()
+
+
+# Global verified-principal cache
+principal_cache = PrincipalCache(
+    max_entries=settings.principal_cache_max_entries,
+    ttl=settings.principal_cache_ttl,
+)
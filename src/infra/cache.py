@@ -1,39 +1,223 @@
 """Redis cache implementation."""
 
+import asyncio
 import json
-import pickle
-from typing import Any, Optional
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
 
 import redis.asyncio as redis
 from redis.asyncio import Redis
 
 from config import settings
+from domain.models import DecimalInt
+from .circuit_breaker import CircuitBreaker
+from .codec import decode_value, encode_value, is_encoded
 from .logging import get_logger
+from .metrics import (
+    cache_evictions,
+    cache_hits,
+    cache_misses,
+    l1_cache_bytes,
+    l1_cache_entries,
+    redis_command_duration,
+)
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# Delete the lock only if it still holds our token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory held by a cached value in bytes."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        # Magnitude bytes plus the fixed PyLong header
+        size = (value.bit_length() + 7) // 8 + 28
+        if isinstance(value, DecimalInt) and value.rendered is not None:
+            size += len(value.rendered) + 49
+        return size
+    if isinstance(value, (str, bytes)):
+        return len(value) + 49
+    return sys.getsizeof(value)
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with TTL and byte-size accounting."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_item_bytes: int = 1024 * 1024,
+        ttl: int = 300,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.ttl = ttl
+        # key -> (value, expires_at, size)
+        self._entries: OrderedDict[str, Tuple[Any, float, int]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated size of all cached values."""
+        return self._bytes
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            cache_misses.labels(tier="l1").inc()
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            cache_evictions.labels(tier="l1", reason="expired").inc()
+            cache_misses.labels(tier="l1").inc()
+            return None
+
+        self._entries.move_to_end(key)
+        cache_hits.labels(tier="l1").inc()
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store a value; values above max_item_bytes are not admitted."""
+        size = estimate_size(value)
+        if size > self.max_item_bytes:
+            self.delete(key)
+            return False
+
+        self._remove(key)
+        ttl = min(ttl, self.ttl) if ttl else self.ttl
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            cache_evictions.labels(tier="l1", reason="capacity").inc()
+
+        self._update_gauges()
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Delete a value."""
+        removed = self._remove(key)
+        self._update_gauges()
+        return removed
+
+    def contains(self, key: str) -> bool:
+        """Check for an unexpired value without touching LRU order."""
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def clear(self) -> None:
+        """Drop all values."""
+        self._entries.clear()
+        self._bytes = 0
+        self._update_gauges()
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[2]
+        return True
+
+    def _update_gauges(self) -> None:
+        l1_cache_entries.set(len(self._entries))
+        l1_cache_bytes.set(self._bytes)
+
 
 class RedisCache:
-    """Redis cache manager."""
+    """Two-tier cache: in-process L1 in front of Redis as L2.
+
+    Redis calls are held to redis_command_budget_ms and guarded by a
+    circuit breaker, so while Redis is down or slow requests fall back to
+    L1 almost immediately instead of waiting for socket timeouts. A failed
+    startup connection is retried in the background.
+    """
 
     def __init__(self):
         self._redis: Optional[Redis] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=settings.redis_breaker_failure_threshold,
+            reset_timeout=settings.redis_breaker_reset_timeout,
+        )
+        self._local: Optional[LocalCache] = None
+        if settings.l1_cache_enabled:
+            self._local = LocalCache(
+                max_entries=settings.l1_cache_max_entries,
+                max_bytes=settings.l1_cache_max_bytes,
+                max_item_bytes=settings.l1_cache_max_item_bytes,
+                ttl=settings.l1_cache_ttl,
+            )
+
+    @property
+    def connected(self) -> bool:
+        """Whether Redis (L2) is available."""
+        return self._redis is not None
+
+    def _available(self) -> bool:
+        """Whether a Redis call may be attempted now."""
+        return self._redis is not None and self._breaker.allow()
+
+    @staticmethod
+    def _create_client() -> Redis:
+        """Create a Redis client with the configured connection pool."""
+        return redis.from_url(
+            settings.redis_url,
+            password=settings.redis_password or None,
+            db=settings.redis_db,
+            decode_responses=False,  # We'll handle encoding ourselves
+            max_connections=settings.redis_max_connections,
+            socket_timeout=settings.redis_socket_timeout or None,
+            socket_connect_timeout=(
+                settings.redis_socket_connect_timeout or None
+            ),
+            health_check_interval=settings.redis_health_check_interval,
+        )
+
+    async def _open_client(self) -> Redis:
+        """Create a client and check it with a PING."""
+        client = self._create_client()
+        try:
+            await client.ping()
+        except BaseException:
+            await client.aclose()
+            raise
+        return client
 
     async def connect(self) -> None:
-        """Connect to Redis."""
+        """Connect to Redis, reconnecting in the background on failure."""
         if not settings.redis_enabled:
             logger.info("Redis caching disabled")
             return
 
         try:
-            self._redis = redis.from_url(
-                settings.redis_url,
-                password=settings.redis_password or None,
-                db=settings.redis_db,
-                decode_responses=False,  # We'll handle encoding ourselves
-            )
-            # Test connection
-            await self._redis.ping()
+            self._redis = await self._open_client()
             logger.info(
                 "Connected to Redis",
                 url=settings.redis_url,
@@ -42,87 +226,269 @@ class RedisCache:
         except Exception as e:
             logger.error("Failed to connect to Redis", error=str(e))
             self._redis = None
+            if settings.redis_reconnect_interval > 0:
+                self._reconnect_task = asyncio.create_task(
+                    self._reconnect_loop()
+                )
+
+    async def _reconnect_loop(self) -> None:
+        """Retry the connection until it succeeds."""
+        while self._redis is None:
+            await asyncio.sleep(settings.redis_reconnect_interval)
+            try:
+                client = await self._open_client()
+            except Exception as e:
+                logger.debug("Redis reconnect failed", error=str(e))
+                continue
+
+            self._redis = client
+            self._breaker.reset()
+            logger.info("Reconnected to Redis", url=settings.redis_url)
 
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+            self._reconnect_task = None
+
         if self._redis:
             await self._redis.aclose()
             logger.info("Disconnected from Redis")
 
+    async def _timed(self, command: str, call: Awaitable[T]) -> T:
+        """Await a Redis call within the latency budget.
+
+        Records its latency under command and its outcome with the
+        circuit breaker; a call over budget is cancelled and fails.
+        """
+        budget = settings.redis_command_budget_ms / 1000
+        start = time.perf_counter()
+        try:
+            # asyncio.timeout avoids the extra task wait_for would create
+            async with asyncio.timeout(budget or None):
+                result = await call
+        except Exception:
+            self._breaker.record_failure()
+            raise
+        finally:
+            redis_command_duration.labels(command=command).observe(
+                time.perf_counter() - start
+            )
+        self._breaker.record_success()
+        return result
+
     async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
-        if not self._redis:
+        """Get value from L1, falling back to Redis."""
+        if self._local is not None:
+            value = self._local.get(key)
+            if value is not None:
+                return value
+
+        if not self._available():
             return None
 
         try:
-            value = await self._redis.get(key)
+            value = await self._timed("get", self._redis.get(key))
             if value is None:
+                cache_misses.labels(tier="l2").inc()
                 return None
+            cache_hits.labels(tier="l2").inc()
 
-            # Try to deserialize with pickle first, then JSON
-            try:
-                return pickle.loads(value)
-            except (pickle.PickleError, TypeError):
-                try:
-                    return json.loads(value.decode("utf-8"))
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    return value.decode("utf-8")
+            result = self._deserialize(value)
+            if result is None:
+                return None
+
+            # Promote to L1 so later reads stay in process
+            if self._local is not None:
+                self._local.set(key, result)
+            return result
 
         except Exception as e:
             logger.warning("Cache get failed", key=key, error=str(e))
             return None
 
+    @staticmethod
+    def _deserialize(value: bytes) -> Optional[Any]:
+        """Decode a Redis value; one tag dispatch for codec values.
+
+        Values without the codec header were written before the codec
+        existed. JSON and plain text are still read; anything else (old
+        pickles) is treated as a miss and never unpickled.
+        """
+        if is_encoded(value):
+            return decode_value(value)
+
+        try:
+            text = value.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+
     async def set(
         self, key: str, value: Any, ttl: Optional[int] = None
     ) -> bool:
-        """Set value in cache."""
-        if not self._redis:
+        """Set value in L1 and Redis."""
+        if self._local is not None:
+            self._local.set(key, value, ttl=ttl)
+
+        if not self._available():
             return False
 
         try:
-            # Serialize value
-            if isinstance(value, (str, bytes)):
-                serialized = value
-            elif isinstance(value, (int, float)):
-                serialized = pickle.dumps(value)
+            serialized = encode_value(value)
+            ttl = ttl or settings.redis_ttl
+            await self._timed("setex", self._redis.setex(key, ttl, serialized))
+            return True
+
+        except Exception as e:
+            logger.warning("Cache set failed", key=key, error=str(e))
+            return False
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values, resolving L1 misses with one Redis MGET.
+
+        Returns one entry per key, in order, with None for misses.
+        """
+        results: List[Optional[Any]] = [None] * len(keys)
+        missing: List[int] = []
+        for index, key in enumerate(keys):
+            value = self._local.get(key) if self._local is not None else None
+            if value is None:
+                missing.append(index)
             else:
-                try:
-                    serialized = json.dumps(value).encode("utf-8")
-                except (TypeError, ValueError):
-                    serialized = pickle.dumps(value)
+                results[index] = value
+
+        if not missing or not self._available():
+            return results
+
+        try:
+            values = await self._timed(
+                "mget", self._redis.mget([keys[i] for i in missing])
+            )
+        except Exception as e:
+            logger.warning(
+                "Cache mget failed", count=len(missing), error=str(e)
+            )
+            return results
+
+        for index, value in zip(missing, values, strict=True):
+            if value is None:
+                cache_misses.labels(tier="l2").inc()
+                continue
+            cache_hits.labels(tier="l2").inc()
+
+            result = self._deserialize(value)
+            if result is None:
+                continue
+            results[index] = result
+            if self._local is not None:
+                self._local.set(keys[index], result)
+
+        return results
 
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        ttls: Optional[Dict[str, int]] = None,
+    ) -> bool:
+        """Set several values in L1 and in Redis with one pipeline.
+
+        ttls gives per-key TTLs; keys not in it use ttl, then redis_ttl.
+        """
+        ttls = ttls or {}
+        if self._local is not None:
+            for key, value in items.items():
+                self._local.set(key, value, ttl=ttls.get(key, ttl))
+
+        if not items or not self._available():
+            return False
+
+        try:
             ttl = ttl or settings.redis_ttl
-            await self._redis.setex(key, ttl, serialized)
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.setex(key, ttls.get(key, ttl), encode_value(value))
+                await self._timed("pipeline", pipe.execute())
             return True
 
         except Exception as e:
-            logger.warning("Cache set failed", key=key, error=str(e))
+            logger.warning("Cache mset failed", count=len(items), error=str(e))
             return False
 
     async def delete(self, key: str) -> bool:
-        """Delete value from cache."""
-        if not self._redis:
-            return False
+        """Delete value from L1 and Redis."""
+        removed = False
+        if self._local is not None:
+            removed = self._local.delete(key)
+
+        if not self._available():
+            return removed
 
         try:
-            result = await self._redis.delete(key)
+            result = await self._timed("delete", self._redis.delete(key))
             return bool(result)
         except Exception as e:
             logger.warning("Cache delete failed", key=key, error=str(e))
             return False
 
     async def exists(self, key: str) -> bool:
-        """Check if key exists in cache."""
-        if not self._redis:
-            return False
+        """Check if key exists in Redis, or in L1 when Redis is down."""
+        if not self._available():
+            return self._local is not None and self._local.contains(key)
 
         try:
-            result = await self._redis.exists(key)
+            result = await self._timed("exists", self._redis.exists(key))
             return bool(result)
         except Exception as e:
             logger.warning("Cache exists check failed", key=key, error=str(e))
             return False
 
+    async def acquire_lock(self, key: str, ttl_ms: int) -> Optional[str]:
+        """Try to take a short-lived Redis lock.
+
+        Returns the lock token on success and None if another holder has
+        it. If Redis is unavailable or fails, an empty token is returned so
+        the caller proceeds without the lock rather than waiting.
+        """
+        if not self._available():
+            return ""
+
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self._timed(
+                "set",
+                self._redis.set(f"lock:{key}", token, nx=True, px=ttl_ms),
+            )
+            return token if acquired else None
+        except Exception as e:
+            logger.warning("Cache lock acquire failed", key=key, error=str(e))
+            return ""
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock taken with acquire_lock."""
+        if not token or not self._available():
+            return False
+
+        try:
+            result = await self._timed(
+                "eval",
+                self._redis.eval(
+                    _RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", token
+                ),
+            )
+            return bool(result)
+        except Exception as e:
+            logger.warning("Cache lock release failed", key=key, error=str(e))
+            return False
+
 
 # Global cache instance
 cache = RedisCache()
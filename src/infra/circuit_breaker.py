@@ -0,0 +1,90 @@
+"""Circuit breaker for calls to an external dependency."""
+
+import time
+
+from .logging import get_logger
+from .metrics import circuit_breaker_rejected, circuit_breaker_state
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Values exported by the circuit_breaker_state gauge
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """Stop calling a dependency after repeated failures.
+
+    After failure_threshold consecutive failures the circuit opens and
+    allow() rejects calls without attempting them. Once reset_timeout
+    seconds have passed, one probe call is let through (half-open): its
+    success closes the circuit, its failure opens it again. A probe whose
+    outcome is never recorded is replaced after another reset_timeout.
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int, reset_timeout: float
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        circuit_breaker_state.labels(name=name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now."""
+        if self._state == CLOSED:
+            return True
+
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_timeout:
+            circuit_breaker_rejected.labels(name=self.name).inc()
+            return False
+
+        # Let one probe through; others wait for its outcome
+        self._opened_at = now
+        self._set_state(HALF_OPEN)
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        self._failures = 0
+        if self._state != CLOSED:
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if needed."""
+        self._failures += 1
+        if (
+            self._state == HALF_OPEN
+            or self._failures >= self.failure_threshold
+        ):
+            self._opened_at = time.monotonic()
+            if self._state != OPEN:
+                self._set_state(OPEN)
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        self._failures = 0
+        self._set_state(CLOSED)
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            logger.info(
+                "Circuit breaker state changed",
+                breaker=self.name,
+                previous=self._state,
+                state=state,
+            )
+        self._state = state
+        circuit_breaker_state.labels(name=self.name).set(_STATE_VALUES[state])
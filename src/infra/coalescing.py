@@ -0,0 +1,97 @@
+"""Request coalescing (single-flight) for identical computations."""
+
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from config import settings
+from .cache import RedisCache, cache
+from .logging import get_logger
+from .metrics import coalesced_requests
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """Runs one computation per key and shares its outcome with waiters.
+
+    The computation runs in its own task, which the first caller (the
+    leader) and concurrent callers in this process all await through
+    asyncio.shield, so cancelling any caller, the leader included, leaves
+    the others waiting on the same work. With distributed locking enabled,
+    the task also takes a short Redis lock so that other workers wait for
+    the cached result instead of computing the same cold key.
+    """
+
+    def __init__(self, cache_backend: RedisCache):
+        self._cache = cache_backend
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a computation for key is running in this process."""
+        return key in self._inflight
+
+    async def do(
+        self, key: str, func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return func()'s result, sharing it with concurrent callers."""
+        if not settings.single_flight_enabled:
+            return await func()
+
+        task = self._inflight.get(key)
+        if task is not None:
+            coalesced_requests.labels(scope="local").inc()
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._run(key, func))
+        self._inflight[key] = task
+        task.add_done_callback(functools.partial(self._finished, key))
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        if settings.distributed_lock_enabled and self._cache.connected:
+            return await self._run_with_lock(key, func)
+        return await func()
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Keep asyncio quiet when a failure has no waiters left
+        if not task.cancelled():
+            task.exception()
+
+    async def _run_with_lock(
+        self, key: str, func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Compute under a Redis lock, or wait for the lock holder's result.
+
+        func is expected to write its result to the cache under key.
+        """
+        token = await self._cache.acquire_lock(
+            key, settings.distributed_lock_ttl_ms
+        )
+        if token is None:
+            wait_s = settings.distributed_lock_wait_ms / 1000
+            deadline = time.monotonic() + wait_s
+            while time.monotonic() < deadline:
+                await asyncio.sleep(settings.distributed_lock_poll_ms / 1000)
+                value = await self._cache.get(key)
+                if value is not None:
+                    coalesced_requests.labels(scope="distributed").inc()
+                    return value
+
+            logger.warning(
+                "Timed out waiting for another worker, computing locally",
+                key=key,
+            )
+            return await func()
+
+        try:
+            return await func()
+        finally:
+            await self._cache.release_lock(key, token)
+
+
+# Global single-flight instance
+single_flight = SingleFlight(cache)
@@ -0,0 +1,160 @@
+"""Versioned, type-tagged binary codec for cached values.
+
+Layout: MAGIC (1 byte) | VERSION (1 byte) | TAG (1 byte) | payload
+
+The low bits of TAG select the value type and the high bits the
+compression applied to the payload (text, bytes and JSON only).
+Integers are stored as a sign byte,
+a 4-byte big-endian length and the little-endian magnitude, so a cached
+big int never goes through decimal text or pickle. A DecimalInt whose
+text has been rendered is stored as the same int followed by that text,
+so readers get the decimal form without converting again.
+"""
+
+import json
+import struct
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:  # Optional dependency
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - depends on environment
+    lz4_frame = None
+
+from config import settings
+from domain.models import DecimalInt
+
+MAGIC = 0xFE  # Never the first byte of UTF-8 text, JSON or pickle
+VERSION = 1
+
+TAG_INT = 0x01
+TAG_STR = 0x02
+TAG_BYTES = 0x03
+TAG_JSON = 0x04
+TAG_DECIMAL = 0x05
+
+FLAG_ZLIB = 0x40
+FLAG_LZ4 = 0x80
+_TYPE_MASK = 0x3F
+
+_INT_HEADER = struct.Struct(">BI")
+
+
+class CodecError(ValueError):
+    """Raised when a cached value cannot be encoded or decoded."""
+
+
+def _encode_int(value: int) -> bytes:
+    magnitude = abs(value)
+    length = (magnitude.bit_length() + 7) // 8
+    return _INT_HEADER.pack(value < 0, length) + magnitude.to_bytes(
+        length, "little"
+    )
+
+
+def _decode_int(payload: memoryview) -> int:
+    negative, length = _INT_HEADER.unpack_from(payload)
+    magnitude = int.from_bytes(
+        payload[_INT_HEADER.size : _INT_HEADER.size + length], "little"
+    )
+    return -magnitude if negative else magnitude
+
+
+def _decode_decimal(payload: memoryview) -> DecimalInt:
+    _, length = _INT_HEADER.unpack_from(payload)
+    text = str(payload[_INT_HEADER.size + length :], "ascii")
+    return DecimalInt(_decode_int(payload), text)
+
+
+_DECODERS: Dict[int, Callable[[memoryview], Any]] = {
+    TAG_INT: _decode_int,
+    TAG_DECIMAL: _decode_decimal,
+    TAG_STR: lambda payload: str(payload, "utf-8"),
+    TAG_BYTES: bytes,
+    TAG_JSON: lambda payload: json.loads(bytes(payload)),
+}
+
+
+def _compress(
+    payload: bytes, compression: str
+) -> Optional[Tuple[int, bytes]]:
+    """Return (flag, compressed) or None when compression does not help."""
+    if compression == "zlib":
+        flag, compressed = FLAG_ZLIB, zlib.compress(payload, 6)
+    elif compression == "lz4":
+        if lz4_frame is None:
+            return None
+        flag, compressed = FLAG_LZ4, lz4_frame.compress(payload)
+    else:
+        return None
+
+    if len(compressed) >= len(payload):
+        return None
+    return flag, compressed
+
+
+def encode_value(
+    value: Any,
+    compression: Optional[str] = None,
+    min_compress_bytes: Optional[int] = None,
+) -> bytes:
+    """Encode a value for the cache."""
+    if isinstance(value, DecimalInt) and value.rendered is not None:
+        tag = TAG_DECIMAL
+        payload = _encode_int(value) + value.rendered.encode("ascii")
+    elif isinstance(value, int) and not isinstance(value, bool):
+        tag, payload = TAG_INT, _encode_int(value)
+    elif isinstance(value, str):
+        tag, payload = TAG_STR, value.encode("utf-8")
+    elif isinstance(value, (bytes, bytearray)):
+        tag, payload = TAG_BYTES, bytes(value)
+    else:
+        try:
+            tag, payload = TAG_JSON, json.dumps(value).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            raise CodecError(f"Cannot encode {type(value).__name__}") from e
+
+    # Integer magnitudes are dense binary and do not compress; decimal
+    # text would, but is stored to save CPU, not space
+    compression = compression or settings.cache_compression
+    if min_compress_bytes is None:
+        min_compress_bytes = settings.cache_compress_min_bytes
+    if (
+        tag not in (TAG_INT, TAG_DECIMAL)
+        and compression != "none"
+        and len(payload) >= min_compress_bytes
+    ):
+        compressed = _compress(payload, compression)
+        if compressed is not None:
+            flag, payload = compressed
+            tag |= flag
+
+    return bytes((MAGIC, VERSION, tag)) + payload
+
+
+def is_encoded(data: bytes) -> bool:
+    """Whether data was produced by encode_value."""
+    return len(data) >= 3 and data[0] == MAGIC
+
+
+def decode_value(data: bytes) -> Any:
+    """Decode a value produced by encode_value."""
+    if not is_encoded(data):
+        raise CodecError("Missing codec header")
+    if data[1] != VERSION:
+        raise CodecError(f"Unsupported codec version: {data[1]}")
+
+    tag = data[2]
+    # Slice without copying; big payloads are only read once
+    payload = memoryview(data)[3:]
+    if tag & FLAG_ZLIB:
+        payload = memoryview(zlib.decompress(payload))
+    elif tag & FLAG_LZ4:
+        if lz4_frame is None:
+            raise CodecError("lz4 payload but lz4 is not installed")
+        payload = memoryview(lz4_frame.decompress(payload))
+
+    decoder = _DECODERS.get(tag & _TYPE_MASK)
+    if decoder is None:
+        raise CodecError(f"Unknown codec tag: {tag:#x}")
+    return decoder(payload)
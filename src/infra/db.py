@@ -1,7 +1,10 @@
 """Database configuration and session management."""
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -10,11 +13,60 @@ from sqlalchemy.ext.asyncio import (
 from config import settings
 
 
+def sqlite_pragmas() -> List[str]:
+    """PRAGMA statements of the configured SQLite performance profile."""
+    if not settings.sqlite_tuning_enabled:
+        return []
+
+    return [
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+        f"PRAGMA cache_size={int(settings.sqlite_cache_size)}",
+        f"PRAGMA temp_store={settings.sqlite_temp_store}",
+    ]
+
+
+def build_engine(
+    database_url: str, pragmas: Optional[List[str]] = None
+) -> AsyncEngine:
+    """Create the async engine and apply PRAGMAs on every new connection."""
+    url = database_url.replace("sqlite://", "sqlite+aiosqlite://")
+
+    # In-memory databases use a single static connection, not a pool
+    pool_args = {}
+    if not (":memory:" in url or url.endswith("://")):
+        pool_args = {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+        }
+
+    new_engine = create_async_engine(
+        url,
+        echo=settings.log_level == "DEBUG",
+        **pool_args,
+    )
+
+    if pragmas is None:
+        pragmas = sqlite_pragmas() if url.startswith("sqlite") else []
+
+    if pragmas:
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    return new_engine
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url.replace("sqlite://", "sqlite+aiosqlite://"),
-    echo=settings.log_level == "DEBUG",
-)
+engine = build_engine(settings.database_url)
 
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -0,0 +1,286 @@
+"""Wire encodings for Kafka events.
+
+Events are built as dicts with the raw result and an epoch-ns
+"timestamp_ns", and encoded per topic:
+
+- json: the original JSON document (result as decimal text, ISO timestamp)
+- binary: MAGIC | VERSION | KIND | timestamp_ns (int64) | body
+
+The binary math-operation body is op code, flags, duration (float64),
+int parameters and the result, either as a digest (decimal digit count
+and the first 8 bytes of the SHA-256 of the decimal text, as in logs) or
+as the raw codec-encoded int. decode_event() reads both encodings.
+"""
+
+import hashlib
+import json
+import struct
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from .codec import decode_value, encode_value
+
+MAGIC = 0xE7  # Never the first byte of a JSON document
+VERSION = 1
+
+KIND_MATH_OPERATION = 1
+KIND_API_REQUEST = 2
+
+_OPERATION_CODES = {"power": 1, "fibonacci": 2, "factorial": 3}
+_OPERATION_NAMES = {code: name for name, code in _OPERATION_CODES.items()}
+
+# Math operation flags
+_SUCCESS = 0x01
+_HAS_RESULT = 0x02
+_RAW_RESULT = 0x04
+_HAS_ERROR = 0x08
+_JSON_PARAMETERS = 0x10
+
+# API request flags
+_HAS_USER_AGENT = 0x01
+
+_HEADER = struct.Struct(">BBBq")
+_MATH = struct.Struct(">BBd")
+_API = struct.Struct(">BHd")
+_PARAMETER = struct.Struct(">q")
+_DIGEST = struct.Struct(">I8s")
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class EventDecodeError(ValueError):
+    """Raised when an event cannot be decoded."""
+
+
+def json_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the JSON form of an event."""
+    document = {
+        key: value for key, value in event.items() if key != "timestamp_ns"
+    }
+    if document.get("result") is not None:
+        document["result"] = str(document["result"])
+    document["timestamp"] = datetime.fromtimestamp(
+        event["timestamp_ns"] / 1e9, timezone.utc
+    ).isoformat()
+    return document
+
+
+def encode_event(
+    event: Dict[str, Any], encoding: str, result_encoding: str = "digest"
+) -> bytes:
+    """Serialize an event in the given encoding ("json" or "binary")."""
+    if encoding == "json":
+        return json.dumps(json_event(event)).encode("utf-8")
+    if event["event_type"] == "math_operation":
+        return _encode_math_operation(event, result_encoding)
+    if event["event_type"] == "api_request":
+        return _encode_api_request(event)
+    raise ValueError(f"Unknown event type: {event['event_type']}")
+
+
+def decode_event(data: bytes) -> Dict[str, Any]:
+    """Decode an event in either encoding.
+
+    Every event comes back with "timestamp_ns". A binary result is an int
+    (raw) or {"digits": ..., "sha256": <16 hex chars>} (digest); a JSON
+    result stays decimal text.
+    """
+    if not data:
+        raise EventDecodeError("Empty event")
+    if data[0] != MAGIC:
+        try:
+            event = json.loads(data)
+            if not isinstance(event, dict):
+                raise TypeError("not an object")
+            if "timestamp" in event:
+                event["timestamp_ns"] = _timestamp_ns(event["timestamp"])
+        except (UnicodeDecodeError, TypeError, ValueError) as e:
+            raise EventDecodeError(f"Invalid JSON event: {e}") from e
+        return event
+
+    view = memoryview(data)
+    try:
+        _, version, kind, timestamp_ns = _HEADER.unpack_from(view)
+        if version != VERSION:
+            raise EventDecodeError(f"Unsupported event version: {version}")
+        if kind == KIND_MATH_OPERATION:
+            event = _decode_math_operation(view, _HEADER.size)
+        elif kind == KIND_API_REQUEST:
+            event = _decode_api_request(view, _HEADER.size)
+        else:
+            raise EventDecodeError(f"Unknown event kind: {kind}")
+    except (struct.error, UnicodeDecodeError, ValueError) as e:
+        if isinstance(e, EventDecodeError):
+            raise
+        raise EventDecodeError(f"Truncated or invalid event: {e}") from e
+    event["timestamp_ns"] = timestamp_ns
+    return event
+
+
+def _timestamp_ns(timestamp: str) -> int:
+    elapsed = datetime.fromisoformat(timestamp) - _EPOCH
+    seconds = elapsed.days * 86400 + elapsed.seconds
+    return seconds * 1_000_000_000 + elapsed.microseconds * 1000
+
+
+def _pack_str(text: str, length: struct.Struct) -> bytes:
+    encoded = text.encode("utf-8")
+    return length.pack(len(encoded)) + encoded
+
+
+def _unpack_str(
+    view: memoryview, offset: int, length: struct.Struct
+) -> Tuple[str, int]:
+    (size,) = length.unpack_from(view, offset)
+    start = offset + length.size
+    if start + size > len(view):
+        raise EventDecodeError("Truncated string")
+    return str(view[start : start + size], "utf-8"), start + size
+
+
+def _int_parameters(parameters: Dict[str, Any]) -> bool:
+    return (
+        all(
+            type(value) is int and _INT64_MIN <= value <= _INT64_MAX
+            for value in parameters.values()
+        )
+        and len(parameters) < 256
+    )
+
+
+def _encode_math_operation(
+    event: Dict[str, Any], result_encoding: str
+) -> bytes:
+    operation_type = event["operation_type"]
+    parameters = event["parameters"]
+    result = event["result"]
+    error = event.get("error")
+
+    flags = _SUCCESS if event["success"] else 0
+    if result is not None:
+        flags |= _HAS_RESULT
+        if result_encoding == "raw":
+            flags |= _RAW_RESULT
+    if error is not None:
+        flags |= _HAS_ERROR
+    int_parameters = _int_parameters(parameters)
+    if not int_parameters:
+        flags |= _JSON_PARAMETERS
+
+    code = _OPERATION_CODES.get(operation_type, 0)
+    parts = [
+        _HEADER.pack(
+            MAGIC, VERSION, KIND_MATH_OPERATION, event["timestamp_ns"]
+        ),
+        _MATH.pack(code, flags, event["duration_ms"]),
+    ]
+    if not code:
+        parts.append(_pack_str(operation_type, _U8))
+
+    if int_parameters:
+        parts.append(_U8.pack(len(parameters)))
+        for name, value in parameters.items():
+            parts.append(_pack_str(name, _U8))
+            parts.append(_PARAMETER.pack(value))
+    else:
+        parts.append(_pack_str(json.dumps(parameters), _U32))
+
+    if result is not None:
+        if result_encoding == "raw":
+            encoded = encode_value(int(result))
+            parts.append(_U32.pack(len(encoded)))
+            parts.append(encoded)
+        else:
+            text = str(result)
+            digest = hashlib.sha256(text.encode("ascii")).digest()[:8]
+            parts.append(_DIGEST.pack(len(text.lstrip("-")), digest))
+
+    if error is not None:
+        parts.append(_pack_str(error, _U16))
+    return b"".join(parts)
+
+
+def _decode_math_operation(view: memoryview, offset: int) -> Dict[str, Any]:
+    code, flags, duration_ms = _MATH.unpack_from(view, offset)
+    offset += _MATH.size
+    if code:
+        operation_type = _OPERATION_NAMES.get(code)
+        if operation_type is None:
+            raise EventDecodeError(f"Unknown operation code: {code}")
+    else:
+        operation_type, offset = _unpack_str(view, offset, _U8)
+
+    parameters: Dict[str, Any]
+    if flags & _JSON_PARAMETERS:
+        text, offset = _unpack_str(view, offset, _U32)
+        parameters = json.loads(text)
+    else:
+        (count,) = _U8.unpack_from(view, offset)
+        offset += _U8.size
+        parameters = {}
+        for _ in range(count):
+            name, offset = _unpack_str(view, offset, _U8)
+            (parameters[name],) = _PARAMETER.unpack_from(view, offset)
+            offset += _PARAMETER.size
+
+    result: Any = None
+    if flags & _HAS_RESULT:
+        if flags & _RAW_RESULT:
+            (size,) = _U32.unpack_from(view, offset)
+            offset += _U32.size
+            result = decode_value(view[offset : offset + size])
+            offset += size
+        else:
+            digits, digest = _DIGEST.unpack_from(view, offset)
+            offset += _DIGEST.size
+            result = {"digits": digits, "sha256": digest.hex()}
+
+    error: Optional[str] = None
+    if flags & _HAS_ERROR:
+        error, offset = _unpack_str(view, offset, _U16)
+
+    return {
+        "event_type": "math_operation",
+        "operation_type": operation_type,
+        "parameters": parameters,
+        "result": result,
+        "duration_ms": duration_ms,
+        "success": bool(flags & _SUCCESS),
+        "error": error,
+    }
+
+
+def _encode_api_request(event: Dict[str, Any]) -> bytes:
+    user_agent = event.get("user_agent")
+    flags = _HAS_USER_AGENT if user_agent is not None else 0
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, KIND_API_REQUEST, event["timestamp_ns"]),
+        _API.pack(flags, event["status_code"], event["duration_ms"]),
+        _pack_str(event["method"], _U8),
+        _pack_str(event["endpoint"], _U16),
+    ]
+    if user_agent is not None:
+        parts.append(_pack_str(user_agent, _U16))
+    return b"".join(parts)
+
+
+def _decode_api_request(view: memoryview, offset: int) -> Dict[str, Any]:
+    flags, status_code, duration_ms = _API.unpack_from(view, offset)
+    offset += _API.size
+    method, offset = _unpack_str(view, offset, _U8)
+    endpoint, offset = _unpack_str(view, offset, _U16)
+    user_agent = None
+    if flags & _HAS_USER_AGENT:
+        user_agent, offset = _unpack_str(view, offset, _U16)
+    return {
+        "event_type": "api_request",
+        "method": method,
+        "endpoint": endpoint,
+        "status_code": status_code,
+        "duration_ms": duration_ms,
+        "user_agent": user_agent,
+    }
@@ -0,0 +1,194 @@
+"""Executor layer for CPU-bound big-integer computations."""
+
+import asyncio
+import math
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from config import settings
+from domain.models import DecimalInt
+from .logging import get_logger
+from .metrics import compute_task_count
+
+logger = get_logger(__name__)
+
+_LOG10_PHI = math.log10((1 + math.sqrt(5)) / 2)
+
+
+def estimate_digits(operation_type: str, **params) -> float:
+    """Estimate the number of decimal digits of an operation's result."""
+    if operation_type == "power":
+        base = abs(params["base"])
+        if base < 2:
+            return 1.0
+        return params["exponent"] * math.log10(base) + 1
+    if operation_type == "fibonacci":
+        return params["n"] * _LOG10_PHI + 1
+    if operation_type == "factorial":
+        return math.lgamma(params["n"] + 1) / math.log(10) + 1
+    raise ValueError(f"Unknown operation type: {operation_type}")
+
+
+def estimate_cost(operation_type: str, **params) -> float:
+    """Estimate the cost of an operation as result digits x log2(n).
+
+    n is the exponent for power and the index for Fibonacci and
+    factorial; the log factor accounts for the number of big-int
+    multiplication rounds the algorithms need.
+    """
+    n = params["exponent"] if operation_type == "power" else params["n"]
+    digits = estimate_digits(operation_type, **params)
+    return digits * math.log2(n + 2)
+
+
+def configure_int_limits() -> None:
+    """Allow decimal rendering of the largest results the limits permit.
+
+    CPython caps int-to-str conversion at 4300 digits by default, which
+    is far below e.g. max_factorial_n! and would fail serialization.
+    Applied in the app process and in every compute pool worker.
+    """
+    max_digits = max(
+        math.lgamma(settings.max_factorial_n + 1) / math.log(10),
+        settings.max_fibonacci_n * _LOG10_PHI,
+        settings.max_power_exponent
+        * math.log10(max(abs(settings.max_power_base), 2)),
+    )
+    limit = int(max_digits) + 2
+    current = sys.get_int_max_str_digits()
+    if current and current < limit:
+        sys.set_int_max_str_digits(limit)
+
+
+def _render(value: Any) -> Any:
+    """Wrap ints (also inside lists and dicts) as rendered DecimalInts."""
+    if isinstance(value, dict):
+        return {key: _render(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_render(item) for item in value]
+    result = DecimalInt(value)
+    str(result)
+    return result
+
+
+def call_rendered(func: Callable[..., Any], *args: Any) -> Any:
+    """Call func and return its int results with the decimal text rendered.
+
+    Module-level so that, when offloaded, the int-to-str conversion runs
+    in the pool worker along with the computation.
+    """
+    return _render(func(*args))
+
+
+class ComputeExecutor:
+    """Runs computations inline or in a process pool depending on cost."""
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._restart_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the process pool is available."""
+        return self._pool is not None
+
+    async def start(self) -> None:
+        """Start the process pool and spawn its workers."""
+        if not settings.compute_pool_enabled:
+            logger.info("Compute process pool disabled")
+            return
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=settings.compute_pool_workers,
+            mp_context=multiprocessing.get_context(
+                settings.compute_pool_start_method
+            ),
+            initializer=configure_int_limits,
+        )
+
+        # Spawn workers now rather than on the first expensive request
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._pool, abs, 0)
+                for _ in range(settings.compute_pool_workers)
+            )
+        )
+        logger.info(
+            "Compute process pool started",
+            workers=settings.compute_pool_workers,
+            threshold=settings.compute_offload_threshold,
+        )
+
+    async def stop(self) -> None:
+        """Shut down the process pool."""
+        if self._pool:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, True, cancel_futures=True)
+            logger.info("Compute process pool stopped")
+
+    def should_offload(self, cost: float) -> bool:
+        """Whether a computation of the given cost goes to the pool."""
+        return self._pool is not None and (
+            cost >= settings.compute_offload_threshold
+        )
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        cost: float,
+        operation_type: str = "unknown",
+    ) -> Any:
+        """Run func(*args), offloading to the pool above the cost threshold.
+
+        func and args must be picklable when offloaded, so pass
+        module-level functions rather than bound methods.
+        """
+        if not self.should_offload(cost):
+            compute_task_count.labels(
+                operation_type=operation_type, executor="inline"
+            ).inc()
+            return func(*args)
+
+        pool = self._pool
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(pool, func, *args)
+            compute_task_count.labels(
+                operation_type=operation_type, executor="process_pool"
+            ).inc()
+            return result
+        except BrokenProcessPool as e:
+            logger.warning(
+                "Compute pool broken, restarting and running inline",
+                operation_type=operation_type,
+                error=str(e),
+            )
+            await self._restart(pool)
+            compute_task_count.labels(
+                operation_type=operation_type, executor="inline"
+            ).inc()
+            return func(*args)
+
+    async def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken pool once, however many requests saw it break.
+
+        A failed restart is logged, not raised: callers fall back to
+        running inline either way.
+        """
+        async with self._restart_lock:
+            if self._pool is not broken:
+                return
+            try:
+                await self.stop()
+                await self.start()
+            except Exception as e:
+                logger.error("Compute pool restart failed", error=str(e))
+
+
+# Global executor instance
+compute_executor = ComputeExecutor()
@@ -1,28 +1,160 @@
 """Logging configuration using structlog."""
 
+import atexit
+import hashlib
 import logging
+import logging.handlers
+import math
+import queue
+import random
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import structlog
 from structlog.stdlib import LoggerFactory
 
 from config import settings
+from domain.models import DecimalInt
+from infra.metrics import log_records_dropped
+
+# Leading/trailing digits kept when a big int is summarized
+SUMMARY_EDGE_DIGITS = 16
+
+_LOG10_2 = math.log10(2)
+
+
+def summarize_int(value: int) -> Dict[str, Any]:
+    """Describe a big int by digit count, hash and its leading/trailing digits.
+
+    The hash is the SHA-256 of the decimal text, so a logged result can be
+    matched against an API response without logging the digits.
+    """
+    text = str(value)
+    digits = text.lstrip("-")
+    return {
+        "digits": len(digits),
+        "sha256": hashlib.sha256(text.encode("ascii")).hexdigest()[:16],
+        "head": text[: SUMMARY_EDGE_DIGITS + len(text) - len(digits)],
+        "tail": digits[-SUMMARY_EDGE_DIGITS:],
+    }
+
+
+def _log_value(value: Any, max_digits: int) -> Any:
+    """Return value as it should be logged."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        return value
+    # Upper bound on the digit count, without rendering the value
+    if abs(value).bit_length() * _LOG10_2 + 1 <= max_digits:
+        return str(value) if isinstance(value, DecimalInt) else value
+    # DecimalInt results are summarized from their cached text
+    text = str(value)
+    if len(text.lstrip("-")) <= max_digits:
+        return text if isinstance(value, DecimalInt) else value
+    return summarize_int(value)
+
+
+def summarize_big_ints(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Replace ints longer than log_max_int_digits with a summary.
+
+    Keeps log volume bounded per event however large a result is. Smaller
+    DecimalInt values are logged as their cached decimal text, which the
+    JSON renderer would otherwise convert again.
+    """
+    max_digits = settings.log_max_int_digits
+    for key, value in event_dict.items():
+        event_dict[key] = _log_value(value, max_digits)
+    return event_dict
+
+
+# Info/debug events logged on every request; kept at log_sample_rate
+SAMPLED_EVENTS = frozenset(
+    {
+        "HTTP request processed",
+        "Power calculation cache hit",
+        "Fibonacci calculation cache hit",
+        "Factorial calculation cache hit",
+    }
+)
+
+_SAMPLED_LEVELS = frozenset({"debug", "info"})
+
+
+def sample_events(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Drop a share of high-volume info/debug events.
+
+    Warnings and errors are never sampled.
+    """
+    if (
+        method_name in _SAMPLED_LEVELS
+        and event_dict.get("event") in SAMPLED_EVENTS
+        and random.random() >= settings.log_sample_rate
+    ):
+        log_records_dropped.labels(reason="sampled").inc()
+        raise structlog.DropEvent
+    return event_dict
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.labels(reason="queue_full").inc()
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the background log writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _log_handlers() -> List[logging.Handler]:
+    """Build root handlers; in async mode, start the queue listener."""
+    global _listener
+    formatter = logging.Formatter("%(message)s")
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    if not settings.log_async_enabled:
+        return [stream_handler]
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    # QueueHandler formats records before queueing them; without its own
+    # formatter basicConfig would prefix the JSON with level and name
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.setFormatter(formatter)
+    return [queue_handler]
 
 
 def configure_logging() -> None:
     """Configure structured logging."""
-    # Configure standard library logging
+    stop_logging()
+
+    # Configure standard library logging; with async logging the event
+    # loop only enqueues records and a listener thread writes them
     logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
+        handlers=_log_handlers(),
         level=getattr(logging, settings.log_level),
+        force=True,
     )
 
     # Configure structlog
     structlog.configure(
         processors=[
             structlog.stdlib.filter_by_level,
+            sample_events,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
@@ -30,6 +162,7 @@ def configure_logging() -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
+            summarize_big_ints,
             structlog.processors.JSONRenderer(),
         ],
         wrapper_class=structlog.stdlib.BoundLogger,
@@ -38,6 +171,10 @@ def configure_logging() -> None:
     )
 
 
+# Write out queued records when the process exits
+atexit.register(stop_logging)
+
+
 def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     """Get a structured logger instance."""
     return structlog.get_logger(name)
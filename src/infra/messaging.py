@@ -1,23 +1,64 @@
 """Kafka messaging implementation."""
 
+import asyncio
+import functools
 import json
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from aiokafka import AIOKafkaProducer
 from aiokafka.errors import KafkaError
 
 from config import settings
+from .events import encode_event, json_event
 from .logging import get_logger
+from .metrics import (
+    kafka_events_dropped,
+    kafka_events_replayed,
+    kafka_events_sent,
+    kafka_events_spooled,
+    kafka_queue_depth,
+)
+from .spool import EventSpool
 
 logger = get_logger(__name__)
 
+# (topic, key, event)
+QueuedEvent = Tuple[str, Optional[str], Dict[str, Any]]
+
+
+def topic_encoding(topic: str) -> str:
+    """Return the event encoding ("json" or "binary") used for a topic."""
+    return settings.kafka_topic_encodings.get(
+        topic, settings.kafka_event_encoding
+    )
+
 
 class KafkaProducer:
-    """Kafka message producer."""
+    """Kafka message producer.
+
+    Once started, events are put on a bounded in-memory queue and a
+    background flusher hands them to the producer in batches, so request
+    handlers never wait for a broker round-trip. The producer batches and
+    compresses on the wire (linger_ms, max_batch_size, compression_type).
+
+    If the broker cannot be reached, the producer is restarted in the
+    background. With kafka_spool_enabled, events meanwhile go to a local
+    EventSpool and are replayed in order once Kafka is back; new events
+    keep going to the spool until it is drained.
+
+    Events are queued with the raw result and an epoch-ns timestamp and
+    only encoded when sent, in the encoding configured for their topic
+    (see infra.events).
+    """
 
     def __init__(self):
         self._producer: Optional[AIOKafkaProducer] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._spool: Optional[EventSpool] = None
+        self._reconnector: Optional[asyncio.Task] = None
+        self._replayer: Optional[asyncio.Task] = None
 
     async def start(self) -> None:
         """Start Kafka producer."""
@@ -25,13 +66,16 @@ class KafkaProducer:
             logger.info("Kafka messaging disabled")
             return
 
+        if settings.kafka_spool_enabled:
+            try:
+                spool = EventSpool.from_settings()
+                spool.open()
+                self._spool = spool
+            except Exception as e:
+                logger.error("Failed to open Kafka spool", error=str(e))
+
         try:
-            self._producer = AIOKafkaProducer(
-                bootstrap_servers=settings.kafka_bootstrap_servers,
-                value_serializer=lambda v: json.dumps(v).encode("utf-8"),
-                key_serializer=lambda k: k.encode("utf-8") if k else None,
-            )
-            await self._producer.start()
+            await self._start_producer()
             logger.info(
                 "Kafka producer started",
                 bootstrap_servers=settings.kafka_bootstrap_servers,
@@ -39,13 +83,322 @@ class KafkaProducer:
             )
         except Exception as e:
             logger.error("Failed to start Kafka producer", error=str(e))
-            self._producer = None
+            if settings.kafka_reconnect_interval > 0:
+                self._reconnector = asyncio.create_task(self._reconnect_loop())
+
+    async def _start_producer(self) -> None:
+        """Connect a new producer and start sending through it."""
+        compression = settings.kafka_compression_type
+        producer = AIOKafkaProducer(
+            bootstrap_servers=settings.kafka_bootstrap_servers,
+            value_serializer=_serialize_value,
+            key_serializer=lambda k: k.encode("utf-8") if k else None,
+            linger_ms=settings.kafka_linger_ms,
+            max_batch_size=settings.kafka_max_batch_bytes,
+            compression_type=(None if compression == "none" else compression),
+        )
+        try:
+            await producer.start()
+        except BaseException:
+            await producer.stop()
+            raise
+        self._producer = producer
+        self._start_pipeline()
+        self._start_replay()
+
+    async def _reconnect_loop(self) -> None:
+        """Restart the producer until the broker is reachable."""
+        while self._producer is None:
+            await asyncio.sleep(settings.kafka_reconnect_interval)
+            try:
+                await self._start_producer()
+            except Exception as e:
+                logger.debug("Kafka reconnect failed", error=str(e))
+                continue
+            logger.info(
+                "Kafka producer reconnected",
+                bootstrap_servers=settings.kafka_bootstrap_servers,
+            )
 
     async def stop(self) -> None:
-        """Stop Kafka producer."""
+        """Flush queued events and stop Kafka producer."""
+        for task in (self._reconnector, self._replayer):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._reconnector = self._replayer = None
+
+        await self._stop_pipeline()
         if self._producer:
             await self._producer.stop()
             logger.info("Kafka producer stopped")
+        if self._spool is not None:
+            self._spool.close()
+
+    @property
+    def pipelined(self) -> bool:
+        """Whether events go through the background flusher."""
+        return self._flusher is not None and not self._flusher.done()
+
+    def _start_pipeline(self) -> None:
+        """Create the event queue and start the background flusher."""
+        self._queue = asyncio.Queue(maxsize=settings.kafka_queue_size)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _stop_pipeline(self) -> None:
+        """Stop the flusher and send whatever is still queued."""
+        if self._flusher is None:
+            return
+
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+        self._flusher = None
+
+        if self._producer and self._queue is not None:
+            while not self._queue.empty():
+                await self._send_batch(self._drain())
+        kafka_queue_depth.set(0)
+
+    def _drain(self) -> List[QueuedEvent]:
+        """Take up to one flush batch of events off the queue."""
+        batch: List[QueuedEvent] = []
+        while len(batch) < settings.kafka_flush_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _flush_loop(self) -> None:
+        """Hand queued events to the producer as they arrive."""
+        while True:
+            batch = [await self._queue.get()]
+            batch.extend(self._drain())
+            kafka_queue_depth.set(self._queue.qsize())
+            try:
+                await self._send_batch(batch)
+            except Exception as e:
+                if self._spool is not None:
+                    self._spool_events(batch)
+                else:
+                    kafka_events_dropped.labels(reason="send_error").inc(
+                        len(batch)
+                    )
+                logger.warning(
+                    "Failed to send Kafka batch",
+                    events=len(batch),
+                    error=str(e),
+                )
+
+    async def _send_batch(self, batch: List[QueuedEvent]) -> None:
+        """Enqueue a batch on the producer without awaiting delivery."""
+        for item in batch:
+            topic, key, event = item
+            delivery = await self._producer.send(
+                topic, value=self._payload(topic, event), key=key
+            )
+            delivery.add_done_callback(
+                functools.partial(self._on_delivery, item)
+            )
+        kafka_events_sent.inc(len(batch))
+
+    @staticmethod
+    def _payload(
+        topic: str, event: Dict[str, Any]
+    ) -> Union[Dict[str, Any], bytes]:
+        """Return the value to send for an event on a topic.
+
+        JSON events are handed over as documents for the value serializer;
+        binary ones are encoded here.
+        """
+        if topic_encoding(topic) == "binary":
+            return encode_event(
+                event, "binary", settings.kafka_result_encoding
+            )
+        return json_event(event)
+
+    def _on_delivery(
+        self, item: QueuedEvent, delivery: asyncio.Future
+    ) -> None:
+        """Spool or count events the broker did not acknowledge."""
+        if delivery.cancelled() or delivery.exception() is not None:
+            if self._spool is not None:
+                self._spool_events([item])
+            else:
+                kafka_events_dropped.labels(reason="delivery_error").inc()
+
+    def _spooling(self) -> bool:
+        """Whether events must go to the spool to keep their order."""
+        return self._spool is not None and (
+            self._producer is None or not self._spool.empty
+        )
+
+    def _spool_events(self, batch: List[QueuedEvent]) -> int:
+        """Write events to the spool; return how many were stored."""
+        try:
+            spooled = self._spool.append(
+                [
+                    (topic, key, _serialize_value(self._payload(topic, event)))
+                    for topic, key, event in batch
+                ]
+            )
+        except OSError as e:
+            kafka_events_dropped.labels(reason="spool_error").inc(len(batch))
+            logger.warning(
+                "Failed to spool Kafka events", events=len(batch), error=str(e)
+            )
+            return 0
+        kafka_events_spooled.inc(spooled)
+        self._start_replay()
+        return spooled
+
+    def _start_replay(self) -> None:
+        """Start replaying the spool if it holds events and Kafka is up."""
+        if (
+            self._producer is None
+            or self._spool is None
+            or self._spool.empty
+            or (self._replayer is not None and not self._replayer.done())
+        ):
+            return
+        self._replayer = asyncio.create_task(self._replay_loop())
+
+    async def _replay_loop(self) -> None:
+        """Deliver spooled events in order, then hand back to the queue.
+
+        Each batch is acknowledged by the broker before it is committed,
+        and at most kafka_spool_replay_rate events are sent per second.
+        """
+        rate = settings.kafka_spool_replay_rate
+        while not self._spool.empty:
+            events, consumed = self._spool.read(
+                settings.kafka_flush_batch_size
+            )
+            try:
+                deliveries = [
+                    await self._producer.send(topic, value=value, key=key)
+                    for topic, key, value in events
+                ]
+                await asyncio.gather(*deliveries)
+            except Exception as e:
+                logger.warning(
+                    "Failed to replay spooled Kafka events",
+                    events=len(events),
+                    error=str(e),
+                )
+                await asyncio.sleep(settings.kafka_reconnect_interval or 1)
+                continue
+
+            self._spool.commit(consumed)
+            kafka_events_replayed.inc(len(events))
+            if rate and events:
+                await asyncio.sleep(len(events) / rate)
+        logger.info("Kafka spool replayed")
+
+    async def _publish(
+        self, topic: str, key: Optional[str], event: Dict[str, Any]
+    ) -> bool:
+        """Queue an event, or send it inline if the flusher is not running.
+
+        Applies the configured queue-full policy: drop the new event, drop
+        the oldest queued event, or block up to kafka_enqueue_timeout_ms.
+        """
+        if self._spooling():
+            return self._spool_events([(topic, key, event)]) == 1
+
+        if not self.pipelined:
+            await self._producer.send_and_wait(
+                topic, value=self._payload(topic, event), key=key
+            )
+            return True
+
+        item = (topic, key, event)
+        policy = settings.kafka_queue_full_policy
+        if self._offer(item, drop_oldest=policy == "drop_oldest"):
+            return True
+
+        if policy == "block":
+            try:
+                await asyncio.wait_for(
+                    self._queue.put(item),
+                    settings.kafka_enqueue_timeout_ms / 1000,
+                )
+                kafka_queue_depth.set(self._queue.qsize())
+                return True
+            except asyncio.TimeoutError:
+                pass
+
+        kafka_events_dropped.labels(reason="queue_full").inc()
+        return False
+
+    def _offer(self, item: QueuedEvent, drop_oldest: bool = False) -> bool:
+        """Queue an event without waiting; return False if the queue is full.
+
+        With drop_oldest, a full queue makes room by evicting its oldest
+        event instead.
+        """
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if not drop_oldest:
+                return False
+            self._queue.get_nowait()
+            self._queue.put_nowait(item)
+            kafka_events_dropped.labels(reason="queue_full").inc()
+
+        kafka_queue_depth.set(self._queue.qsize())
+        return True
+
+    async def _publish_many(self, batch: List[QueuedEvent]) -> int:
+        """Queue several events, or send them inline as one producer batch.
+
+        Returns how many events were accepted.
+        """
+        if self._spooling():
+            return self._spool_events(batch)
+
+        if not self.pipelined:
+            deliveries = [
+                await self._producer.send(
+                    topic, value=self._payload(topic, event), key=key
+                )
+                for topic, key, event in batch
+            ]
+            await asyncio.gather(*deliveries)
+            return len(batch)
+
+        sent = 0
+        for topic, key, event in batch:
+            if await self._publish(topic, key, event):
+                sent += 1
+        return sent
+
+    @staticmethod
+    def _operation_event(
+        operation_type: str,
+        parameters: Dict[str, Any],
+        result: Any,
+        duration_ms: float,
+        success: bool = True,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build a math operation event."""
+        return {
+            "event_type": "math_operation",
+            "operation_type": operation_type,
+            "parameters": parameters,
+            "result": result,
+            "duration_ms": duration_ms,
+            "success": success,
+            "error": error,
+            "timestamp_ns": time.time_ns(),
+        }
 
     async def send_operation_event(
         self,
@@ -57,34 +410,30 @@ class KafkaProducer:
         error: Optional[str] = None,
     ) -> bool:
         """Send math operation event to Kafka."""
-        if not self._producer:
+        if not self._producer and self._spool is None:
             return False
 
         try:
-            event = {
-                "event_type": "math_operation",
-                "operation_type": operation_type,
-                "parameters": parameters,
-                "result": str(result) if result is not None else None,
-                "duration_ms": duration_ms,
-                "success": success,
-                "error": error,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
+            event = self._operation_event(
+                operation_type=operation_type,
+                parameters=parameters,
+                result=result,
+                duration_ms=duration_ms,
+                success=success,
+                error=error,
+            )
 
             # Use operation type as key for partitioning
             key = f"{operation_type}"
 
-            await self._producer.send_and_wait(
-                settings.kafka_topic, value=event, key=key
-            )
+            sent = await self._publish(settings.kafka_topic, key, event)
 
             logger.debug(
                 "Operation event sent to Kafka",
                 operation_type=operation_type,
                 success=success,
             )
-            return True
+            return sent
 
         except KafkaError as e:
             logger.warning(
@@ -101,6 +450,100 @@ class KafkaProducer:
             )
             return False
 
+    async def send_operation_events(
+        self, operations: List[Dict[str, Any]]
+    ) -> int:
+        """Send several math operation events; return how many were sent.
+
+        Each item holds the keyword arguments of send_operation_event.
+        """
+        if (not self._producer and self._spool is None) or not operations:
+            return 0
+
+        try:
+            batch = [
+                (
+                    settings.kafka_topic,
+                    operation["operation_type"],
+                    self._operation_event(**operation),
+                )
+                for operation in operations
+            ]
+            sent = await self._publish_many(batch)
+
+            logger.debug("Operation events sent to Kafka", count=sent)
+            return sent
+
+        except KafkaError as e:
+            logger.warning(
+                "Failed to send Kafka messages",
+                count=len(operations),
+                error=str(e),
+            )
+            return 0
+        except Exception as e:
+            logger.error(
+                "Unexpected error sending Kafka messages",
+                count=len(operations),
+                error=str(e),
+            )
+            return 0
+
+    @staticmethod
+    def _api_event(
+        method: str,
+        endpoint: str,
+        status_code: int,
+        duration_ms: float,
+        user_agent: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build an API request event."""
+        return {
+            "event_type": "api_request",
+            "method": method,
+            "endpoint": endpoint,
+            "status_code": status_code,
+            "duration_ms": duration_ms,
+            "user_agent": user_agent,
+            "timestamp_ns": time.time_ns(),
+        }
+
+    def submit_api_event(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: int,
+        duration_ms: float,
+        user_agent: Optional[str] = None,
+    ) -> bool:
+        """Queue an API request event without awaiting anything.
+
+        For per-request callers that must not wait on the pipeline: the
+        event is spooled while the spool is in use, and otherwise dropped
+        if the flusher is not running or the queue is full (drop_oldest
+        still evicts; block is treated as drop_newest).
+        """
+        if not self.pipelined and not self._spooling():
+            return False
+
+        event = self._api_event(
+            method=method,
+            endpoint=endpoint,
+            status_code=status_code,
+            duration_ms=duration_ms,
+            user_agent=user_agent,
+        )
+        item = (settings.kafka_topic, f"{method}:{endpoint}", event)
+        if self._spooling():
+            return self._spool_events([item]) == 1
+
+        drop_oldest = settings.kafka_queue_full_policy == "drop_oldest"
+        if self._offer(item, drop_oldest=drop_oldest):
+            return True
+
+        kafka_events_dropped.labels(reason="queue_full").inc()
+        return False
+
     async def send_api_event(
         self,
         method: str,
@@ -110,26 +553,22 @@ class KafkaProducer:
         user_agent: Optional[str] = None,
     ) -> bool:
         """Send API request event to Kafka."""
-        if not self._producer:
+        if not self._producer and self._spool is None:
             return False
 
         try:
-            event = {
-                "event_type": "api_request",
-                "method": method,
-                "endpoint": endpoint,
-                "status_code": status_code,
-                "duration_ms": duration_ms,
-                "user_agent": user_agent,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
+            event = self._api_event(
+                method=method,
+                endpoint=endpoint,
+                status_code=status_code,
+                duration_ms=duration_ms,
+                user_agent=user_agent,
+            )
 
             # Use endpoint as key for partitioning
             key = f"{method}:{endpoint}"
 
-            await self._producer.send_and_wait(
-                settings.kafka_topic, value=event, key=key
-            )
+            sent = await self._publish(settings.kafka_topic, key, event)
 
             logger.debug(
                 "API event sent to Kafka",
@@ -137,7 +576,7 @@ class KafkaProducer:
                 endpoint=endpoint,
                 status_code=status_code,
             )
-            return True
+            return sent
 
         except Exception as e:
             logger.warning(
@@ -149,6 +588,13 @@ class KafkaProducer:
             return False
 
 
+def _serialize_value(value: Union[Dict[str, Any], bytes]) -> bytes:
+    """Serialize a value from KafkaProducer._payload."""
+    if isinstance(value, bytes):
+        return value
+    return json.dumps(value).encode("utf-8")
+
+
 # Global producer instance
 kafka_producer = KafkaProducer()
 
@@ -173,6 +619,11 @@ async def send_operation_event(
     )
 
 
+async def send_operation_events(operations: List[Dict[str, Any]]) -> int:
+    """Send several math operation events to Kafka."""
+    return await kafka_producer.send_operation_events(operations)
+
+
 async def send_api_event(
     method: str,
     endpoint: str,
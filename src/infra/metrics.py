@@ -1,6 +1,8 @@
 """Prometheus metrics for monitoring."""
 
-from prometheus_client import Counter, Histogram, generate_latest
+from typing import Any, Iterable, Set, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
 from prometheus_client.core import CollectorRegistry
 
 from config import settings
@@ -9,15 +11,82 @@ from config import settings
 # Create custom registry to avoid conflicts
 registry = CollectorRegistry()
 
+# Label value that stands in for every label once a metric is full
+OVERFLOW_LABEL = "other"
+
+metric_series_overflow = Counter(
+    "metric_series_overflow_total",
+    "Samples recorded under the overflow series of a full metric",
+    ["metric"],
+    registry=registry,
+)
+
+
+class CardinalityGuard:
+    """Caps the number of label sets (series) a metric can create.
+
+    Once a metric has metrics_max_series children, samples for new label
+    sets are recorded under a single series with every label set to
+    OVERFLOW_LABEL, so an unbounded label value cannot grow memory or
+    scrape time without limit. Existing series keep updating.
+
+    The label sets are tracked here rather than read back from
+    prometheus_client, whose children are private.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        **kwargs: Any,
+    ) -> None:
+        labelnames = tuple(labelnames)
+        super().__init__(name, documentation, labelnames, **kwargs)
+        self._guard_labelnames = labelnames
+        self._series: Set[Tuple[str, ...]] = set()
+
+    def labels(self, *labelvalues, **labelkwargs):
+        try:
+            if labelkwargs:
+                key: Tuple[str, ...] = tuple(
+                    str(labelkwargs[name]) for name in self._guard_labelnames
+                )
+            else:
+                key = tuple(str(value) for value in labelvalues)
+        except KeyError:  # Let prometheus_client report the bad labels
+            return super().labels(*labelvalues, **labelkwargs)
+        if len(key) != len(self._guard_labelnames):
+            return super().labels(*labelvalues, **labelkwargs)
+
+        if (
+            key not in self._series
+            and len(self._series) >= settings.metrics_max_series
+        ):
+            (family,) = self.describe()
+            metric_series_overflow.labels(metric=family.name).inc()
+            key = (OVERFLOW_LABEL,) * len(key)
+        self._series.add(key)
+        return super().labels(*key)
+
+
+class BoundedCounter(CardinalityGuard, Counter):
+    """Counter with a cap on its number of series."""
+
+
+class BoundedHistogram(CardinalityGuard, Histogram):
+    """Histogram with a cap on its number of series."""
+
+
 # Request metrics
-request_count = Counter(
+request_count = BoundedCounter(
     "http_requests_total",
     "Total HTTP requests",
     ["method", "endpoint", "status_code"],
     registry=registry,
 )
 
-request_duration = Histogram(
+request_duration = BoundedHistogram(
     "http_request_duration_seconds",
     "HTTP request duration in seconds",
     ["method", "endpoint"],
@@ -25,28 +94,202 @@ request_duration = Histogram(
 )
 
 # Operation metrics
-operation_count = Counter(
+operation_count = BoundedCounter(
     "math_operations_total",
     "Total math operations",
     ["operation_type", "status"],
     registry=registry,
 )
 
-operation_duration = Histogram(
+operation_duration = BoundedHistogram(
     "math_operation_duration_seconds",
     "Math operation duration in seconds",
     ["operation_type"],
     registry=registry,
 )
 
+# Cache metrics (tier is "l1" for in-process, "l2" for Redis)
+cache_hits = BoundedCounter(
+    "cache_hits_total",
+    "Total cache hits",
+    ["tier"],
+    registry=registry,
+)
+
+cache_misses = BoundedCounter(
+    "cache_misses_total",
+    "Total cache misses",
+    ["tier"],
+    registry=registry,
+)
+
+cache_evictions = BoundedCounter(
+    "cache_evictions_total",
+    "Total cache evictions",
+    ["tier", "reason"],
+    registry=registry,
+)
+
+l1_cache_bytes = Gauge(
+    "l1_cache_bytes",
+    "Estimated size of values held in the L1 cache",
+    registry=registry,
+)
+
+l1_cache_entries = Gauge(
+    "l1_cache_entries",
+    "Number of entries held in the L1 cache",
+    registry=registry,
+)
+
+redis_command_duration = BoundedHistogram(
+    "redis_command_duration_seconds",
+    "Redis command round-trip time in seconds",
+    ["command"],
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+    ),
+    registry=registry,
+)
+
+# Circuit breaker metrics
+circuit_breaker_state = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["name"],
+    registry=registry,
+)
+
+circuit_breaker_rejected = BoundedCounter(
+    "circuit_breaker_rejected_total",
+    "Calls rejected without being attempted because a circuit was open",
+    ["name"],
+    registry=registry,
+)
+
+# Authentication metrics
+principal_cache_lookups = BoundedCounter(
+    "principal_cache_lookups_total",
+    "Verified-principal cache lookups",
+    ["result"],
+    registry=registry,
+)
+password_hash_queue_wait = BoundedHistogram(
+    "password_hash_queue_wait_seconds",
+    "Time bcrypt work waits for a hashing thread",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    registry=registry,
+)
+
+# Precomputed table metrics
+precomputed_lookups = BoundedCounter(
+    "precomputed_lookups_total",
+    "Precomputed table lookups",
+    ["operation_type", "result"],
+    registry=registry,
+)
+
+# Request coalescing metrics
+coalesced_requests = BoundedCounter(
+    "coalesced_requests_total",
+    "Requests served by another request's computation",
+    ["scope"],
+    registry=registry,
+)
+
+# Compute executor metrics
+compute_task_count = BoundedCounter(
+    "compute_tasks_total",
+    "Total computations by executor",
+    ["operation_type", "executor"],
+    registry=registry,
+)
+
+# Kafka event pipeline metrics
+kafka_queue_depth = Gauge(
+    "kafka_event_queue_depth",
+    "Events waiting in the Kafka send queue",
+    registry=registry,
+)
+
+kafka_events_sent = BoundedCounter(
+    "kafka_events_sent_total",
+    "Events handed to the Kafka producer",
+    registry=registry,
+)
+
+kafka_events_dropped = BoundedCounter(
+    "kafka_events_dropped_total",
+    "Events dropped before reaching Kafka",
+    ["reason"],
+    registry=registry,
+)
+
+kafka_spool_bytes = Gauge(
+    "kafka_spool_bytes",
+    "Bytes held in the local Kafka spool",
+    registry=registry,
+)
+
+kafka_events_spooled = BoundedCounter(
+    "kafka_events_spooled_total",
+    "Events written to the local spool instead of Kafka",
+    registry=registry,
+)
+
+kafka_events_replayed = BoundedCounter(
+    "kafka_events_replayed_total",
+    "Spooled events delivered to Kafka",
+    registry=registry,
+)
+
+# Rollup consumer metrics
+rollup_events_consumed = BoundedCounter(
+    "rollup_events_consumed_total",
+    "Events read by the rollup consumer",
+    ["status"],
+    registry=registry,
+)
+
+rollup_windows_written = BoundedCounter(
+    "rollup_windows_written_total",
+    "Rollup rows written to SQLite",
+    registry=registry,
+)
+
+# Logging metrics
+log_records_dropped = BoundedCounter(
+    "log_records_dropped_total",
+    "Log records discarded before being written",
+    ["reason"],
+    registry=registry,
+)
+
 # Database metrics
-db_operation_count = Counter(
+db_operation_count = BoundedCounter(
     "db_operations_total",
     "Total database operations",
     ["operation_type", "status"],
     registry=registry,
 )
 
+db_write_buffer_pending = Gauge(
+    "db_write_buffer_pending",
+    "Math operations waiting in the write-behind buffer",
+    registry=registry,
+)
+
 
 def get_metrics() -> str:
     """Get metrics in Prometheus format."""
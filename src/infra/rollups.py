@@ -0,0 +1,320 @@
+"""Windowed rollups of the events the service produces to Kafka."""
+
+import asyncio
+import math
+import random
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiokafka import AIOKafkaConsumer
+from aiokafka.structs import TopicPartition
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from domain.models import OperationRollup
+from repositories.sqlite_repo import SqliteRollupRepository
+from .events import decode_event
+from .logging import get_logger
+from .metrics import rollup_events_consumed, rollup_windows_written
+
+logger = get_logger(__name__)
+
+NS_PER_SECOND = 1_000_000_000
+
+# (window start in epoch ns, event type, name)
+RollupKey = Tuple[int, str, str]
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 if empty)."""
+    if not ordered:
+        return 0.0
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+def _epoch_ns(moment: datetime) -> int:
+    elapsed = moment - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    seconds = elapsed.days * 86400 + elapsed.seconds
+    return seconds * NS_PER_SECOND + elapsed.microseconds * 1000
+
+
+class _Window:
+    """Running count, errors and duration sample of one rollup key."""
+
+    __slots__ = ("count", "errors", "samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.samples: List[float] = []
+
+    def add(
+        self,
+        duration_ms: float,
+        error: bool,
+        max_samples: int,
+        rng: random.Random,
+    ) -> None:
+        self.count += 1
+        if error:
+            self.errors += 1
+        if len(self.samples) < max_samples:
+            self.samples.append(duration_ms)
+            return
+        # Reservoir sampling keeps a uniform sample of the whole window
+        index = rng.randrange(self.count)
+        if index < max_samples:
+            self.samples[index] = duration_ms
+
+
+class RollupAggregator:
+    """Tumbling-window aggregates of math_operation and api_request events.
+
+    Events are assigned to windows by their own timestamp_ns. A window
+    closes once an event allowed_lateness past its end has been seen (an
+    event-time watermark, so replaying old events gives the same rollups);
+    events for closed windows are late and dropped. Percentiles are exact
+    up to max_samples durations per window and key, and computed over a
+    uniform sample beyond that.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int,
+        allowed_lateness_seconds: float = 0.0,
+        max_samples: int = 10000,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.window_ns = window_seconds * NS_PER_SECOND
+        self.lateness_ns = int(allowed_lateness_seconds * NS_PER_SECOND)
+        self.max_samples = max_samples
+        self._rng = rng or random.Random()
+        self._windows: Dict[RollupKey, _Window] = {}
+        self._watermark = 0
+        # Start of the oldest window still accepting events
+        self._open_from = 0
+
+    @classmethod
+    def from_settings(cls) -> "RollupAggregator":
+        """Create an aggregator configured from settings."""
+        return cls(
+            window_seconds=settings.rollup_window_seconds,
+            allowed_lateness_seconds=settings.rollup_allowed_lateness_seconds,
+            max_samples=settings.rollup_max_samples,
+        )
+
+    @property
+    def open_from(self) -> int:
+        """Start (epoch ns) of the oldest window still accepting events."""
+        return self._open_from
+
+    def seed(self, last_window_start: datetime) -> None:
+        """Treat windows up to last_window_start as already written."""
+        self._open_from = max(
+            self._open_from, _epoch_ns(last_window_start) + self.window_ns
+        )
+
+    def add(self, event: Dict[str, Any]) -> Optional[int]:
+        """Aggregate an event; return its window start, or None if dropped.
+
+        Raises KeyError, TypeError or ValueError for events with missing
+        or malformed fields.
+        """
+        event_type = event.get("event_type")
+        if event_type == "math_operation":
+            name = event["operation_type"]
+            error = not event["success"]
+        elif event_type == "api_request":
+            name = event["method"]
+            error = event["status_code"] >= 500
+        else:
+            rollup_events_consumed.labels(status="ignored").inc()
+            return None
+
+        duration_ms = float(event["duration_ms"])
+        timestamp_ns = event["timestamp_ns"]
+        start = timestamp_ns - timestamp_ns % self.window_ns
+        if start < self._open_from:
+            rollup_events_consumed.labels(status="late").inc()
+            return None
+
+        window = self._windows.get((start, event_type, name))
+        if window is None:
+            window = self._windows[(start, event_type, name)] = _Window()
+        window.add(duration_ms, error, self.max_samples, self._rng)
+        self._watermark = max(self._watermark, timestamp_ns - self.lateness_ns)
+        rollup_events_consumed.labels(status="aggregated").inc()
+        return start
+
+    def close(self) -> List[OperationRollup]:
+        """Close the windows the watermark has passed; return their rollups."""
+        open_from = self._watermark - self._watermark % self.window_ns
+        if open_from <= self._open_from:
+            return []
+        self._open_from = open_from
+
+        closed = sorted(key for key in self._windows if key[0] < open_from)
+        return [self._rollup(key, self._windows.pop(key)) for key in closed]
+
+    def _rollup(self, key: RollupKey, window: _Window) -> OperationRollup:
+        start, event_type, name = key
+        ordered = sorted(window.samples)
+        return OperationRollup(
+            window_start=datetime.fromtimestamp(
+                start // NS_PER_SECOND, timezone.utc
+            ),
+            window_seconds=self.window_seconds,
+            event_type=event_type,
+            name=name,
+            count=window.count,
+            errors=window.errors,
+            p50_ms=percentile(ordered, 0.50),
+            p95_ms=percentile(ordered, 0.95),
+            p99_ms=percentile(ordered, 0.99),
+        )
+
+
+class RollupConsumer:
+    """Consume service events from Kafka and write closed windows to SQLite.
+
+    Offsets are committed manually and never past the earliest record of
+    a window that has not been written yet, so after a restart open
+    windows are rebuilt from Kafka. Stored windows are replaced, not
+    merged, and the aggregator is seeded with the latest stored window so
+    records read again are not counted twice.
+
+    consumer only needs the AIOKafkaConsumer methods start, stop, getmany
+    and commit, so tests can drive it with an in-process fake broker.
+    """
+
+    def __init__(
+        self,
+        consumer: Any,
+        aggregator: Optional[RollupAggregator] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ) -> None:
+        self._consumer = consumer
+        self.aggregator = aggregator or RollupAggregator.from_settings()
+        self._session_factory = session_factory
+        self._positions: Dict[TopicPartition, int] = {}
+        # Earliest offset per partition of each unwritten window
+        self._holds: Dict[int, Dict[TopicPartition, int]] = {}
+        self._committed: Dict[TopicPartition, int] = {}
+        self._unwritten: List[OperationRollup] = []
+
+    @classmethod
+    def from_settings(cls) -> "RollupConsumer":
+        """Create a consumer of kafka_topic in the kafka_group_id group."""
+        consumer = AIOKafkaConsumer(
+            settings.kafka_topic,
+            bootstrap_servers=settings.kafka_bootstrap_servers,
+            group_id=settings.kafka_group_id,
+            enable_auto_commit=False,
+            auto_offset_reset="earliest",
+        )
+        return cls(consumer)
+
+    async def start(self) -> None:
+        """Seed the aggregator from SQLite and start consuming."""
+        if self._session_factory is None:
+            from infra.db import AsyncSessionLocal
+
+            self._session_factory = AsyncSessionLocal
+
+        async with self._session_factory() as session:
+            latest = await SqliteRollupRepository(
+                session
+            ).latest_window_start()
+        if latest is not None:
+            self.aggregator.seed(latest)
+        await self._consumer.start()
+        logger.info("Rollup consumer started", resume_after=latest)
+
+    async def stop(self) -> None:
+        """Stop consuming; open windows are rebuilt on the next start."""
+        await self._consumer.stop()
+        logger.info("Rollup consumer stopped")
+
+    async def run(self, stopping: Optional[asyncio.Event] = None) -> None:
+        """Poll until stopping is set."""
+        while stopping is None or not stopping.is_set():
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error("Rollup poll failed", error=str(e))
+                await asyncio.sleep(settings.rollup_poll_timeout_ms / 1000)
+
+    async def poll(self) -> int:
+        """Aggregate one fetch of records; return how many were read."""
+        batches = await self._consumer.getmany(
+            timeout_ms=settings.rollup_poll_timeout_ms,
+            max_records=settings.rollup_poll_max_records,
+        )
+        records = 0
+        for partition, messages in batches.items():
+            for message in messages:
+                self._aggregate(partition, message)
+                self._positions[partition] = message.offset + 1
+            records += len(messages)
+
+        self._unwritten.extend(self.aggregator.close())
+        if self._unwritten:
+            await self._write()
+        await self._commit()
+        return records
+
+    def _aggregate(self, partition: TopicPartition, message: Any) -> None:
+        # Undecodable events raise EventDecodeError, a ValueError
+        try:
+            start = self.aggregator.add(decode_event(message.value))
+        except (ValueError, KeyError, TypeError) as e:
+            rollup_events_consumed.labels(status="invalid").inc()
+            logger.warning(
+                "Skipping invalid event",
+                partition=partition.partition,
+                offset=message.offset,
+                error=str(e),
+            )
+            return
+        if start is not None:
+            self._holds.setdefault(start, {}).setdefault(
+                partition, message.offset
+            )
+
+    async def _write(self) -> None:
+        """Write closed windows, releasing their offsets once stored."""
+        try:
+            async with self._session_factory() as session:
+                await SqliteRollupRepository(session).save_rollups(
+                    self._unwritten
+                )
+        except Exception as e:
+            # Kept, with their offsets held, for the next poll
+            logger.error(
+                "Failed to write rollups",
+                rollups=len(self._unwritten),
+                error=str(e),
+            )
+            return
+
+        rollup_windows_written.inc(len(self._unwritten))
+        self._unwritten = []
+        open_from = self.aggregator.open_from
+        for start in [start for start in self._holds if start < open_from]:
+            del self._holds[start]
+
+    async def _commit(self) -> None:
+        offsets = {}
+        for partition, position in self._positions.items():
+            held = [
+                holds[partition]
+                for holds in self._holds.values()
+                if partition in holds
+            ]
+            offset = min(held, default=position)
+            if self._committed.get(partition) != offset:
+                offsets[partition] = offset
+        if offsets:
+            await self._consumer.commit(offsets)
+            self._committed.update(offsets)
@@ -0,0 +1,274 @@
+"""Append-only local spool for events that could not reach Kafka."""
+
+import asyncio
+import os
+import struct
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from .logging import get_logger
+from .metrics import kafka_events_dropped, kafka_spool_bytes
+
+logger = get_logger(__name__)
+
+# Each record: payload length, CRC32 of the payload, payload
+_RECORD = struct.Struct(">II")
+# Each payload: topic length, key length, topic, key, encoded event
+_PAYLOAD = struct.Struct(">HH")
+_NO_KEY = 0xFFFF
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".log"
+
+# (topic, key, value), with the event already encoded for the topic
+SpooledEvent = Tuple[str, Optional[str], bytes]
+
+
+def _segment_name(sequence: int) -> str:
+    return f"{_SEGMENT_PREFIX}{sequence:012d}{_SEGMENT_SUFFIX}"
+
+
+def _pack_event(event: SpooledEvent) -> bytes:
+    topic, key, value = event
+    topic_bytes = topic.encode("utf-8")
+    key_bytes = key.encode("utf-8") if key is not None else b""
+    key_length = len(key_bytes) if key is not None else _NO_KEY
+    return (
+        _PAYLOAD.pack(len(topic_bytes), key_length)
+        + topic_bytes
+        + key_bytes
+        + value
+    )
+
+
+def _unpack_event(payload: bytes) -> SpooledEvent:
+    topic_length, key_length = _PAYLOAD.unpack_from(payload)
+    offset = _PAYLOAD.size + topic_length
+    topic = payload[_PAYLOAD.size : offset].decode("utf-8")
+    key = None
+    if key_length != _NO_KEY:
+        key = payload[offset : offset + key_length].decode("utf-8")
+        offset += key_length
+    return topic, key, payload[offset:]
+
+
+class EventSpool:
+    """Durable FIFO of events, stored as a directory of segment files.
+
+    Events are appended to the newest segment, which is rolled over at
+    segment_bytes; reads start at the oldest one, and segments are deleted
+    once fully consumed. Appends are dropped while the spool holds
+    max_bytes. The fsync policy trades durability for append cost:
+    "always" syncs every append, "interval" at most once per
+    fsync_interval_ms (off the event loop), "never" leaves it to the OS.
+
+    Delivery is at least once: the read position is kept in memory only,
+    so after a restart every remaining segment is replayed from its start.
+    A record torn by a crash ends its segment.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int,
+        max_bytes: int,
+        fsync: str = "interval",
+        fsync_interval_ms: int = 1000,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval_ms / 1000
+        self._segments: List[int] = []
+        self._sizes: Dict[int, int] = {}
+        self._file = None
+        self._read_offset = 0
+        self._last_sync = 0.0
+        self._pending_sync: Optional[asyncio.Future] = None
+
+    @classmethod
+    def from_settings(cls) -> "EventSpool":
+        """Create a spool configured from settings."""
+        return cls(
+            directory=settings.kafka_spool_dir,
+            segment_bytes=settings.kafka_spool_segment_bytes,
+            max_bytes=settings.kafka_spool_max_bytes,
+            fsync=settings.kafka_spool_fsync,
+            fsync_interval_ms=settings.kafka_spool_fsync_interval_ms,
+        )
+
+    @property
+    def empty(self) -> bool:
+        """Whether every spooled event has been read and committed."""
+        if not self._segments:
+            return True
+        return (
+            len(self._segments) == 1
+            and self._read_offset >= self._sizes[self._segments[0]]
+        )
+
+    @property
+    def size(self) -> int:
+        """Bytes held on disk, including consumed parts of segments."""
+        return sum(self._sizes.values())
+
+    def open(self) -> None:
+        """Open the directory, keeping segments left by a previous run."""
+        os.makedirs(self.directory, exist_ok=True)
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(
+                _SEGMENT_SUFFIX
+            ):
+                sequence = int(
+                    name[len(_SEGMENT_PREFIX) : -len(_SEGMENT_SUFFIX)]
+                )
+                self._segments.append(sequence)
+                self._sizes[sequence] = os.path.getsize(self._path(sequence))
+        self._read_offset = 0
+        kafka_spool_bytes.set(self.size)
+        if self._segments:
+            logger.info(
+                "Kafka spool has events to replay",
+                segments=len(self._segments),
+                bytes=self.size,
+            )
+
+    def close(self) -> None:
+        """Flush, sync and close the segment being written."""
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync != "never":
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def append(self, events: List[SpooledEvent]) -> int:
+        """Append events in one write; return how many were stored."""
+        records = []
+        size = self.size
+        for event in events:
+            payload = _pack_event(event)
+            record = _RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+            if size + len(record) > self.max_bytes:
+                kafka_events_dropped.labels(reason="spool_full").inc(
+                    len(events) - len(records)
+                )
+                break
+            records.append(record)
+            size += len(record)
+        if not records:
+            return 0
+
+        data = b"".join(records)
+        self._writable(len(data)).write(data)
+        self._file.flush()
+        self._sizes[self._segments[-1]] += len(data)
+        kafka_spool_bytes.set(self.size)
+        self._sync()
+        return len(records)
+
+    def read(self, limit: int) -> Tuple[List[SpooledEvent], int]:
+        """Return up to limit unread events and the bytes they span.
+
+        Events stay spooled until commit() is called with that count.
+        """
+        if self._file is not None:
+            self._file.flush()
+
+        events: List[SpooledEvent] = []
+        if not self._segments:
+            return events, 0
+
+        sequence = self._segments[0]
+        end = self._sizes[sequence]
+        offset = self._read_offset
+        with open(self._path(sequence), "rb") as segment:
+            segment.seek(offset)
+            while len(events) < limit and offset + _RECORD.size <= end:
+                length, crc = _RECORD.unpack(segment.read(_RECORD.size))
+                payload = segment.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    # Torn by a crash: nothing after it can be trusted
+                    logger.warning(
+                        "Skipping damaged Kafka spool record",
+                        segment=sequence,
+                        offset=offset,
+                    )
+                    return events, end - self._read_offset
+                events.append(_unpack_event(payload))
+                offset += _RECORD.size + length
+        if not events and offset < end:
+            # A partial record header left by a crash
+            return events, end - self._read_offset
+        return events, offset - self._read_offset
+
+    def commit(self, consumed: int) -> None:
+        """Mark bytes returned by read() as delivered."""
+        self._read_offset += consumed
+        sequence = self._segments[0]
+        if self._read_offset < self._sizes[sequence]:
+            return
+        if self._file is not None and len(self._segments) == 1:
+            # Drained: start a new segment rather than grow this one
+            self.close()
+        self._remove(sequence)
+
+    def _writable(self, size: int):
+        """Return the segment file to append size bytes to."""
+        if self._file is not None and (
+            self._sizes[self._segments[-1]] + size <= self.segment_bytes
+        ):
+            return self._file
+
+        self.close()
+        # Never append to a segment from a previous run: it may be torn
+        sequence = self._segments[-1] + 1 if self._segments else 0
+        self._file = open(self._path(sequence), "ab")
+        self._segments.append(sequence)
+        self._sizes[sequence] = 0
+        return self._file
+
+    def _remove(self, sequence: int) -> None:
+        self._segments.remove(sequence)
+        del self._sizes[sequence]
+        self._read_offset = 0
+        try:
+            os.remove(self._path(sequence))
+        except FileNotFoundError:
+            pass
+        kafka_spool_bytes.set(self.size)
+
+    def _sync(self) -> None:
+        """Apply the fsync policy after an append."""
+        if self.fsync == "always":
+            os.fsync(self._file.fileno())
+            return
+        if self.fsync != "interval":
+            return
+
+        now = time.monotonic()
+        if now - self._last_sync < self.fsync_interval or (
+            self._pending_sync is not None and not self._pending_sync.done()
+        ):
+            return
+        self._last_sync = now
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            os.fsync(self._file.fileno())
+            return
+        # Sync a duplicate descriptor so rollover can close the file
+        fd = os.dup(self._file.fileno())
+        self._pending_sync = loop.run_in_executor(None, _fsync_and_close, fd)
+
+    def _path(self, sequence: int) -> str:
+        return os.path.join(self.directory, _segment_name(sequence))
+
+
+def _fsync_and_close(fd: int) -> None:
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
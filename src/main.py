@@ -3,26 +3,31 @@
 from contextlib import asynccontextmanager
 from typing import Any, Dict
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import PlainTextResponse
 
+from api.middleware import RequestMetricsMiddleware
 from api.v1 import v1_router
 from config import settings
+from repositories.sqlite_repo import operation_write_buffer
+from infra.auth import shutdown_hash_executor
+from services.precomputed import precomputed_table
 from infra import (
     configure_logging,
     create_tables,
     get_logger,
     get_metrics,
-    request_count,
-    request_duration,
     cache,
+    compute_executor,
+    configure_int_limits,
     kafka_producer,
 )
 
 
 # Configure logging early
 configure_logging()
+configure_int_limits()
 logger = get_logger(__name__)
 
 
@@ -34,6 +39,25 @@ async def lifespan(app: FastAPI):
     await create_tables()
     logger.info("Database tables created")
 
+    # Build or map the precomputed small-n table
+    if settings.precomputed_enabled:
+        try:
+            precomputed_table.load(settings.precomputed_path or None)
+            logger.info(
+                "Precomputed table loaded", limits=precomputed_table.limits
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load precomputed table: {e}")
+
+    # Start the write-behind buffer for math operations
+    await operation_write_buffer.start()
+
+    # Start the compute process pool
+    try:
+        await compute_executor.start()
+    except Exception as e:
+        logger.warning(f"Failed to start compute pool: {e}")
+
     # Initialize Redis connection
     if settings.redis_enabled:
         try:
@@ -55,6 +79,22 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Math Service API")
 
+    # Flush buffered math operations
+    try:
+        await operation_write_buffer.stop()
+        logger.info("Write-behind buffer flushed")
+    except Exception as e:
+        logger.warning(f"Error flushing write-behind buffer: {e}")
+
+    # Stop the compute process pool
+    try:
+        await compute_executor.stop()
+    except Exception as e:
+        logger.warning(f"Error stopping compute pool: {e}")
+
+    shutdown_hash_executor(wait=False)
+    precomputed_table.close()
+
     # Cleanup Redis connection
     if settings.redis_enabled:
         try:
@@ -96,53 +136,7 @@ def create_app() -> FastAPI:
     )
 
     # Add request logging middleware
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        """Log all HTTP requests with timing and Kafka events."""
-        import time
-
-        start_time = time.time()
-
-        # Process request
-        response = await call_next(request)
-
-        # Calculate duration
-        duration = time.time() - start_time
-
-        # Log request
-        logger.info(
-            "HTTP request processed",
-            method=request.method,
-            url=str(request.url),
-            status_code=response.status_code,
-            duration_seconds=duration,
-        )
-
-        # Send API event to Kafka
-        if settings.kafka_enabled:
-            try:
-                await kafka_producer.send_api_event(
-                    method=request.method,
-                    endpoint=request.url.path,
-                    status_code=response.status_code,
-                    duration_ms=duration * 1000,
-                )
-            except Exception as e:
-                logger.warning(f"Failed to send API event to Kafka: {e}")
-
-        # Update metrics
-        request_count.labels(
-            method=request.method,
-            endpoint=request.url.path,
-            status_code=response.status_code,
-        ).inc()
-
-        request_duration.labels(
-            method=request.method,
-            endpoint=request.url.path,
-        ).observe(duration)
-
-        return response
+    app.add_middleware(RequestMetricsMiddleware)
 
     # Include API routers
     app.include_router(v1_router)
@@ -1,9 +1,10 @@
 """Repository interfaces (ports) for the application."""
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 
-from domain.models import MathOperation, User, UserCreate
+from domain.models import MathOperation, OperationRollup, User, UserCreate
 
 
 class MathOperationRepository(ABC):
@@ -14,6 +15,11 @@ class MathOperationRepository(ABC):
         """Save a math operation to storage."""
         pass
 
+    async def save_operations(self, operations: List[MathOperation]) -> None:
+        """Save several math operations to storage."""
+        for operation in operations:
+            await self.save_operation(operation)
+
     @abstractmethod
     async def get_operations(
         self, operation_type: Optional[str] = None, limit: int = 100
@@ -29,6 +35,27 @@ class MathOperationRepository(ABC):
         pass
 
 
+class OperationRollupRepository(ABC):
+    """Abstract repository for windowed operation rollups."""
+
+    @abstractmethod
+    async def save_rollups(self, rollups: List[OperationRollup]) -> None:
+        """Save rollups, replacing any stored for the same window and key."""
+        pass
+
+    @abstractmethod
+    async def get_rollups(
+        self, event_type: Optional[str] = None, limit: int = 100
+    ) -> List[OperationRollup]:
+        """Retrieve the most recent rollups."""
+        pass
+
+    @abstractmethod
+    async def latest_window_start(self) -> Optional[datetime]:
+        """Start of the most recent stored window, if any."""
+        pass
+
+
 class UserRepository(ABC):
     """Abstract repository for user management."""
 
@@ -1,8 +1,10 @@
 """SQLite repository implementation."""
 
+import asyncio
 import json
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 from sqlalchemy import (
     Boolean,
@@ -12,15 +14,33 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    UniqueConstraint,
     func,
+    insert,
     select,
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
-from domain.models import MathOperation, User, UserCreate, UserRole
-from repositories.interfaces import MathOperationRepository, UserRepository
-from infra.auth import get_password_hash
+from config import settings
+from domain.models import (
+    MathOperation,
+    OperationRollup,
+    User,
+    UserCreate,
+    UserRole,
+)
+from repositories.interfaces import (
+    MathOperationRepository,
+    OperationRollupRepository,
+    UserRepository,
+)
+from infra.auth import get_password_hash_async, principal_cache
+from infra.logging import get_logger
+from infra.metrics import db_operation_count, db_write_buffer_pending
+
+logger = get_logger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -56,14 +76,71 @@ class MathOperationModel(Base):
     @classmethod
     def from_domain(cls, operation: MathOperation) -> "MathOperationModel":
         """Create from domain model."""
-        return cls(
-            operation_type=operation.operation_type,
-            parameters=json.dumps(operation.parameters),
-            result=str(operation.result),
-            duration_ms=operation.duration_ms,
-            timestamp=operation.timestamp,
+        return cls(**cls.row_from_domain(operation))
+
+    @staticmethod
+    def row_from_domain(operation: MathOperation) -> Dict[str, Any]:
+        """Create an insert row (column values) from domain model."""
+        return {
+            "operation_type": operation.operation_type,
+            "parameters": json.dumps(operation.parameters),
+            "result": str(operation.result),
+            "duration_ms": operation.duration_ms,
+            "timestamp": operation.timestamp,
+        }
+
+
+class OperationRollupModel(Base):
+    """SQLAlchemy model for windowed operation rollups."""
+
+    __tablename__ = "operation_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "window_start", "window_seconds", "event_type", "name"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    window_start = Column(DateTime, nullable=False, index=True)
+    window_seconds = Column(Integer, nullable=False)
+    event_type = Column(String(50), nullable=False)
+    name = Column(String(50), nullable=False)
+    count = Column(Integer, nullable=False)
+    errors = Column(Integer, nullable=False)
+    p50_ms = Column(Float, nullable=False)
+    p95_ms = Column(Float, nullable=False)
+    p99_ms = Column(Float, nullable=False)
+
+    def to_domain(self) -> OperationRollup:
+        """Convert to domain model."""
+        return OperationRollup(
+            # SQLite stores naive datetimes; windows are always UTC
+            window_start=self.window_start.replace(tzinfo=timezone.utc),
+            window_seconds=self.window_seconds,
+            event_type=self.event_type,
+            name=self.name,
+            count=self.count,
+            errors=self.errors,
+            p50_ms=self.p50_ms,
+            p95_ms=self.p95_ms,
+            p99_ms=self.p99_ms,
         )
 
+    @staticmethod
+    def row_from_domain(rollup: OperationRollup) -> Dict[str, Any]:
+        """Create an insert row (column values) from domain model."""
+        return {
+            "window_start": rollup.window_start,
+            "window_seconds": rollup.window_seconds,
+            "event_type": rollup.event_type,
+            "name": rollup.name,
+            "count": rollup.count,
+            "errors": rollup.errors,
+            "p50_ms": rollup.p50_ms,
+            "p95_ms": rollup.p95_ms,
+            "p99_ms": rollup.p99_ms,
+        }
+
 
 class UserModel(Base):
     """SQLAlchemy model for users."""
@@ -113,15 +190,168 @@ class UserModel(Base):
         )
 
 
+class OperationWriteBuffer:
+    """Write-behind buffer that persists math operations in batches.
+
+    Operations are collected in memory and inserted with one executemany
+    in a single transaction every db_write_batch_size records or
+    db_write_flush_interval_ms, whichever comes first, so SQLite commits
+    once per batch instead of once per request.
+    """
+
+    def __init__(
+        self, session_factory: Optional[Callable[[], AsyncSession]] = None
+    ) -> None:
+        """Initialize with a session factory (defaults to infra.db)."""
+        self._session_factory = session_factory
+        self._pending: Deque[MathOperation] = deque(
+            maxlen=settings.db_write_max_pending
+        )
+        self._wakeup = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher is running."""
+        return self._flusher is not None and not self._flusher.done()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered operations."""
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Start the background flusher."""
+        if self._session_factory is None:
+            from infra.db import AsyncSessionLocal
+
+            self._session_factory = AsyncSessionLocal
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still buffered.
+
+        A flush in progress is not interrupted; the final flushes wait for
+        it on the flush lock.
+        """
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        while self._pending:
+            await self.flush()
+
+    def add(self, operation: MathOperation) -> None:
+        """Buffer an operation for the next flush."""
+        if len(self._pending) == self._pending.maxlen:
+            # The bounded deque evicts the oldest operation
+            db_operation_count.labels(
+                operation_type="insert_operation", status="dropped"
+            ).inc()
+        self._pending.append(operation)
+        db_write_buffer_pending.set(len(self._pending))
+
+        if len(self._pending) >= settings.db_write_batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Insert up to one batch of buffered operations; return the count."""
+        async with self._flush_lock:
+            size = min(settings.db_write_batch_size, len(self._pending))
+            if not size:
+                return 0
+            batch = [self._pending.popleft() for _ in range(size)]
+            db_write_buffer_pending.set(len(self._pending))
+
+            rows = [MathOperationModel.row_from_domain(op) for op in batch]
+            try:
+                async with self._session_factory() as session:
+                    await session.execute(insert(MathOperationModel), rows)
+                    await session.commit()
+            except BaseException:
+                db_operation_count.labels(
+                    operation_type="insert_batch", status="error"
+                ).inc()
+                self._restore(batch)
+                raise
+
+            db_operation_count.labels(
+                operation_type="insert_batch", status="success"
+            ).inc()
+            return len(batch)
+
+    def _restore(self, batch: List[MathOperation]) -> None:
+        """Put a failed batch back in front so the next flush retries it."""
+        overflow = len(self._pending) + len(batch) - self._pending.maxlen
+        if overflow > 0:
+            # extendleft on a full deque evicts the newest operations
+            db_operation_count.labels(
+                operation_type="insert_operation", status="dropped"
+            ).inc(overflow)
+        self._pending.extendleft(reversed(batch))
+        db_write_buffer_pending.set(len(self._pending))
+
+    async def _flush_loop(self) -> None:
+        """Flush when a batch fills up or the interval elapses."""
+        interval = settings.db_write_flush_interval_ms / 1000
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                while self._pending:
+                    # Shielded so stop() cannot cancel an insert midway
+                    await asyncio.shield(self.flush())
+                    if len(self._pending) < settings.db_write_batch_size:
+                        break
+            except Exception as e:
+                logger.error(
+                    "Write-behind flush failed",
+                    pending=len(self._pending),
+                    error=str(e),
+                )
+
+
+# Global write-behind buffer for math operations
+operation_write_buffer = OperationWriteBuffer()
+
+
 class SqliteRepository(MathOperationRepository):
     """SQLite implementation of the math operation repository."""
 
-    def __init__(self, session: AsyncSession) -> None:
-        """Initialize with database session."""
+    def __init__(
+        self,
+        session: AsyncSession,
+        durability: Optional[str] = None,
+        write_buffer: Optional[OperationWriteBuffer] = None,
+    ) -> None:
+        """Initialize with database session and durability mode.
+
+        durability is "sync" (commit before returning) or "write_behind"
+        (hand off to the write buffer); it defaults to db_durability_mode.
+        """
         self.session = session
+        self.durability = durability or settings.db_durability_mode
+        self.write_buffer = (
+            write_buffer
+            if write_buffer is not None
+            else operation_write_buffer
+        )
 
     async def save_operation(self, operation: MathOperation) -> None:
         """Save a math operation to SQLite."""
+        if self.durability == "write_behind" and self.write_buffer.running:
+            self.write_buffer.add(operation)
+            return
+
         try:
             model = MathOperationModel.from_domain(operation)
             self.session.add(model)
@@ -130,6 +360,24 @@ class SqliteRepository(MathOperationRepository):
             await self.session.rollback()
             raise
 
+    async def save_operations(self, operations: List[MathOperation]) -> None:
+        """Save several math operations with one executemany insert."""
+        if not operations:
+            return
+
+        if self.durability == "write_behind" and self.write_buffer.running:
+            for operation in operations:
+                self.write_buffer.add(operation)
+            return
+
+        rows = [MathOperationModel.row_from_domain(op) for op in operations]
+        try:
+            await self.session.execute(insert(MathOperationModel), rows)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
     async def get_operations(
         self, operation_type: Optional[str] = None, limit: int = 100
     ) -> List[MathOperation]:
@@ -163,6 +411,66 @@ class SqliteRepository(MathOperationRepository):
         return result.scalar() or 0
 
 
+class SqliteRollupRepository(OperationRollupRepository):
+    """SQLite implementation of the operation rollup repository."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize with database session."""
+        self.session = session
+
+    async def save_rollups(self, rollups: List[OperationRollup]) -> None:
+        """Upsert rollups with one executemany in one transaction."""
+        if not rollups:
+            return
+
+        stmt = sqlite_insert(OperationRollupModel)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                "window_start",
+                "window_seconds",
+                "event_type",
+                "name",
+            ],
+            set_={
+                column: stmt.excluded[column]
+                for column in ("count", "errors", "p50_ms", "p95_ms", "p99_ms")
+            },
+        )
+        rows = [OperationRollupModel.row_from_domain(r) for r in rollups]
+        try:
+            await self.session.execute(stmt, rows)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def get_rollups(
+        self, event_type: Optional[str] = None, limit: int = 100
+    ) -> List[OperationRollup]:
+        """Retrieve the most recent rollups from SQLite."""
+        stmt = select(OperationRollupModel)
+
+        if event_type:
+            stmt = stmt.where(OperationRollupModel.event_type == event_type)
+
+        stmt = stmt.order_by(
+            OperationRollupModel.window_start.desc(),
+            OperationRollupModel.event_type,
+            OperationRollupModel.name,
+        ).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return [model.to_domain() for model in result.scalars().all()]
+
+    async def latest_window_start(self) -> Optional[datetime]:
+        """Start of the most recent stored window, if any."""
+        result = await self.session.execute(
+            select(func.max(OperationRollupModel.window_start))
+        )
+        latest = result.scalar()
+        return latest.replace(tzinfo=timezone.utc) if latest else None
+
+
 class SqliteUserRepository(UserRepository):
     """SQLite implementation of the user repository."""
 
@@ -174,7 +482,9 @@ class SqliteUserRepository(UserRepository):
         """Create a new user."""
         try:
             # Hash password
-            hashed_password = get_password_hash(user_data.password)
+            hashed_password = await get_password_hash_async(
+                user_data.password
+            )
 
             # Create user model
             user_model = UserModel.from_domain_create(
@@ -241,6 +551,9 @@ class SqliteUserRepository(UserRepository):
             await self.session.commit()
             await self.session.refresh(user_model)
 
+            # Cached principals may carry stale role or is_active
+            principal_cache.invalidate_user(user_id=user_id)
+
             return user_model.to_domain()
         except Exception:
             await self.session.rollback()
@@ -259,6 +572,8 @@ class SqliteUserRepository(UserRepository):
             await self.session.delete(user_model)
             await self.session.commit()
 
+            principal_cache.invalidate_user(user_id=user_id)
+
             return True
         except Exception:
             await self.session.rollback()
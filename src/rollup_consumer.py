@@ -0,0 +1,34 @@
+"""Entry point of the consumer that rolls up Kafka events into SQLite.
+
+Run from the src directory: python rollup_consumer.py
+"""
+
+import asyncio
+import signal
+
+from infra import configure_logging, create_tables, get_logger
+from infra.rollups import RollupConsumer
+
+configure_logging()
+logger = get_logger(__name__)
+
+
+async def main() -> None:
+    """Consume events until SIGINT or SIGTERM."""
+    await create_tables()
+    consumer = RollupConsumer.from_settings()
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopping.set)
+
+    await consumer.start()
+    try:
+        await consumer.run(stopping)
+    finally:
+        await consumer.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -7,7 +7,7 @@ from fastapi import HTTPException, status
 
 from domain.models import User, UserCreate, UserLogin, Token
 from repositories.interfaces import UserRepository
-from infra.auth import verify_password, create_access_token
+from infra.auth import verify_password_async, create_access_token
 from config import settings
 
 
@@ -56,7 +56,9 @@ class AuthService:
         if not user.is_active:
             return None
 
-        if not verify_password(login_data.password, user.hashed_password):
+        if not await verify_password_async(
+            login_data.password, user.hashed_password
+        ):
             return None
 
         return user
@@ -1,40 +1,188 @@
 """Factorial calculation service."""
 
-import math
+import asyncio
 import time
 from datetime import datetime, timezone
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-from domain.models import FactorialRequest, FactorialResult, MathOperation
+from domain.models import (
+    DecimalInt,
+    FactorialRequest,
+    FactorialResult,
+    MathOperation,
+)
 from repositories.interfaces import MathOperationRepository
 from config import settings
 from infra.logging import get_logger
 from infra.metrics import operation_count, operation_duration
-from infra import cache, cache_key_for_operation
-from infra.messaging import send_operation_event
+from infra import (
+    cache,
+    call_rendered,
+    cache_key_for_operation,
+    compute_executor,
+    estimate_cost,
+    single_flight,
+)
+from infra.messaging import send_operation_event, send_operation_events
+from services.precomputed import precomputed_table
 
 logger = get_logger(__name__)
 
+# Below this many factors a plain loop beats further splitting
+_SPLIT_THRESHOLD = 16
+
+# Streams hand control back to the event loop every this many terms
+STREAM_YIELD_EVERY = 256
+
+
+def odd_product(lo: int, hi: int) -> int:
+    """Return the product of the odd numbers in [lo, hi) by binary splitting.
+
+    Both bounds must be odd. Splitting keeps the operands of every
+    multiplication balanced, which lets Karatsuba do the heavy lifting.
+    """
+    count = (hi - lo) // 2
+    if count <= _SPLIT_THRESHOLD:
+        result = 1
+        for i in range(lo, hi, 2):
+            result *= i
+        return result
+
+    mid = lo + 2 * (count // 2)
+    return odd_product(lo, mid) * odd_product(mid, hi)
+
+
+def factorial_binary_split(n: int) -> int:
+    """Calculate n! with binary-splitting product trees.
+
+    n! is split into its odd part and a power of two. The odd part is the
+    product over i of the odd numbers in (n >> (i + 1), n >> i], each
+    raised to the (i + 1)th power, which is built up incrementally from
+    the largest shift down.
+    """
+    if n < 0:
+        raise ValueError("N must be non-negative")
+
+    inner = outer = 1
+    for i in range(n.bit_length() - 1, -1, -1):
+        lower = ((n >> (i + 1)) + 1) | 1
+        upper = ((n >> i) + 1) | 1
+        inner *= odd_product(lower, upper)
+        outer *= inner
+
+    # The exponent of two in n! is n minus the number of set bits in n
+    return outer << (n - bin(n).count("1"))
+
+
+def factorial_iterative(n: int) -> int:
+    """Calculate n! with the O(n) reference loop."""
+    if n < 0:
+        raise ValueError("N must be non-negative")
+
+    result = 1
+    for i in range(2, n + 1):
+        result *= i
+    return result
+
+
+FACTORIAL_ENGINES: Dict[str, Callable[[int], int]] = {
+    "binary_split": factorial_binary_split,
+    "iterative": factorial_iterative,
+}
+
+
+def range_product(lo: int, hi: int) -> int:
+    """Return the product of the integers in [lo, hi) by binary splitting."""
+    if hi - lo <= _SPLIT_THRESHOLD:
+        result = 1
+        for i in range(lo, hi):
+            result *= i
+        return result
+
+    mid = (lo + hi) // 2
+    return range_product(lo, mid) * range_product(mid, hi)
+
+
+def factorial_range(
+    start: int, end: int, first: Optional[int] = None
+) -> Iterator[Tuple[int, int]]:
+    """Yield (n, n!) for start <= n <= end from one running product.
+
+    first is start! when the caller already has it; each later term costs
+    one multiplication and only the current term is held.
+    """
+    result = first if first is not None else factorial_binary_split(start)
+    for n in range(start, end + 1):
+        if n > start:
+            result *= n
+        yield n, result
+
+
+def factorial_many(
+    ns: Iterable[int], engine: str = "binary_split"
+) -> Dict[int, int]:
+    """Calculate n! for several n with one running product.
+
+    The smallest n uses the chosen engine; every later one multiplies the
+    previous result by the product of the numbers in between.
+    """
+    results: Dict[int, int] = {}
+    previous = None
+    for n in sorted(set(ns)):
+        if previous is None:
+            result = FACTORIAL_ENGINES[engine](n)
+        else:
+            result *= range_product(previous + 1, n + 1)
+        results[n] = result
+        previous = n
+    return results
+
 
 class FactorialService:
     """Service for factorial calculations."""
 
-    def __init__(self, repository: MathOperationRepository) -> None:
-        """Initialize with repository dependency."""
+    def __init__(
+        self,
+        repository: MathOperationRepository,
+        engine: Optional[str] = None,
+    ) -> None:
+        """Initialize with repository dependency and algorithm choice."""
         self.repository = repository
+        self.engine = engine or settings.factorial_engine
+        if self.engine not in FACTORIAL_ENGINES:
+            raise ValueError(f"Unknown factorial engine: {self.engine}")
 
     def _calculate_factorial(self, n: int) -> int:
-        """Calculate factorial using iterative approach."""
-        if n <= 1:
-            return 1
+        """Calculate factorial with the configured engine."""
+        return FACTORIAL_ENGINES[self.engine](n)
 
-        # Check for potential overflow
-        if n > 170:  # factorial(170) is close to sys.float_info.max
-            raise ValueError("Number too large for factorial calculation")
+    @staticmethod
+    def _validate(n: int) -> None:
+        """Validate a factorial input against the configured limits."""
+        if n > settings.max_factorial_n:
+            raise ValueError(f"N must be <= {settings.max_factorial_n}")
 
-        result = 1
-        for i in range(2, n + 1):
-            result *= i
+    async def _compute_and_cache(self, n: int, cache_key: str) -> int:
+        """Calculate n!, off the event loop when expensive, and cache it."""
+        result = await compute_executor.run(
+            call_rendered,
+            FACTORIAL_ENGINES[self.engine],
+            n,
+            cost=estimate_cost("factorial", n=n),
+            operation_type="factorial",
+        )
 
+        # Cache the result with its decimal text
+        await cache.set(cache_key, result, ttl=3600)  # Cache for 1 hour
         return result
 
     async def calculate_factorial(
@@ -47,6 +195,11 @@ class FactorialService:
         cache_key = cache_key_for_operation("factorial", n=request.n)
 
         try:
+            # Answer small inputs from the precomputed table
+            precomputed = precomputed_table.factorial(request.n)
+            if precomputed is not None:
+                return FactorialResult(n=request.n, result=precomputed)
+
             # Check cache first
             cached_result = await cache.get(cache_key)
             if cached_result is not None:
@@ -55,17 +208,18 @@ class FactorialService:
                     n=request.n,
                     result=cached_result,
                 )
-                return FactorialResult(n=request.n, result=cached_result)
+                return FactorialResult(
+                    n=request.n, result=DecimalInt.wrap(cached_result)
+                )
 
             # Validate input limits
-            if request.n > settings.max_factorial_n:
-                raise ValueError(f"N must be <= {settings.max_factorial_n}")
-
-            # Calculate result
-            result = self._calculate_factorial(request.n)
+            self._validate(request.n)
 
-            # Cache the result
-            await cache.set(cache_key, result, ttl=3600)  # Cache for 1 hour
+            # Calculate and cache once for all identical in-flight requests
+            result = await single_flight.do(
+                cache_key,
+                lambda: self._compute_and_cache(request.n, cache_key),
+            )
 
             # Create result object
             factorial_result = FactorialResult(n=request.n, result=result)
@@ -135,3 +289,197 @@ class FactorialService:
                 operation_type="factorial", status="error"
             ).inc()
             raise
+
+    def stream_factorial(
+        self, start: int, end: int
+    ) -> AsyncIterator[Tuple[int, int]]:
+        """Validate a range and return an iterator over its terms.
+
+        Validation runs eagerly so errors surface before streaming starts.
+        """
+        if start < 0:
+            raise ValueError("N must be non-negative")
+        self._validate(end)
+        if start > end:
+            raise ValueError("Start must be <= end")
+        return self._stream_range(start, end)
+
+    async def _stream_range(
+        self, start: int, end: int
+    ) -> AsyncIterator[Tuple[int, int]]:
+        """Yield (n, n!) over a range from one running product."""
+        start_time = time.time()
+        produced = 0
+        status = "cancelled"
+
+        try:
+            # The first term can be expensive, so offload it like n!
+            first = await compute_executor.run(
+                FACTORIAL_ENGINES[self.engine],
+                start,
+                cost=estimate_cost("factorial", n=start),
+                operation_type="factorial",
+            )
+            for n, value in factorial_range(start, end, first):
+                yield n, value
+                produced += 1
+                # Let other requests run between chunks of terms
+                if produced % STREAM_YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+            status = "success"
+        finally:
+            duration_ms = (time.time() - start_time) * 1000
+            logger.info(
+                "Factorial stream finished",
+                start=start,
+                end=end,
+                terms=produced,
+                status=status,
+                duration_ms=duration_ms,
+            )
+            operation_count.labels(
+                operation_type="factorial", status=status
+            ).inc()
+
+    async def _compute_many_and_cache(self, ns: List[int]) -> Dict[int, int]:
+        """Calculate several factorials in one pass and cache them."""
+        results = await compute_executor.run(
+            call_rendered,
+            factorial_many,
+            ns,
+            self.engine,
+            cost=sum(estimate_cost("factorial", n=n) for n in ns),
+            operation_type="factorial",
+        )
+
+        await cache.set_many(
+            {
+                cache_key_for_operation("factorial", n=n): result
+                for n, result in results.items()
+            },
+            ttl=3600,
+        )
+        return results
+
+    async def calculate_factorial_batch(
+        self, requests: List[FactorialRequest]
+    ) -> List[FactorialResult]:
+        """Calculate several factorials with bulk caching and persistence.
+
+        Cache hits are read with one MGET, the misses share one running
+        product and the operations are saved and published in bulk.
+        """
+        start_time = time.time()
+        ns = [request.n for request in requests]
+
+        try:
+            # Validate input limits
+            if not ns:
+                raise ValueError("Batch must not be empty")
+            if len(ns) > settings.max_batch_size:
+                raise ValueError(
+                    f"Batch size must be <= {settings.max_batch_size}"
+                )
+            for n in ns:
+                self._validate(n)
+
+            # Answer small inputs from the precomputed table
+            values: Dict[int, int] = {}
+            for n in dict.fromkeys(ns):
+                precomputed = precomputed_table.factorial(n)
+                if precomputed is not None:
+                    values[n] = precomputed
+            # Table hits are not saved or published, as in the single path
+            recorded = [n for n in ns if n not in values]
+
+            # Check cache next, one lookup per remaining distinct n
+            unique = [n for n in dict.fromkeys(ns) if n not in values]
+            cached = await cache.get_many(
+                [cache_key_for_operation("factorial", n=n) for n in unique]
+            )
+            values.update(
+                (n, DecimalInt.wrap(result))
+                for n, result in zip(unique, cached, strict=True)
+                if result is not None
+            )
+
+            # Calculate the misses together
+            misses = [n for n in unique if n not in values]
+            if misses:
+                values.update(await self._compute_many_and_cache(misses))
+
+            results = [FactorialResult(n=n, result=values[n]) for n in ns]
+
+            # Calculate duration
+            duration_ms = (time.time() - start_time) * 1000
+
+            # Log the batch
+            logger.info(
+                "Factorial batch completed",
+                count=len(ns),
+                computed=len(misses),
+                duration_ms=duration_ms,
+            )
+
+            # Send operation events to Kafka
+            await send_operation_events(
+                [
+                    {
+                        "operation_type": "factorial",
+                        "parameters": {"n": n},
+                        "result": values[n],
+                        "duration_ms": duration_ms,
+                    }
+                    for n in recorded
+                ]
+            )
+
+            # Save to repository
+            timestamp = datetime.now(timezone.utc)
+            await self.repository.save_operations(
+                [
+                    MathOperation(
+                        operation_type="factorial",
+                        parameters={"n": n},
+                        result=values[n],
+                        duration_ms=duration_ms,
+                        timestamp=timestamp,
+                    )
+                    for n in recorded
+                ]
+            )
+
+            # Update metrics
+            operation_count.labels(
+                operation_type="factorial", status="success"
+            ).inc(len(recorded))
+            operation_duration.labels(operation_type="factorial").observe(
+                duration_ms / 1000
+            )
+
+            return results
+
+        except Exception as e:
+            duration_ms = (time.time() - start_time) * 1000
+
+            # Send error event to Kafka
+            await send_operation_event(
+                operation_type="factorial",
+                parameters={"n": ns},
+                result=None,
+                duration_ms=duration_ms,
+                success=False,
+                error=str(e),
+            )
+
+            logger.error(
+                "Factorial batch failed",
+                count=len(ns),
+                error=str(e),
+                duration_ms=duration_ms,
+            )
+
+            operation_count.labels(
+                operation_type="factorial", status="error"
+            ).inc()
+            raise
@@ -1,46 +1,295 @@
 """Fibonacci calculation service."""
 
+import asyncio
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-from domain.models import FibonacciRequest, FibonacciResult, MathOperation
+from domain.models import (
+    DecimalInt,
+    FibonacciRequest,
+    FibonacciResult,
+    MathOperation,
+)
 from repositories.interfaces import MathOperationRepository
 from config import settings
 from infra.logging import get_logger
 from infra.metrics import operation_count, operation_duration
-from infra import cache, cache_key_for_operation
-from infra.messaging import send_operation_event
+from infra import (
+    cache,
+    call_rendered,
+    cache_key_for_operation,
+    compute_executor,
+    estimate_cost,
+    single_flight,
+)
+from infra.messaging import send_operation_event, send_operation_events
+from services.precomputed import precomputed_table
 
 logger = get_logger(__name__)
 
+# Streams hand control back to the event loop every this many terms
+STREAM_YIELD_EVERY = 256
+
+
+def fibonacci_pair(n: int) -> Tuple[int, int]:
+    """Return (F(n), F(n + 1)) using the fast-doubling identities.
+
+    F(2k) = F(k) * (2 * F(k + 1) - F(k))
+    F(2k + 1) = F(k) ** 2 + F(k + 1) ** 2
+    """
+    a, b = 0, 1
+    # Walk the bits of n from the most significant one down
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fibonacci_advance(pair: Tuple[int, int], m: int) -> Tuple[int, int]:
+    """Advance (F(k), F(k + 1)) by m steps to (F(k + m), F(k + m + 1)).
+
+    Uses F(k + m) = F(m) * F(k + 1) + F(m - 1) * F(k), so the cost is a
+    fast-doubling pass over m plus four multiplications.
+    """
+    a, b = pair
+    f_m, f_m1 = fibonacci_pair(m)
+    return f_m * b + (f_m1 - f_m) * a, f_m1 * b + f_m * a
+
+
+def fibonacci_fast_doubling(n: int) -> int:
+    """Calculate nth Fibonacci number in O(log n) multiplications."""
+    return fibonacci_pair(n)[0]
+
+
+def fibonacci_linear(n: int) -> int:
+    """Calculate nth Fibonacci number with the O(n) reference loop."""
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+def fibonacci_range(
+    start: int, end: int, pair: Optional[Tuple[int, int]] = None
+) -> Iterator[Tuple[int, int]]:
+    """Yield (n, F(n)) for start <= n <= end from one running pair.
+
+    pair is (F(start), F(start + 1)) when the caller already has it; each
+    later term costs one addition and only two terms are held at a time.
+    """
+    a, b = pair if pair is not None else fibonacci_pair(start)
+    for n in range(start, end + 1):
+        yield n, a
+        a, b = b, a + b
+
+
+FIBONACCI_ENGINES: Dict[str, Callable[[int], int]] = {
+    "fast_doubling": fibonacci_fast_doubling,
+    "linear": fibonacci_linear,
+}
+
+
+class FibonacciMemo:
+    """Process-wide, bounded store of sparse Fibonacci checkpoints.
+
+    Only pairs (F(k), F(k + 1)) for k divisible by ``interval`` are kept,
+    so memory stays bounded while a cold request can resume from the
+    nearest checkpoint below it instead of starting from zero.
+    """
+
+    def __init__(self, interval: int = 1024, max_checkpoints: int = 256):
+        if interval < 1:
+            raise ValueError("Checkpoint interval must be positive")
+        self.interval = interval
+        self.max_checkpoints = max_checkpoints
+        self._checkpoints: OrderedDict[int, Tuple[int, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._checkpoints)
+
+    def checkpoint_for(self, n: int) -> int:
+        """Return the checkpoint index at or below n."""
+        return (n // self.interval) * self.interval
+
+    def nearest(self, n: int) -> Tuple[int, Tuple[int, int]]:
+        """Return the closest stored checkpoint at or below n."""
+        with self._lock:
+            best = max((k for k in self._checkpoints if k <= n), default=None)
+            if best is None:
+                return 0, (0, 1)
+            self._checkpoints.move_to_end(best)
+            return best, self._checkpoints[best]
+
+    def store(self, k: int, pair: Tuple[int, int]) -> None:
+        """Store the pair for checkpoint k, evicting the least recently used."""
+        if k == 0 or k % self.interval or self.max_checkpoints < 1:
+            return
+        with self._lock:
+            self._checkpoints[k] = pair
+            self._checkpoints.move_to_end(k)
+            while len(self._checkpoints) > self.max_checkpoints:
+                self._checkpoints.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all checkpoints."""
+        with self._lock:
+            self._checkpoints.clear()
+
+    def pair(self, n: int) -> Tuple[int, int]:
+        """Return (F(n), F(n + 1)), resuming from the nearest checkpoint."""
+        k = self.checkpoint_for(n)
+        start, start_pair = self.nearest(k)
+        if start != k:
+            start_pair = fibonacci_advance(start_pair, k - start)
+            self.store(k, start_pair)
+        if n == k:
+            return start_pair
+        return fibonacci_advance(start_pair, n - k)
+
+    def fibonacci(self, n: int) -> int:
+        """Calculate nth Fibonacci number using fast doubling."""
+        return self.pair(n)[0]
+
+    def fibonacci_linear(self, n: int) -> int:
+        """Calculate nth Fibonacci number with the linear reference loop.
+
+        The walk starts at the nearest checkpoint and records every
+        checkpoint it passes.
+        """
+        k, (a, b) = self.nearest(n)
+        for i in range(k + 1, n + 1):
+            a, b = b, a + b
+            if i % self.interval == 0:
+                self.store(i, (a, b))
+        return a
+
+    def fibonacci_many(self, ns: Iterable[int]) -> Dict[int, int]:
+        """Calculate F(n) for several n in one ascending pass.
+
+        The smallest n resumes from the memo; every later one advances the
+        running pair across the gap from the previous n.
+        """
+        results: Dict[int, int] = {}
+        previous = None
+        for n in sorted(set(ns)):
+            if previous is None:
+                pair = self.pair(n)
+            else:
+                pair = fibonacci_advance(pair, n - previous)
+            results[n] = pair[0]
+            previous = n
+        return results
+
+    def fibonacci_linear_many(self, ns: Iterable[int]) -> Dict[int, int]:
+        """Calculate F(n) for several n with one linear walk."""
+        targets = sorted(set(ns))
+        if not targets:
+            return {}
+
+        results: Dict[int, int] = {}
+        k, (a, b) = self.nearest(targets[0])
+        for n in targets:
+            while k < n:
+                a, b = b, a + b
+                k += 1
+                if k % self.interval == 0:
+                    self.store(k, (a, b))
+            results[n] = a
+        return results
+
+
+# Global memo shared by every FibonacciService in this process
+fibonacci_memo = FibonacciMemo(
+    interval=settings.fibonacci_memo_interval,
+    max_checkpoints=settings.fibonacci_memo_max_checkpoints,
+)
+
+
+def fibonacci_memoized(n: int, engine: str = "fast_doubling") -> int:
+    """Calculate nth Fibonacci number through this process's global memo.
+
+    Module-level so it can be sent to compute pool workers, each of which
+    keeps its own memo.
+    """
+    if engine == "linear":
+        return fibonacci_memo.fibonacci_linear(n)
+    return fibonacci_memo.fibonacci(n)
+
+
+def fibonacci_many_memoized(
+    ns: List[int], engine: str = "fast_doubling"
+) -> Dict[int, int]:
+    """Calculate several Fibonacci numbers through this process's memo."""
+    if engine == "linear":
+        return fibonacci_memo.fibonacci_linear_many(ns)
+    return fibonacci_memo.fibonacci_many(ns)
+
 
 class FibonacciService:
     """Service for Fibonacci calculations."""
 
-    def __init__(self, repository: MathOperationRepository) -> None:
-        """Initialize with repository dependency."""
+    def __init__(
+        self,
+        repository: MathOperationRepository,
+        engine: Optional[str] = None,
+        memo: Optional[FibonacciMemo] = None,
+    ) -> None:
+        """Initialize with repository dependency and algorithm choice."""
         self.repository = repository
-        self._cache: Dict[int, int] = {0: 0, 1: 1}
+        self.engine = engine or settings.fibonacci_engine
+        if self.engine not in FIBONACCI_ENGINES:
+            raise ValueError(f"Unknown Fibonacci engine: {self.engine}")
+        self.memo = memo if memo is not None else fibonacci_memo
 
     def _calculate_fibonacci(self, n: int) -> int:
-        """Calculate nth Fibonacci number using dynamic programming."""
-        if n in self._cache:
-            return self._cache[n]
+        """Calculate nth Fibonacci number with the configured engine."""
+        if self.engine == "linear":
+            return self.memo.fibonacci_linear(n)
 
-        # Initialize for iterative calculation
-        if n < 2:
-            return n
+        return self.memo.fibonacci(n)
 
-        # Calculate iteratively to avoid recursion limits
-        a, b = 0, 1
-        for i in range(2, n + 1):
-            a, b = b, a + b
-            # Cache intermediate results for efficiency
-            if i not in self._cache:
-                self._cache[i] = b
+    @staticmethod
+    def _validate(n: int) -> None:
+        """Validate a Fibonacci input against the configured limits."""
+        if not isinstance(n, int):
+            raise ValueError("N must be an integer")
+        if n < 0:
+            raise ValueError("N must be non-negative")
+        if n > settings.max_fibonacci_n:
+            raise ValueError(f"N must be <= {settings.max_fibonacci_n}")
 
-        return b
+    async def _compute_and_cache(self, n: int, cache_key: str) -> int:
+        """Calculate F(n), off the event loop when expensive, and cache it."""
+        cost = estimate_cost("fibonacci", n=n)
+        if compute_executor.should_offload(cost):
+            func, args = fibonacci_memoized, (n, self.engine)
+        else:
+            func, args = self._calculate_fibonacci, (n,)
+        result = await compute_executor.run(
+            call_rendered, func, *args, cost=cost, operation_type="fibonacci"
+        )
+
+        # Cache the result with its decimal text
+        await cache.set(cache_key, result, ttl=3600)  # Cache for 1 hour
+        return result
 
     async def calculate_fibonacci(self, n: int) -> FibonacciResult:
         """Calculate nth Fibonacci number with caching, logging and persistence."""
@@ -50,6 +299,11 @@ class FibonacciService:
         cache_key = cache_key_for_operation("fibonacci", n=n)
 
         try:
+            # Answer small inputs from the precomputed table
+            precomputed = precomputed_table.fibonacci(n)
+            if precomputed is not None:
+                return FibonacciResult(n=n, result=precomputed)
+
             # Check cache first
             cached_result = await cache.get(cache_key)
             if cached_result is not None:
@@ -58,21 +312,17 @@ class FibonacciService:
                     n=n,
                     result=cached_result,
                 )
-                return FibonacciResult(n=n, result=cached_result)
+                return FibonacciResult(
+                    n=n, result=DecimalInt.wrap(cached_result)
+                )
 
             # Validate input
-            if not isinstance(n, int):
-                raise ValueError("N must be an integer")
-            if n < 0:
-                raise ValueError("N must be non-negative")
-            if n > settings.max_fibonacci_n:
-                raise ValueError(f"N must be <= {settings.max_fibonacci_n}")
+            self._validate(n)
 
-            # Calculate result
-            result = self._calculate_fibonacci(n)
-
-            # Cache the result
-            await cache.set(cache_key, result, ttl=3600)  # Cache for 1 hour
+            # Calculate and cache once for all identical in-flight requests
+            result = await single_flight.do(
+                cache_key, lambda: self._compute_and_cache(n, cache_key)
+            )
 
             # Create result object
             fib_result = FibonacciResult(n=n, result=result)
@@ -142,3 +392,199 @@ class FibonacciService:
                 operation_type="fibonacci", status="error"
             ).inc()
             raise
+
+    def stream_fibonacci(
+        self, start: int, end: int
+    ) -> AsyncIterator[Tuple[int, int]]:
+        """Validate a range and return an iterator over its terms.
+
+        Validation runs eagerly so errors surface before streaming starts.
+        """
+        self._validate(start)
+        self._validate(end)
+        if start > end:
+            raise ValueError("Start must be <= end")
+        return self._stream_range(start, end)
+
+    async def _stream_range(
+        self, start: int, end: int
+    ) -> AsyncIterator[Tuple[int, int]]:
+        """Yield (n, F(n)) over a range, resuming from the shared memo."""
+        start_time = time.time()
+        produced = 0
+        status = "cancelled"
+
+        try:
+            # The first pair can be expensive, so offload it like F(n)
+            cost = estimate_cost("fibonacci", n=start)
+            if compute_executor.should_offload(cost):
+                func = fibonacci_pair
+            else:
+                func = self.memo.pair
+            first = await compute_executor.run(
+                func, start, cost=cost, operation_type="fibonacci"
+            )
+            for n, value in fibonacci_range(start, end, first):
+                yield n, value
+                produced += 1
+                # Let other requests run between chunks of terms
+                if produced % STREAM_YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+            status = "success"
+        finally:
+            duration_ms = (time.time() - start_time) * 1000
+            logger.info(
+                "Fibonacci stream finished",
+                start=start,
+                end=end,
+                terms=produced,
+                status=status,
+                duration_ms=duration_ms,
+            )
+            operation_count.labels(
+                operation_type="fibonacci", status=status
+            ).inc()
+
+    async def _compute_many_and_cache(self, ns: List[int]) -> Dict[int, int]:
+        """Calculate several Fibonacci numbers in one pass and cache them."""
+        cost = sum(estimate_cost("fibonacci", n=n) for n in ns)
+        if compute_executor.should_offload(cost):
+            func, args = fibonacci_many_memoized, (ns, self.engine)
+        elif self.engine == "linear":
+            func, args = self.memo.fibonacci_linear_many, (ns,)
+        else:
+            func, args = self.memo.fibonacci_many, (ns,)
+        results = await compute_executor.run(
+            call_rendered, func, *args, cost=cost, operation_type="fibonacci"
+        )
+
+        await cache.set_many(
+            {
+                cache_key_for_operation("fibonacci", n=n): result
+                for n, result in results.items()
+            },
+            ttl=3600,
+        )
+        return results
+
+    async def calculate_fibonacci_batch(
+        self, ns: List[int]
+    ) -> List[FibonacciResult]:
+        """Calculate several Fibonacci numbers with bulk caching and persistence.
+
+        Cache hits are read with one MGET, the misses are computed in a
+        single pass and the operations are saved and published in bulk.
+        """
+        start_time = time.time()
+
+        try:
+            # Validate input
+            if not ns:
+                raise ValueError("Batch must not be empty")
+            if len(ns) > settings.max_batch_size:
+                raise ValueError(
+                    f"Batch size must be <= {settings.max_batch_size}"
+                )
+            for n in ns:
+                self._validate(n)
+
+            # Answer small inputs from the precomputed table
+            values: Dict[int, int] = {}
+            for n in dict.fromkeys(ns):
+                precomputed = precomputed_table.fibonacci(n)
+                if precomputed is not None:
+                    values[n] = precomputed
+            # Table hits are not saved or published, as in the single path
+            recorded = [n for n in ns if n not in values]
+
+            # Check cache next, one lookup per remaining distinct n
+            unique = [n for n in dict.fromkeys(ns) if n not in values]
+            cached = await cache.get_many(
+                [cache_key_for_operation("fibonacci", n=n) for n in unique]
+            )
+            values.update(
+                (n, DecimalInt.wrap(result))
+                for n, result in zip(unique, cached, strict=True)
+                if result is not None
+            )
+
+            # Calculate the misses together
+            misses = [n for n in unique if n not in values]
+            if misses:
+                values.update(await self._compute_many_and_cache(misses))
+
+            results = [FibonacciResult(n=n, result=values[n]) for n in ns]
+
+            # Calculate duration
+            duration_ms = (time.time() - start_time) * 1000
+
+            # Log the batch
+            logger.info(
+                "Fibonacci batch completed",
+                count=len(ns),
+                computed=len(misses),
+                duration_ms=duration_ms,
+            )
+
+            # Send operation events to Kafka
+            await send_operation_events(
+                [
+                    {
+                        "operation_type": "fibonacci",
+                        "parameters": {"n": n},
+                        "result": values[n],
+                        "duration_ms": duration_ms,
+                    }
+                    for n in recorded
+                ]
+            )
+
+            # Save to repository
+            timestamp = datetime.now(timezone.utc)
+            await self.repository.save_operations(
+                [
+                    MathOperation(
+                        operation_type="fibonacci",
+                        parameters={"n": n},
+                        result=values[n],
+                        duration_ms=duration_ms,
+                        timestamp=timestamp,
+                    )
+                    for n in recorded
+                ]
+            )
+
+            # Update metrics
+            operation_count.labels(
+                operation_type="fibonacci", status="success"
+            ).inc(len(recorded))
+            operation_duration.labels(operation_type="fibonacci").observe(
+                duration_ms / 1000
+            )
+
+            return results
+
+        except Exception as e:
+            duration_ms = (time.time() - start_time) * 1000
+
+            # Send error event to Kafka
+            await send_operation_event(
+                operation_type="fibonacci",
+                parameters={"n": ns},
+                result=None,
+                duration_ms=duration_ms,
+                success=False,
+                error=str(e),
+            )
+
+            logger.error(
+                "Fibonacci batch failed",
+                count=len(ns),
+                error=str(e),
+                duration_ms=duration_ms,
+            )
+
+            operation_count.labels(
+                operation_type="fibonacci", status="error"
+            ).inc()
+            raise
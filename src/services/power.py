@@ -1,20 +1,39 @@
 """Power calculation service."""
 
+import math
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
-from domain.models import MathOperation, PowerRequest, PowerResult
+from domain.models import (
+    DecimalInt,
+    MathOperation,
+    PowerRequest,
+    PowerResult,
+)
 from repositories.interfaces import MathOperationRepository
 from config import settings
 from infra.logging import get_logger
 from infra.metrics import operation_count, operation_duration
-from infra import cache, cache_key_for_operation
-from infra.messaging import send_operation_event
+from infra import (
+    cache,
+    call_rendered,
+    cache_key_for_operation,
+    compute_executor,
+    estimate_cost,
+    single_flight,
+)
+from infra.messaging import send_operation_event, send_operation_events
+from services.precomputed import precomputed_table
 
 logger = get_logger(__name__)
 
 
+def power_many(pairs: List[Tuple[int, int]]) -> List[int]:
+    """Calculate base^exponent for several (base, exponent) pairs."""
+    return [pow(base, exponent) for base, exponent in pairs]
+
+
 class PowerService:
     """Service for power calculations."""
 
@@ -22,6 +41,70 @@ class PowerService:
         """Initialize with repository dependency."""
         self.repository = repository
 
+    @staticmethod
+    def _validate(request: PowerRequest) -> None:
+        """Validate a power request against the limits and overflow guards."""
+        if request.base > settings.max_power_base:
+            raise ValueError(f"Base must be <= {settings.max_power_base}")
+        if request.exponent > settings.max_power_exponent:
+            raise ValueError(
+                f"Exponent must be <= {settings.max_power_exponent}"
+            )
+
+        # Additional overflow protection
+        # Prevent calculations that would create extremely large numbers
+        # Check more specific cases first
+        if request.base > 100 and request.exponent > 20:
+            raise ValueError(
+                "Calculation would result in overflow: large base with large exponent"
+            )
+        if request.base > 10 and request.exponent > 100:
+            raise ValueError(
+                "Calculation would result in overflow: base > 10 with exponent > 100"
+            )
+        if request.exponent > 50:
+            raise ValueError(
+                f"Exponent too large: {request.exponent}. Maximum safe exponent is 50"
+            )
+
+        # Estimate result size to prevent memory issues
+        try:
+            # Use logarithms to estimate the size of the result
+            if request.base > 1 and request.exponent > 0:
+                log_result = request.exponent * math.log10(request.base)
+                if log_result > 1000:  # Result would have > 1000 digits
+                    raise ValueError(
+                        f"Result would be too large (estimated {int(log_result)} digits)"
+                    )
+        except (ValueError, OverflowError):
+            raise ValueError("Calculation parameters would cause overflow")
+
+    async def _compute_and_cache(
+        self, request: PowerRequest, cache_key: str
+    ) -> int:
+        """Calculate base^exponent, off the event loop when expensive, and cache it."""
+        # Calculate result with overflow protection
+        cost = estimate_cost(
+            "power", base=request.base, exponent=request.exponent
+        )
+        try:
+            result = await compute_executor.run(
+                call_rendered,
+                pow,
+                request.base,
+                request.exponent,
+                cost=cost,
+                operation_type="power",
+            )
+        except (OverflowError, MemoryError):
+            raise ValueError(
+                f"Calculation {request.base}^{request.exponent} causes overflow or memory error"
+            )
+
+        # Cache the result with its decimal text
+        await cache.set(cache_key, result, ttl=3600)  # Cache for 1 hour
+        return result
+
     async def calculate_power(self, request: PowerRequest) -> PowerResult:
         """Calculate base^exponent with caching, logging and persistence."""
         start_time = time.time()
@@ -32,6 +115,17 @@ class PowerService:
         )
 
         try:
+            # Answer small inputs from the precomputed table
+            precomputed = precomputed_table.power(
+                request.base, request.exponent
+            )
+            if precomputed is not None:
+                return PowerResult(
+                    base=request.base,
+                    exponent=request.exponent,
+                    result=precomputed,
+                )
+
             # Check cache first
             cached_result = await cache.get(cache_key)
             if cached_result is not None:
@@ -44,57 +138,16 @@ class PowerService:
                 return PowerResult(
                     base=request.base,
                     exponent=request.exponent,
-                    result=cached_result,
+                    result=DecimalInt.wrap(cached_result),
                 )
 
             # Validate input limits
-            if request.base > settings.max_power_base:
-                raise ValueError(f"Base must be <= {settings.max_power_base}")
-            if request.exponent > settings.max_power_exponent:
-                raise ValueError(
-                    f"Exponent must be <= {settings.max_power_exponent}"
-                )
+            self._validate(request)
 
-            # Additional overflow protection
-            # Prevent calculations that would create extremely large numbers
-            # Check more specific cases first
-            if request.base > 100 and request.exponent > 20:
-                raise ValueError(
-                    "Calculation would result in overflow: large base with large exponent"
-                )
-            if request.base > 10 and request.exponent > 100:
-                raise ValueError(
-                    "Calculation would result in overflow: base > 10 with exponent > 100"
-                )
-            if request.exponent > 50:
-                raise ValueError(
-                    f"Exponent too large: {request.exponent}. Maximum safe exponent is 50"
-                )
-
-            # Estimate result size to prevent memory issues
-            import math
-
-            try:
-                # Use logarithms to estimate the size of the result
-                if request.base > 1 and request.exponent > 0:
-                    log_result = request.exponent * math.log10(request.base)
-                    if log_result > 1000:  # Result would have > 1000 digits
-                        raise ValueError(
-                            f"Result would be too large (estimated {int(log_result)} digits)"
-                        )
-            except (ValueError, OverflowError):
-                raise ValueError("Calculation parameters would cause overflow")
-
-            # Calculate result with overflow protection
-            try:
-                result = request.base**request.exponent
-            except (OverflowError, MemoryError):
-                raise ValueError(
-                    f"Calculation {request.base}^{request.exponent} causes overflow or memory error"
-                )
-
-            # Cache the result
-            await cache.set(cache_key, result, ttl=3600)  # Cache for 1 hour
+            # Calculate and cache once for all identical in-flight requests
+            result = await single_flight.do(
+                cache_key, lambda: self._compute_and_cache(request, cache_key)
+            )
 
             # Create result object
             power_result = PowerResult(
@@ -179,3 +232,173 @@ class PowerService:
                 operation_type="power", status="error"
             ).inc()
             raise
+
+    async def _compute_many_and_cache(
+        self, pairs: List[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], int]:
+        """Calculate several powers in one executor call and cache them."""
+        cost = sum(
+            estimate_cost("power", base=base, exponent=exponent)
+            for base, exponent in pairs
+        )
+        try:
+            results = await compute_executor.run(
+                call_rendered,
+                power_many,
+                pairs,
+                cost=cost,
+                operation_type="power",
+            )
+        except (OverflowError, MemoryError):
+            raise ValueError(
+                "Batch calculation causes overflow or memory error"
+            )
+
+        values = dict(zip(pairs, results, strict=True))
+        await cache.set_many(
+            {
+                cache_key_for_operation(
+                    "power", base=base, exponent=exponent
+                ): result
+                for (base, exponent), result in values.items()
+            },
+            ttl=3600,
+        )
+        return values
+
+    async def calculate_power_batch(
+        self, requests: List[PowerRequest]
+    ) -> List[PowerResult]:
+        """Calculate several powers with bulk caching and persistence.
+
+        Cache hits are read with one MGET, the misses are computed in one
+        executor call and the operations are saved and published in bulk.
+        """
+        start_time = time.time()
+        pairs = [(request.base, request.exponent) for request in requests]
+
+        try:
+            # Validate input limits
+            if not requests:
+                raise ValueError("Batch must not be empty")
+            if len(requests) > settings.max_batch_size:
+                raise ValueError(
+                    f"Batch size must be <= {settings.max_batch_size}"
+                )
+            for request in requests:
+                self._validate(request)
+
+            # Answer small inputs from the precomputed table
+            values: Dict[Tuple[int, int], int] = {}
+            for base, exponent in dict.fromkeys(pairs):
+                precomputed = precomputed_table.power(base, exponent)
+                if precomputed is not None:
+                    values[(base, exponent)] = precomputed
+            # Table hits are not saved or published, as in the single path
+            recorded = [pair for pair in pairs if pair not in values]
+
+            # Check cache next, one lookup per remaining distinct pair
+            unique = [
+                pair for pair in dict.fromkeys(pairs) if pair not in values
+            ]
+            cached = await cache.get_many(
+                [
+                    cache_key_for_operation(
+                        "power", base=base, exponent=exponent
+                    )
+                    for base, exponent in unique
+                ]
+            )
+            values.update(
+                (pair, DecimalInt.wrap(result))
+                for pair, result in zip(unique, cached, strict=True)
+                if result is not None
+            )
+
+            # Calculate the misses together
+            misses = [pair for pair in unique if pair not in values]
+            if misses:
+                values.update(await self._compute_many_and_cache(misses))
+
+            results = [
+                PowerResult(
+                    base=base,
+                    exponent=exponent,
+                    result=values[(base, exponent)],
+                )
+                for base, exponent in pairs
+            ]
+
+            # Calculate duration
+            duration_ms = (time.time() - start_time) * 1000
+
+            # Log the batch
+            logger.info(
+                "Power batch completed",
+                count=len(pairs),
+                computed=len(misses),
+                duration_ms=duration_ms,
+            )
+
+            # Send operation events to Kafka
+            await send_operation_events(
+                [
+                    {
+                        "operation_type": "power",
+                        "parameters": {"base": base, "exponent": exponent},
+                        "result": values[(base, exponent)],
+                        "duration_ms": duration_ms,
+                    }
+                    for base, exponent in recorded
+                ]
+            )
+
+            # Save to repository
+            timestamp = datetime.now(timezone.utc)
+            await self.repository.save_operations(
+                [
+                    MathOperation(
+                        operation_type="power",
+                        parameters={"base": base, "exponent": exponent},
+                        result=values[(base, exponent)],
+                        duration_ms=duration_ms,
+                        timestamp=timestamp,
+                    )
+                    for base, exponent in recorded
+                ]
+            )
+
+            # Update metrics
+            operation_count.labels(
+                operation_type="power", status="success"
+            ).inc(len(recorded))
+            operation_duration.labels(operation_type="power").observe(
+                duration_ms / 1000
+            )
+
+            return results
+
+        except Exception as e:
+            duration_ms = (time.time() - start_time) * 1000
+
+            # Send error event to Kafka
+            await send_operation_event(
+                operation_type="power",
+                parameters={"items": [list(pair) for pair in pairs]},
+                result=None,
+                duration_ms=duration_ms,
+                success=False,
+                error=str(e),
+            )
+
+            logger.error(
+                "Power batch failed",
+                count=len(pairs),
+                error=str(e),
+                duration_ms=duration_ms,
+            )
+
+            operation_count.labels(
+                operation_type="power", status="error"
+            ).inc()
+            raise
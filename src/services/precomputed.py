@@ -0,0 +1,240 @@
+"""Immutable precomputed table of small-n results."""
+
+import mmap
+import os
+import struct
+from typing import List, Optional, Tuple
+
+from config import settings
+from domain.models import DecimalInt
+from infra.codec import decode_value, encode_value
+from infra.logging import get_logger
+from infra.metrics import precomputed_lookups
+
+logger = get_logger(__name__)
+
+# File layout: header | (count + 1) u64 offsets into the data | data, where
+# each value is one codec-encoded int. Lookups slice the mapped file, so
+# only the pages a request touches are ever read.
+_MAGIC = b"MSPT"
+_VERSION = 1
+_HEADER = struct.Struct(">4sBIIII")
+_OFFSET = struct.Struct(">Q")
+
+# (fibonacci_limit, factorial_limit, power_max_base, power_max_exponent)
+TableLimits = Tuple[int, int, int, int]
+
+
+def table_limits() -> TableLimits:
+    """Return the configured table ranges, clamped to the service limits."""
+    return (
+        min(
+            settings.precomputed_fibonacci_limit, settings.max_fibonacci_n + 1
+        ),
+        min(
+            settings.precomputed_factorial_limit, settings.max_factorial_n + 1
+        ),
+        min(settings.precomputed_power_max_base, settings.max_power_base),
+        min(settings.precomputed_power_max_exponent, 50),
+    )
+
+
+def build_values(limits: TableLimits) -> List[int]:
+    """Compute every table value in index order.
+
+    Fibonacci and factorial entries come from one running pair and one
+    running product; powers are row-major by base.
+    """
+    fibonacci_limit, factorial_limit, max_base, max_exponent = limits
+    values: List[int] = []
+
+    a, b = 0, 1
+    for _ in range(fibonacci_limit):
+        values.append(a)
+        a, b = b, a + b
+
+    result = 1
+    for n in range(factorial_limit):
+        if n > 1:
+            result *= n
+        values.append(result)
+
+    for base in range(max_base + 1):
+        result = 1
+        for _ in range(max_exponent + 1):
+            values.append(result)
+            result *= base
+
+    return values
+
+
+def _count(limits: TableLimits) -> int:
+    """Number of values in a table with the given limits."""
+    fibonacci_limit, factorial_limit, max_base, max_exponent = limits
+    return (
+        fibonacci_limit + factorial_limit + (max_base + 1) * (max_exponent + 1)
+    )
+
+
+def write_table(path: str, limits: TableLimits, values: List[int]) -> None:
+    """Write a table file atomically."""
+    encoded = [encode_value(value) for value in values]
+    offsets = [0]
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as table_file:
+        table_file.write(_HEADER.pack(_MAGIC, _VERSION, *limits))
+        table_file.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+        table_file.write(b"".join(encoded))
+    os.replace(tmp_path, path)
+    logger.info("Precomputed table written", path=path, values=len(values))
+
+
+class PrecomputedTable:
+    """Read-only results for small Fibonacci, factorial and power inputs.
+
+    Empty until load() runs, so lookups simply miss when the startup stage
+    is disabled. The table is either built in memory or memory-mapped
+    from precomputed_path, which is written on first use.
+    """
+
+    def __init__(self) -> None:
+        self._limits: TableLimits = (0, 0, -1, -1)
+        self._values: Optional[List[int]] = None
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._data_start = 0
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the table can answer lookups."""
+        return self._values is not None or self._mmap is not None
+
+    @property
+    def limits(self) -> TableLimits:
+        """Covered ranges: (fibonacci, factorial, power base, exponent)."""
+        return self._limits
+
+    def load(self, path: Optional[str] = None) -> None:
+        """Build the table, or map it from path (writing it if needed)."""
+        self.close()
+        limits = table_limits()
+
+        if not path:
+            # Held as DecimalInt so each value is rendered at most once
+            self._values = [
+                DecimalInt(value) for value in build_values(limits)
+            ]
+            self._limits = limits
+            return
+
+        if not self._map(path, limits):
+            write_table(path, limits, build_values(limits))
+            if not self._map(path, limits):
+                raise ValueError(f"Unreadable precomputed table: {path}")
+
+    def close(self) -> None:
+        """Drop the table and unmap its file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._values = None
+        self._limits = (0, 0, -1, -1)
+
+    def _map(self, path: str, limits: TableLimits) -> bool:
+        """Map a table file; return False if it is missing or stale."""
+        if not os.path.exists(path):
+            return False
+
+        table_file = open(path, "rb")
+        try:
+            mapped = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            table_file.close()
+            return False
+
+        try:
+            magic, version, *file_limits = _HEADER.unpack_from(mapped)
+        except struct.error:  # Truncated header
+            magic, version, file_limits = b"", 0, []
+        if (
+            magic != _MAGIC
+            or version != _VERSION
+            or tuple(file_limits) != limits
+        ):
+            mapped.close()
+            table_file.close()
+            logger.info("Precomputed table is stale", path=path)
+            return False
+
+        self._file = table_file
+        self._mmap = mapped
+        self._limits = limits
+        self._data_start = _HEADER.size + (_count(limits) + 1) * _OFFSET.size
+        return True
+
+    def _value(self, index: int) -> int:
+        """Return the value at a table index."""
+        if self._values is not None:
+            return self._values[index]
+
+        offset = _HEADER.size + index * _OFFSET.size
+        start, end = struct.unpack_from(">QQ", self._mmap, offset)
+        view = memoryview(self._mmap)
+        try:
+            return DecimalInt(
+                decode_value(
+                    view[self._data_start + start : self._data_start + end]
+                )
+            )
+        finally:
+            view.release()
+
+    def _lookup(
+        self, operation_type: str, index: Optional[int]
+    ) -> Optional[int]:
+        """Return a value and count the hit or miss."""
+        if index is None or not self.loaded:
+            precomputed_lookups.labels(
+                operation_type=operation_type, result="miss"
+            ).inc()
+            return None
+
+        precomputed_lookups.labels(
+            operation_type=operation_type, result="hit"
+        ).inc()
+        return self._value(index)
+
+    def fibonacci(self, n: int) -> Optional[int]:
+        """Return F(n) if n is covered by the table."""
+        fibonacci_limit = self._limits[0]
+        index = n if 0 <= n < fibonacci_limit else None
+        return self._lookup("fibonacci", index)
+
+    def factorial(self, n: int) -> Optional[int]:
+        """Return n! if n is covered by the table."""
+        fibonacci_limit, factorial_limit = self._limits[:2]
+        index = fibonacci_limit + n if 0 <= n < factorial_limit else None
+        return self._lookup("factorial", index)
+
+    def power(self, base: int, exponent: int) -> Optional[int]:
+        """Return base^exponent if the pair is covered by the table."""
+        fibonacci_limit, factorial_limit, max_base, max_exponent = self._limits
+        index = None
+        if 0 <= base <= max_base and 0 <= exponent <= max_exponent:
+            index = (
+                fibonacci_limit
+                + factorial_limit
+                + base * (max_exponent + 1)
+                + exponent
+            )
+        return self._lookup("power", index)
+
+
+# Global precomputed table
+precomputed_table = PrecomputedTable()
@@ -14,3 +14,22 @@ def event_loop() -> Generator:
     loop = asyncio.get_event_loop_policy().new_event_loop()
     yield loop
     loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache() -> Generator:
+    """Keep the in-process L1 cache from leaking results between tests."""
+    from infra.cache import cache
+
+    yield
+    if cache._local is not None:
+        cache._local.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache() -> Generator:
+    """Keep cached principals from outliving a test's user database."""
+    from infra.auth import principal_cache
+
+    yield
+    principal_cache.clear()
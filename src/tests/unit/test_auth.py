@@ -0,0 +1,178 @@
+"""Tests for authentication helpers."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.api import deps
+from src.domain.models import User, UserRole
+from src.infra import auth
+from src.infra.auth import (
+    PrincipalCache,
+    create_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
+
+
+def make_user(user_id: int = 1, username: str = "alice") -> User:
+    """Build a domain user for tests."""
+    return User(
+        id=user_id,
+        username=username,
+        email=f"{username}@example.com",
+        hashed_password="hashed",
+        full_name=None,
+        role=UserRole.USER,
+        is_active=True,
+        created_at=datetime.now(),
+    )
+
+
+class TestPrincipalCache:
+    """Test the verified-principal cache."""
+
+    def test_get_returns_cached_user(self):
+        """Test a cached token resolves to its user."""
+        principal_cache = PrincipalCache(max_entries=10, ttl=60)
+        user = make_user()
+
+        principal_cache.set("token", user)
+
+        assert principal_cache.get("token") is user
+        assert principal_cache.get("other") is None
+
+    def test_entry_never_outlives_token_exp(self):
+        """Test the entry expires with the token, not the cache TTL."""
+        principal_cache = PrincipalCache(max_entries=10, ttl=3600)
+
+        principal_cache.set("token", make_user(), token_exp=time.time() - 1)
+
+        assert principal_cache.get("token") is None
+        assert len(principal_cache) == 0
+
+    def test_entry_expires_after_ttl(self):
+        """Test the cache TTL caps long-lived tokens."""
+        principal_cache = PrincipalCache(max_entries=10, ttl=60)
+        principal_cache.set(
+            "token", make_user(), token_exp=time.time() + 86400
+        )
+
+        with patch("src.infra.auth.time.time", return_value=time.time() + 61):
+            assert principal_cache.get("token") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest token is evicted when full."""
+        principal_cache = PrincipalCache(max_entries=2, ttl=60)
+        principal_cache.set("a", make_user(1, "a"))
+        principal_cache.set("b", make_user(2, "b"))
+        principal_cache.get("a")
+
+        principal_cache.set("c", make_user(3, "c"))
+
+        assert principal_cache.get("b") is None
+        assert principal_cache.get("a") is not None
+        assert principal_cache.get("c") is not None
+
+    def test_invalidate_user_drops_all_tokens(self):
+        """Test invalidation removes every token of the user."""
+        principal_cache = PrincipalCache(max_entries=10, ttl=60)
+        principal_cache.set("t1", make_user(1, "alice"))
+        principal_cache.set("t2", make_user(1, "alice"))
+        principal_cache.set("t3", make_user(2, "bob"))
+
+        assert principal_cache.invalidate_user(user_id=1) == 2
+        assert principal_cache.get("t1") is None
+        assert principal_cache.get("t3") is not None
+        assert principal_cache.invalidate_user(username="bob") == 1
+
+
+class TestGetCurrentUser:
+    """Test the current-user dependency."""
+
+    @pytest.mark.asyncio
+    async def test_second_request_skips_decode_and_lookup(self):
+        """Test a repeated token is served from the principal cache."""
+        user = make_user()
+        token = create_access_token(
+            {"sub": user.username}, expires_delta=timedelta(minutes=5)
+        )
+        credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer", credentials=token
+        )
+        repository = MagicMock()
+        repository.get_user_by_username = AsyncMock(return_value=user)
+
+        with patch.object(
+            deps, "verify_token", wraps=deps.verify_token
+        ) as verify:
+            first = await deps.get_current_user(credentials, repository)
+            second = await deps.get_current_user(credentials, repository)
+
+        assert first is user
+        assert second is user
+        assert verify.call_count == 1
+        repository.get_user_by_username.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_not_cached(self):
+        """Test a bad token is rejected every time."""
+        credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer", credentials="not-a-jwt"
+        )
+        repository = MagicMock()
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await deps.get_current_user(credentials, repository)
+            assert exc_info.value.status_code == 401
+
+        assert len(deps.principal_cache) == 0
+
+
+class TestPasswordHashing:
+    """Test bcrypt offloading."""
+
+    @pytest.mark.asyncio
+    async def test_async_helpers_delegate_to_context(self):
+        """Test the async helpers return the password context results."""
+        with patch.object(auth, "pwd_context") as context:
+            context.hash.return_value = "hashed"
+            context.verify.return_value = True
+
+            assert await get_password_hash_async("s3cret") == "hashed"
+            assert await verify_password_async("s3cret", "hashed") is True
+
+        context.hash.assert_called_once_with("s3cret")
+        context.verify.assert_called_once_with("s3cret", "hashed")
+
+    @pytest.mark.asyncio
+    async def test_hashing_runs_on_dedicated_pool(self):
+        """Test bcrypt work leaves the event loop thread."""
+        threads = []
+
+        def record(password):
+            threads.append(threading.current_thread().name)
+            return "hashed"
+
+        with patch.object(auth, "get_password_hash", side_effect=record):
+            assert await auth.get_password_hash_async("pw") == "hashed"
+
+        assert threads[0].startswith("password-hash")
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_is_recorded(self):
+        """Test each call observes its queue wait."""
+        with (
+            patch.object(auth, "verify_password", return_value=True),
+            patch.object(auth, "password_hash_queue_wait") as histogram,
+        ):
+            await auth.verify_password_async("pw", "hash")
+
+        histogram.labels.assert_called_once_with(operation="verify")
+        histogram.labels.return_value.observe.assert_called_once()
@@ -1,9 +1,29 @@
 """Tests for Redis cache functionality."""
 
+import asyncio
+import importlib
+import pickle
+import time
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from src.infra.cache import RedisCache, cache_key_for_operation
+from src.infra import codec, metrics
+from src.infra.codec import (
+    CodecError,
+    FLAG_ZLIB,
+    decode_value,
+    encode_value,
+)
+from src.infra.cache import (
+    LocalCache,
+    RedisCache,
+    cache_key_for_operation,
+    estimate_size,
+)
+
+# The package re-exports the global cache under the module's name
+cache_module = importlib.import_module("src.infra.cache")
 
 
 class TestRedisCache:
@@ -65,7 +85,9 @@ class TestRedisCache:
 
         # Test set operation
         await self.cache.set("test_key", "new_value", ttl=3600)
-        mock_redis.setex.assert_called_once_with("test_key", 3600, "new_value")
+        mock_redis.setex.assert_called_once_with(
+            "test_key", 3600, encode_value("new_value")
+        )
 
         # Test exists operation
         exists = await self.cache.exists("test_key")
@@ -110,9 +132,310 @@ class TestRedisCache:
 
         # Test set with complex data
         await self.cache.set("test_key", test_data)
-        expected_json = (
-            b'{"result": 42, "metadata": {"type": "power", "base": 2}}'
-        )
         mock_redis.setex.assert_called_once_with(
-            "test_key", 3600, expected_json
+            "test_key", 3600, encode_value(test_data)
         )
+        assert decode_value(encode_value(test_data)) == test_data
+
+
+class TestLocalCache:
+    """Test the in-process L1 cache."""
+
+    def test_get_set_delete(self):
+        """Test basic L1 operations."""
+        local = LocalCache()
+
+        assert local.get("key") is None
+        assert local.set("key", 10**100) is True
+        assert local.get("key") == 10**100
+        assert local.delete("key") is True
+        assert local.get("key") is None
+        assert local.size_bytes == 0
+
+    def test_lru_eviction_by_entries(self):
+        """Test the least recently used entry is evicted first."""
+        local = LocalCache(max_entries=2)
+
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("b") is None
+        assert local.get("a") == 1
+        assert local.get("c") == 3
+
+    def test_eviction_by_bytes(self):
+        """Test big ints are evicted once the byte budget is exceeded."""
+        big = 1 << 8000  # ~1 KB
+        local = LocalCache(max_bytes=3 * estimate_size(big))
+
+        for i in range(5):
+            local.set(f"k{i}", big + i)
+
+        assert len(local) == 3
+        assert local.size_bytes <= 3 * estimate_size(big)
+        assert local.get("k0") is None
+
+    def test_oversized_values_not_admitted(self):
+        """Test values above the per-item limit skip L1."""
+        local = LocalCache(max_item_bytes=100)
+
+        assert local.set("big", 1 << 10000) is False
+        assert local.get("big") is None
+
+    def test_ttl_expiry(self):
+        """Test expired entries are treated as misses."""
+        local = LocalCache(ttl=10)
+
+        with patch("src.infra.cache.time.monotonic", return_value=1000.0):
+            local.set("key", "value", ttl=3600)
+        with patch("src.infra.cache.time.monotonic", return_value=1009.0):
+            assert local.get("key") == "value"
+        with patch("src.infra.cache.time.monotonic", return_value=1011.0):
+            assert local.get("key") is None
+        assert len(local) == 0
+
+
+class TestTwoTierCache:
+    """Test the L1 tier in front of Redis."""
+
+    @pytest.mark.asyncio
+    async def test_l1_serves_without_redis(self):
+        """Test values stay cached in process when Redis is down."""
+        cache = RedisCache()
+
+        await cache.set("math:fibonacci:n=10", 55)
+
+        assert await cache.get("math:fibonacci:n=10") == 55
+        assert await cache.exists("math:fibonacci:n=10") is True
+
+    @pytest.mark.asyncio
+    async def test_l2_hit_promoted_to_l1(self):
+        """Test a Redis hit is served from L1 afterwards."""
+        cache = RedisCache()
+        mock_redis = MagicMock()
+        mock_redis.get = AsyncMock(return_value=b'"value"')
+        cache._redis = mock_redis
+
+        assert await cache.get("key") == "value"
+        assert await cache.get("key") == "value"
+
+        mock_redis.get.assert_called_once_with("key")
+
+
+class TestBulkCacheOperations:
+    """Test multi-key cache reads and writes."""
+
+    @pytest.mark.asyncio
+    async def test_get_many_reads_l1_misses_with_one_mget(self):
+        """Test keys missing from L1 are fetched in one MGET."""
+        cache = RedisCache()
+        await cache.set("a", 1)
+        mock_redis = MagicMock()
+        mock_redis.mget = AsyncMock(return_value=[encode_value(2), None])
+        cache._redis = mock_redis
+
+        assert await cache.get_many(["a", "b", "c"]) == [1, 2, None]
+
+        mock_redis.mget.assert_awaited_once_with(["b", "c"])
+        assert await cache.get_many(["b"]) == [2]
+        mock_redis.mget.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_many_without_redis(self):
+        """Test only L1 is consulted when Redis is down."""
+        cache = RedisCache()
+        await cache.set("a", "x")
+
+        assert await cache.get_many(["a", "b"]) == ["x", None]
+
+    @pytest.mark.asyncio
+    async def test_set_many_uses_pipeline(self):
+        """Test bulk writes go through one pipeline."""
+        cache = RedisCache()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, True])
+        pipeline = MagicMock()
+        pipeline.__aenter__ = AsyncMock(return_value=pipe)
+        pipeline.__aexit__ = AsyncMock(return_value=False)
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value = pipeline
+        cache._redis = mock_redis
+
+        assert await cache.set_many({"a": 1, "b": 2}, ttl=60) is True
+
+        pipe.setex.assert_any_call("a", 60, encode_value(1))
+        pipe.setex.assert_any_call("b", 60, encode_value(2))
+        pipe.execute.assert_awaited_once()
+        assert await cache.get_many(["a", "b"]) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_set_many_per_key_ttl(self):
+        """Test per-key TTLs override the batch TTL."""
+        cache = RedisCache()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, True])
+        pipeline = MagicMock()
+        pipeline.__aenter__ = AsyncMock(return_value=pipe)
+        pipeline.__aexit__ = AsyncMock(return_value=False)
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value = pipeline
+        cache._redis = mock_redis
+
+        await cache.set_many({"a": 1, "b": 2}, ttl=60, ttls={"b": 5})
+
+        pipe.setex.assert_any_call("a", 60, encode_value(1))
+        pipe.setex.assert_any_call("b", 5, encode_value(2))
+
+    @pytest.mark.asyncio
+    async def test_command_latency_recorded(self):
+        """Test each Redis command is timed under its own label."""
+        cache = RedisCache()
+        mock_redis = MagicMock()
+        mock_redis.mget = AsyncMock(return_value=[None])
+        cache._redis = mock_redis
+
+        def observed():
+            return (
+                metrics.registry.get_sample_value(
+                    "redis_command_duration_seconds_count", {"command": "mget"}
+                )
+                or 0
+            )
+
+        before = observed()
+        await cache.get_many(["missing"])
+
+        assert observed() == before + 1
+
+
+class TestRedisResilience:
+    """Test the latency budget, circuit breaker and reconnect."""
+
+    @pytest.mark.asyncio
+    async def test_slow_redis_falls_back_within_budget(self):
+        """Test a call over budget is abandoned and counted as a failure."""
+        cache = RedisCache()
+        mock_redis = MagicMock()
+
+        async def slow_get(key):
+            await asyncio.sleep(1)
+
+        mock_redis.get = slow_get
+        cache._redis = mock_redis
+
+        with patch.object(
+            cache_module.settings, "redis_command_budget_ms", 10
+        ):
+            start = time.perf_counter()
+            assert await cache.get("key") is None
+
+        assert time.perf_counter() - start < 0.5
+        assert cache._breaker._failures == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_redis(self):
+        """Test Redis is not called at all while the circuit is open."""
+        cache = RedisCache()
+        mock_redis = MagicMock()
+        mock_redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        cache._redis = mock_redis
+
+        for _ in range(cache._breaker.failure_threshold + 3):
+            assert await cache.get("key") is None
+
+        assert mock_redis.get.await_count == cache._breaker.failure_threshold
+        assert await cache.acquire_lock("key", 100) == ""
+
+    @pytest.mark.asyncio
+    async def test_reconnects_in_background(self):
+        """Test a failed startup connection is retried until it succeeds."""
+        cache = RedisCache()
+        client = MagicMock()
+        client.ping = AsyncMock()
+        client.aclose = AsyncMock()
+        attempts = [ConnectionError("down"), ConnectionError("down"), client]
+
+        def create_client():
+            attempt = attempts.pop(0)
+            if isinstance(attempt, Exception):
+                failed = MagicMock()
+                failed.ping = AsyncMock(side_effect=attempt)
+                failed.aclose = AsyncMock()
+                return failed
+            return attempt
+
+        with (
+            patch.object(cache_module.settings, "redis_enabled", True),
+            patch.object(
+                cache_module.settings, "redis_reconnect_interval", 0.001
+            ),
+            patch.object(cache, "_create_client", side_effect=create_client),
+        ):
+            await cache.connect()
+            assert not cache.connected
+            await asyncio.wait_for(cache._reconnect_task, 1)
+
+        assert cache._redis is client
+        await cache.disconnect()
+
+
+class TestCacheCodec:
+    """Test the binary cache value codec."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [0, 1, -1, 255, -(10**1000), 10**20000, "text", b"\x00raw", [1, 2]],
+        ids=lambda value: type(value).__name__,
+    )
+    def test_roundtrip(self, value):
+        """Test values survive an encode/decode roundtrip."""
+        assert decode_value(encode_value(value)) == value
+
+    def test_int_is_raw_bytes(self):
+        """Test ints are stored as magnitude bytes, not decimal text."""
+        value = 10**1000
+        encoded = encode_value(value, compression="none")
+
+        assert len(encoded) < len(str(value)) // 2
+        assert str(value).encode() not in encoded
+
+    def test_large_payload_compressed(self):
+        """Test large compressible payloads are zlib-compressed."""
+        value = "x" * 10000
+        encoded = encode_value(value, compression="zlib", min_compress_bytes=1)
+
+        assert encoded[2] & FLAG_ZLIB
+        assert len(encoded) < 200
+        assert decode_value(encoded) == value
+
+    def test_rendered_decimal_roundtrip(self):
+        """Test rendered decimal text is stored next to the int."""
+        value = codec.DecimalInt(7**5000)
+        plain = encode_value(value)
+        str(value)
+
+        decoded = decode_value(encode_value(value))
+
+        assert decoded == value
+        assert isinstance(decoded, codec.DecimalInt)
+        assert decoded.rendered == str(7**5000)
+        assert plain == encode_value(7**5000)
+
+    def test_rejects_unknown_data(self):
+        """Test data without the header or with a bad version is rejected."""
+        with pytest.raises(CodecError):
+            decode_value(b'"legacy json"')
+        with pytest.raises(CodecError):
+            decode_value(bytes((0xFE, 99, 1)))
+
+    @pytest.mark.asyncio
+    async def test_legacy_pickle_is_a_miss(self):
+        """Test old pickled values are never unpickled."""
+        cache = RedisCache()
+        mock_redis = MagicMock()
+        mock_redis.get = AsyncMock(return_value=pickle.dumps(42))
+        cache._redis = mock_redis
+
+        assert await cache.get("key") is None
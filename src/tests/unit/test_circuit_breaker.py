@@ -0,0 +1,66 @@
+"""Unit tests for the circuit breaker."""
+
+from unittest.mock import patch
+
+from src.infra import circuit_breaker
+from src.infra.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """Tests for circuit breaker state transitions."""
+
+    def setup_method(self):
+        """Create a breaker that opens after two failures."""
+        self.now = 100.0
+        self.clock = patch.object(
+            circuit_breaker.time, "monotonic", side_effect=lambda: self.now
+        )
+        self.clock.start()
+        self.breaker = CircuitBreaker(
+            "test", failure_threshold=2, reset_timeout=5.0
+        )
+
+    def teardown_method(self):
+        self.clock.stop()
+
+    def test_opens_after_consecutive_failures(self):
+        """Test the circuit opens at the threshold and rejects calls."""
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        assert self.breaker.allow()
+
+        self.breaker.record_failure()
+
+        assert self.breaker.state == circuit_breaker.OPEN
+        assert not self.breaker.allow()
+
+    def test_half_open_probe_closes_on_success(self):
+        """Test one probe is let through after the reset timeout."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now += 5.0
+
+        assert self.breaker.allow()
+        assert self.breaker.state == circuit_breaker.HALF_OPEN
+        assert not self.breaker.allow()
+
+        self.breaker.record_success()
+
+        assert self.breaker.state == circuit_breaker.CLOSED
+        assert self.breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        """Test a failed probe opens the circuit for another timeout."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now += 5.0
+        self.breaker.allow()
+
+        self.breaker.record_failure()
+
+        assert self.breaker.state == circuit_breaker.OPEN
+        self.now += 4.0
+        assert not self.breaker.allow()
+        self.now += 1.0
+        assert self.breaker.allow()
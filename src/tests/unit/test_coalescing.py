@@ -0,0 +1,130 @@
+"""Tests for request coalescing."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.infra import coalescing
+from src.infra.cache import RedisCache
+from src.infra.coalescing import SingleFlight
+
+
+class TestSingleFlight:
+    """Test single-flight deduplication."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_computation(self):
+        """Test identical concurrent calls run the function once."""
+        flight = SingleFlight(RedisCache())
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(
+            *(flight.do("math:factorial:n=5000", compute) for _ in range(10))
+        )
+
+        assert results == [42] * 10
+        assert calls == 1
+        assert flight.in_flight("math:factorial:n=5000") is False
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_waiters(self):
+        """Test a failure is raised to every waiting caller."""
+        flight = SingleFlight(RedisCache())
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flight.do("key", compute) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_waiters(self):
+        """Test waiters still get the result when the leader is cancelled."""
+        flight = SingleFlight(RedisCache())
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return 42
+
+        leader = asyncio.create_task(flight.do("key", compute))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(flight.do("key", compute)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await asyncio.gather(*waiters) == [42] * 3
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert calls == 1
+        assert flight.in_flight("key") is False
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_recompute(self):
+        """Test only in-flight calls are shared."""
+        flight = SingleFlight(RedisCache())
+        compute = AsyncMock(side_effect=[1, 2])
+
+        assert await flight.do("key", compute) == 1
+        assert await flight.do("key", compute) == 2
+
+
+class TestDistributedSingleFlight:
+    """Test the cross-worker Redis lock variant."""
+
+    @pytest.fixture(autouse=True)
+    def enable_lock(self):
+        """Enable distributed locking for these tests."""
+        with patch.object(
+            coalescing.settings, "distributed_lock_enabled", True
+        ), patch.object(coalescing.settings, "distributed_lock_poll_ms", 1):
+            yield
+
+    def make_cache(self):
+        """Create a cache that looks connected."""
+        cache = RedisCache()
+        cache._redis = MagicMock()
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_lock_holder_computes_and_releases(self):
+        """Test the lock winner computes and releases the lock."""
+        cache = self.make_cache()
+        cache.acquire_lock = AsyncMock(return_value="token")
+        cache.release_lock = AsyncMock(return_value=True)
+        flight = SingleFlight(cache)
+
+        result = await flight.do("key", AsyncMock(return_value=7))
+
+        assert result == 7
+        cache.release_lock.assert_called_once_with("key", "token")
+
+    @pytest.mark.asyncio
+    async def test_waits_for_other_worker(self):
+        """Test a worker without the lock reads the holder's result."""
+        cache = self.make_cache()
+        cache.acquire_lock = AsyncMock(return_value=None)
+        cache.get = AsyncMock(side_effect=[None, 99])
+        compute = AsyncMock(return_value=1)
+        flight = SingleFlight(cache)
+
+        result = await flight.do("key", compute)
+
+        assert result == 99
+        compute.assert_not_called()
@@ -1,9 +1,12 @@
 """Unit tests for domain models."""
 
+import pickle
+
 import pytest
 from datetime import datetime
 
 from src.domain.models import (
+    DecimalInt,
     FactorialRequest,
     FactorialResult,
     FibonacciResult,
@@ -97,3 +100,56 @@ class TestMathOperation:
         assert result["result"] == "8"
         assert result["duration_ms"] == 10.5
         assert result["timestamp"] == timestamp.isoformat()
+
+
+class TestDecimalInt:
+    """Tests for the lazily rendered integer result."""
+
+    def test_text_rendered_once(self):
+        """Test the decimal text is produced on first use and reused."""
+        value = DecimalInt(2**200)
+
+        assert value.rendered is None
+        assert str(value) == str(2**200)
+        assert value.rendered is str(value)
+        assert f"{value}" is value.rendered
+
+    def test_behaves_as_int(self):
+        """Test equality, hashing and arithmetic match plain ints."""
+        value = DecimalInt(55)
+
+        assert value == 55
+        assert hash(value) == hash(55)
+        assert type(value + 1) is int
+
+    def test_wrap_keeps_existing_instance(self):
+        """Test wrapping does not discard rendered text."""
+        value = DecimalInt(10**50)
+        str(value)
+
+        assert DecimalInt.wrap(value) is value
+        assert DecimalInt(value).rendered == value.rendered
+        assert isinstance(DecimalInt.wrap(7), DecimalInt)
+
+    def test_pickle_keeps_text(self):
+        """Test text rendered in a pool worker survives the trip back."""
+        value = DecimalInt(3**300)
+        str(value)
+
+        restored = pickle.loads(pickle.dumps(value))
+
+        assert restored == value
+        assert restored.rendered == value.rendered
+
+    def test_math_operation_uses_cached_text(self):
+        """Test persistence reuses the rendered text."""
+        value = DecimalInt(12345, "12345")
+        operation = MathOperation(
+            operation_type="fibonacci",
+            parameters={"n": 1},
+            result=value,
+            duration_ms=1.0,
+            timestamp=datetime.now(),
+        )
+
+        assert operation.to_dict()["result"] is value.rendered
@@ -0,0 +1,123 @@
+"""Unit tests for Kafka event encodings."""
+
+import hashlib
+import json
+
+import pytest
+
+from src.infra.events import (
+    EventDecodeError,
+    decode_event,
+    encode_event,
+    json_event,
+)
+
+TIMESTAMP_NS = 1_700_000_000_123_456_000
+
+
+def operation_event(**overrides):
+    event = {
+        "event_type": "math_operation",
+        "operation_type": "factorial",
+        "parameters": {"n": 500},
+        "result": 3**2000,
+        "duration_ms": 1.5,
+        "success": True,
+        "error": None,
+        "timestamp_ns": TIMESTAMP_NS,
+    }
+    event.update(overrides)
+    return event
+
+
+def api_event(**overrides):
+    event = {
+        "event_type": "api_request",
+        "method": "GET",
+        "endpoint": "/api/v1/fibonacci/{n}",
+        "status_code": 200,
+        "duration_ms": 2.25,
+        "user_agent": "curl/8.0",
+        "timestamp_ns": TIMESTAMP_NS,
+    }
+    event.update(overrides)
+    return event
+
+
+class TestJsonEncoding:
+    """Tests for the JSON event encoding."""
+
+    def test_json_event_keeps_document_format(self):
+        """Test the JSON form has a decimal result and an ISO timestamp."""
+        document = json_event(operation_event(result=8))
+
+        assert document["result"] == "8"
+        assert document["timestamp"] == "2023-11-14T22:13:20.123456+00:00"
+        assert "timestamp_ns" not in document
+
+    def test_decode_json_adds_timestamp_ns(self):
+        """Test decoded JSON events carry an epoch-ns timestamp."""
+        event = decode_event(encode_event(api_event(), "json"))
+
+        assert event["endpoint"] == "/api/v1/fibonacci/{n}"
+        assert event["timestamp_ns"] == TIMESTAMP_NS
+
+
+class TestBinaryEncoding:
+    """Tests for the binary event encoding."""
+
+    def test_digest_round_trip(self):
+        """Test a digested result decodes to its digit count and hash."""
+        event = operation_event()
+        encoded = encode_event(event, "binary")
+        decoded = decode_event(encoded)
+
+        text = str(event["result"])
+        assert decoded["result"] == {
+            "digits": len(text),
+            "sha256": hashlib.sha256(text.encode()).hexdigest()[:16],
+        }
+        assert decoded["timestamp_ns"] == TIMESTAMP_NS
+        assert decoded["parameters"] == {"n": 500}
+        assert decoded["operation_type"] == "factorial"
+        assert len(encoded) < 64 < len(encode_event(event, "json"))
+
+    def test_raw_round_trip(self):
+        """Test a raw result decodes to the exact integer."""
+        event = operation_event(result=-(7**500))
+        decoded = decode_event(encode_event(event, "binary", "raw"))
+
+        assert decoded["result"] == -(7**500)
+
+    def test_failed_operation_round_trip(self):
+        """Test errors, odd parameters and unknown operations survive."""
+        event = operation_event(
+            operation_type="gcd",
+            parameters={"a": 2**70, "b": "x"},
+            result=None,
+            success=False,
+            error="Invalid input",
+        )
+        decoded = decode_event(encode_event(event, "binary"))
+
+        expected = dict(event)
+        expected["parameters"] = json.loads(json.dumps(event["parameters"]))
+        assert decoded == expected
+
+    def test_api_event_round_trip(self):
+        """Test API request events round-trip, with or without user agent."""
+        for event in (api_event(), api_event(user_agent=None)):
+            assert decode_event(encode_event(event, "binary")) == event
+
+    def test_invalid_events_rejected(self):
+        """Test truncated or unknown data raises EventDecodeError."""
+        encoded = encode_event(operation_event(), "binary")
+
+        with pytest.raises(EventDecodeError):
+            decode_event(encoded[:-3])
+        with pytest.raises(EventDecodeError):
+            decode_event(encoded[:1] + b"\x09" + encoded[2:])
+        with pytest.raises(EventDecodeError):
+            decode_event(b"")
+        with pytest.raises(EventDecodeError):
+            decode_event(b"not json")
@@ -0,0 +1,143 @@
+"""Tests for the compute executor layer."""
+
+import asyncio
+import math
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pytest
+
+from src.config import settings
+from src.infra import executor as executor_module
+from src.infra.executor import (
+    ComputeExecutor,
+    call_rendered,
+    estimate_cost,
+    estimate_digits,
+)
+
+
+class BrokenPool(Executor):
+    """Executor whose tasks all fail as if its workers had died."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        pass
+
+
+class TestCostEstimates:
+    """Test result size and cost estimates."""
+
+    def test_estimate_digits(self):
+        """Test digit estimates are close to the real digit counts."""
+        assert round(estimate_digits("power", base=2, exponent=100)) == len(
+            str(2**100)
+        )
+        assert int(estimate_digits("fibonacci", n=1000)) == 209
+        assert int(estimate_digits("factorial", n=1000)) == len(
+            str(math.factorial(1000))
+        )
+
+    def test_estimate_cost_grows_with_n(self):
+        """Test cost grows with the input size."""
+        assert estimate_cost("factorial", n=5000) > estimate_cost(
+            "factorial", n=100
+        )
+        assert estimate_cost("power", base=1, exponent=50) < 10
+
+    def test_unknown_operation(self):
+        """Test unknown operations are rejected."""
+        with pytest.raises(ValueError):
+            estimate_digits("sqrt", n=4)
+
+
+class TestComputeExecutor:
+    """Test inline and pooled execution."""
+
+    @pytest.mark.asyncio
+    async def test_runs_inline_without_pool(self):
+        """Test work runs inline when the pool is not started."""
+        executor = ComputeExecutor()
+
+        assert executor.should_offload(10**12) is False
+        assert await executor.run(pow, 2, 10, cost=10**12) == 1024
+
+    @pytest.mark.asyncio
+    async def test_offloads_above_threshold(self):
+        """Test expensive work runs in the process pool."""
+        executor = ComputeExecutor()
+        await executor.start()
+        try:
+            threshold = settings.compute_offload_threshold
+            assert executor.should_offload(threshold - 1) is False
+            assert executor.should_offload(threshold) is True
+
+            result = await executor.run(pow, 3, 2000, cost=threshold)
+            assert result == 3**2000
+        finally:
+            await executor.stop()
+
+        assert executor.running is False
+
+    @pytest.mark.asyncio
+    async def test_pool_renders_results_over_default_digit_limit(self):
+        """Test spawned workers can render results above 4300 digits."""
+        executor = ComputeExecutor()
+        with (
+            patch.object(
+                executor_module.settings, "compute_pool_start_method", "spawn"
+            ),
+            patch.object(executor_module.settings, "compute_pool_workers", 1),
+        ):
+            await executor.start()
+        try:
+            result = await executor.run(
+                call_rendered,
+                math.factorial,
+                2000,
+                cost=settings.compute_offload_threshold,
+            )
+        finally:
+            await executor.stop()
+
+        assert result.rendered is not None
+        assert len(result.rendered) == 5736
+        assert result == math.factorial(2000)
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_restarted_once(self):
+        """Test concurrent failures on one broken pool restart it once."""
+        executor = ComputeExecutor()
+        executor._pool = BrokenPool()
+        starts = []
+
+        async def start():
+            starts.append(1)
+            await asyncio.sleep(0)
+            executor._pool = BrokenPool()
+
+        with patch.object(executor, "start", start):
+            results = await asyncio.gather(
+                *(executor.run(pow, 2, n, cost=10**12) for n in range(5))
+            )
+
+        assert results == [1, 2, 4, 8, 16]
+        assert len(starts) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_restart_runs_inline(self):
+        """Test a pool that cannot be restarted still serves the request."""
+        executor = ComputeExecutor()
+        executor._pool = BrokenPool()
+
+        async def start():
+            raise RuntimeError("worker initializer failed")
+
+        with patch.object(executor, "start", start):
+            assert await executor.run(pow, 2, 10, cost=10**12) == 1024
+        assert executor.running is False
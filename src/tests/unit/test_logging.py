@@ -0,0 +1,129 @@
+"""Unit tests for structured logging processors."""
+
+import hashlib
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+import pytest
+import structlog
+
+from src.infra import logging as infra_logging
+
+
+class TestSummarizeBigInts:
+    """Tests for the big-int summarizing log processor."""
+
+    def _process(self, **event):
+        return infra_logging.summarize_big_ints(None, "info", dict(event))
+
+    def test_small_values_unchanged(self):
+        """Test short ints and other values are logged as they are."""
+        event = self._process(n=10, result=55, ok=True, name="fibonacci")
+
+        assert event == {
+            "n": 10,
+            "result": 55,
+            "ok": True,
+            "name": "fibonacci",
+        }
+
+    def test_big_int_summarized(self):
+        """Test a long result is replaced by a bounded summary."""
+        value = 3**1000
+        text = str(value)
+
+        summary = self._process(result=value)["result"]
+
+        assert summary == {
+            "digits": len(text),
+            "sha256": hashlib.sha256(text.encode()).hexdigest()[:16],
+            "head": text[:16],
+            "tail": text[-16:],
+        }
+
+    def test_decimal_int_uses_rendered_text(self):
+        """Test short DecimalInt values are logged as their text."""
+        value = infra_logging.DecimalInt(2**100)
+
+        assert self._process(result=value)["result"] == str(2**100)
+
+    def test_negative_int_keeps_sign(self):
+        """Test the sign is kept in the head but not counted as a digit."""
+        summary = self._process(result=-(7**200))["result"]
+
+        assert summary["head"] == str(-(7**200))[:17]
+        assert summary["digits"] == len(str(7**200))
+
+    def test_limit_is_configurable(self):
+        """Test the digit limit follows the log_max_int_digits setting."""
+        with patch.object(infra_logging.settings, "log_max_int_digits", 2):
+            assert self._process(result=99)["result"] == 99
+            assert self._process(result=100)["result"]["digits"] == 3
+
+
+class TestSampleEvents:
+    """Tests for sampling of high-volume events."""
+
+    def _process(self, method_name, event):
+        return infra_logging.sample_events(None, method_name, {"event": event})
+
+    def test_sampled_event_dropped(self):
+        """Test a listed info event is dropped at a zero sample rate."""
+        with patch.object(infra_logging.settings, "log_sample_rate", 0.0):
+            with pytest.raises(structlog.DropEvent):
+                self._process("info", "HTTP request processed")
+
+    def test_sampled_event_kept(self):
+        """Test listed events are kept at the default sample rate."""
+        event = self._process("info", "HTTP request processed")
+
+        assert event == {"event": "HTTP request processed"}
+
+    def test_other_events_and_levels_kept(self):
+        """Test unlisted events and warnings are never sampled."""
+        with patch.object(infra_logging.settings, "log_sample_rate", 0.0):
+            assert self._process("info", "Power calculation completed")
+            assert self._process("warning", "HTTP request processed")
+
+
+class TestDroppingQueueHandler:
+    """Tests for the bounded log queue."""
+
+    def test_full_queue_drops_record(self):
+        """Test records beyond the queue size are dropped, not blocked on."""
+        log_queue = queue.Queue(maxsize=1)
+        handler = infra_logging.DroppingQueueHandler(log_queue)
+        dropped = infra_logging.log_records_dropped.labels(reason="queue_full")
+        before = dropped._value.get()
+
+        for message in ("first", "second"):
+            handler.handle(
+                logging.LogRecord(
+                    "test", logging.INFO, __file__, 1, message, None, None
+                )
+            )
+
+        assert log_queue.qsize() == 1
+        assert log_queue.get_nowait().getMessage() == "first"
+        assert dropped._value.get() == before + 1
+
+    def test_async_logging_writes_json_lines(self, capsys):
+        """Test each record reaches stdout as a single JSON object."""
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        try:
+            with patch.object(
+                infra_logging.settings, "log_async_enabled", True
+            ):
+                infra_logging.configure_logging()
+            infra_logging.get_logger("test").info("hello", a=1)
+            infra_logging.stop_logging()
+        finally:
+            root.handlers[:] = handlers
+            root.setLevel(level)
+
+        (line,) = capsys.readouterr().out.splitlines()
+        event = json.loads(line)
+        assert (event["event"], event["a"]) == ("hello", 1)
@@ -1,9 +1,14 @@
 """Tests for Kafka messaging functionality."""
 
+import asyncio
+
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
+from src.infra.events import decode_event
+from src.infra import messaging
 from src.infra.messaging import KafkaProducer
+from src.infra.spool import EventSpool
 
 
 class TestKafkaProducer:
@@ -129,3 +134,215 @@ class TestKafkaProducer:
         )
 
         assert result is False
+
+
+class TestKafkaEventPipeline:
+    """Test the queued, batched event pipeline."""
+
+    def setup_method(self):
+        """Set up a producer with a mocked Kafka client."""
+        self.producer = KafkaProducer()
+        self.mock_producer = AsyncMock()
+        self.sent = []
+
+        async def send(topic, value=None, key=None):
+            self.sent.append((topic, key, value))
+            delivery = asyncio.get_running_loop().create_future()
+            delivery.set_result(None)
+            return delivery
+
+        self.mock_producer.send.side_effect = send
+        self.producer._producer = self.mock_producer
+
+    @pytest.mark.asyncio
+    async def test_events_sent_in_background(self):
+        """Test events are queued and flushed without send_and_wait."""
+        self.producer._start_pipeline()
+
+        for n in range(5):
+            result = await self.producer.send_operation_event(
+                operation_type="fibonacci",
+                parameters={"n": n},
+                result=n,
+                duration_ms=1.0,
+            )
+            assert result is True
+
+        await asyncio.sleep(0)
+        await self.producer.stop()
+
+        assert [value["parameters"]["n"] for _, _, value in self.sent] == [
+            0,
+            1,
+            2,
+            3,
+            4,
+        ]
+        self.mock_producer.send_and_wait.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_queue(self):
+        """Test events still queued at shutdown are sent."""
+        self.producer._start_pipeline()
+        self.producer._flusher.cancel()
+
+        await self.producer.send_api_event(
+            method="GET", endpoint="/health", status_code=200, duration_ms=1.0
+        )
+        await self.producer.stop()
+
+        assert len(self.sent) == 1
+
+    @pytest.mark.asyncio
+    @patch("src.infra.messaging.settings")
+    async def test_drop_newest_when_full(self, mock_settings):
+        """Test new events are dropped when the queue is full."""
+        mock_settings.kafka_queue_size = 2
+        mock_settings.kafka_queue_full_policy = "drop_newest"
+        mock_settings.kafka_flush_batch_size = 10
+        self.producer._start_pipeline()
+        self.producer._flusher.cancel()
+
+        results = [
+            await self.producer.send_api_event(
+                method="GET", endpoint=f"/{i}", status_code=200, duration_ms=1
+            )
+            for i in range(3)
+        ]
+
+        assert results == [True, True, False]
+
+    @pytest.mark.asyncio
+    @patch("src.infra.messaging.settings")
+    async def test_drop_oldest_when_full(self, mock_settings):
+        """Test the oldest event makes room when the queue is full."""
+        mock_settings.kafka_queue_size = 2
+        mock_settings.kafka_queue_full_policy = "drop_oldest"
+        mock_settings.kafka_flush_batch_size = 10
+        self.producer._start_pipeline()
+        self.producer._flusher.cancel()
+
+        for i in range(3):
+            await self.producer.send_api_event(
+                method="GET", endpoint=f"/{i}", status_code=200, duration_ms=1
+            )
+        await self.producer.stop()
+
+        assert [value["endpoint"] for _, _, value in self.sent] == ["/1", "/2"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_events_sent_without_send_and_wait(self):
+        """Test a batch of events is sent in one pass when not queued."""
+        operations = [
+            {
+                "operation_type": "fibonacci",
+                "parameters": {"n": n},
+                "result": n,
+                "duration_ms": 1.0,
+            }
+            for n in range(3)
+        ]
+
+        assert await self.producer.send_operation_events(operations) == 3
+
+        assert [value["result"] for _, _, value in self.sent] == [
+            "0",
+            "1",
+            "2",
+        ]
+        self.mock_producer.send_and_wait.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_binary_encoding_selected_per_topic(self):
+        """Test topics configured for binary get encoded events."""
+        with patch.object(
+            messaging.settings,
+            "kafka_topic_encodings",
+            {messaging.settings.kafka_topic: "binary"},
+        ):
+            await self.producer.send_operation_events(
+                [
+                    {
+                        "operation_type": "fibonacci",
+                        "parameters": {"n": 90},
+                        "result": 2880067194370816120,
+                        "duration_ms": 1.0,
+                    }
+                ]
+            )
+
+        ((_, _, value),) = self.sent
+        assert isinstance(value, bytes)
+        event = decode_event(value)
+        assert event["parameters"] == {"n": 90}
+        assert event["result"]["digits"] == 19
+
+    @pytest.mark.asyncio
+    @patch("src.infra.messaging.settings")
+    async def test_submit_api_event_never_waits(self, mock_settings):
+        """Test submitted API events are queued or dropped synchronously."""
+        mock_settings.kafka_topic = "math-operations"
+        mock_settings.kafka_queue_size = 1
+        mock_settings.kafka_queue_full_policy = "block"
+        mock_settings.kafka_flush_batch_size = 10
+
+        assert not self.producer.submit_api_event("GET", "/", 200, 1.0)
+
+        self.producer._start_pipeline()
+        self.producer._flusher.cancel()
+        results = [
+            self.producer.submit_api_event("GET", f"/{i}", 200, 1.0)
+            for i in range(2)
+        ]
+        await self.producer.stop()
+
+        assert results == [True, False]
+        assert [(key, value["endpoint"]) for _, key, value in self.sent] == [
+            ("GET:/0", "/0")
+        ]
+
+
+class TestKafkaSpool:
+    """Test spooling while Kafka is down and replay once it is back."""
+
+    @pytest.mark.asyncio
+    async def test_events_spooled_then_replayed_in_order(self, tmp_path):
+        """Test events sent while down are delivered in order later."""
+        producer = KafkaProducer()
+        producer._spool = EventSpool(
+            str(tmp_path), segment_bytes=4096, max_bytes=65536, fsync="never"
+        )
+        producer._spool.open()
+
+        for n in range(3):
+            assert await producer.send_operation_event(
+                operation_type="fibonacci",
+                parameters={"n": n},
+                result=n,
+                duration_ms=1.0,
+            )
+        assert producer.submit_api_event("GET", "/health", 200, 1.0)
+
+        sent = []
+
+        async def send(topic, value=None, key=None):
+            sent.append(value)
+            delivery = asyncio.get_running_loop().create_future()
+            delivery.set_result(None)
+            return delivery
+
+        mock_producer = AsyncMock()
+        mock_producer.send.side_effect = send
+        producer._producer = mock_producer
+        producer._start_replay()
+        await asyncio.wait_for(producer._replayer, 1)
+
+        assert [decode_event(value).get("parameters") for value in sent] == [
+            {"n": 0},
+            {"n": 1},
+            {"n": 2},
+            None,
+        ]
+        assert producer._spool.empty
+        assert not producer._spooling()
+        await producer.stop()
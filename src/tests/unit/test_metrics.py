@@ -0,0 +1,78 @@
+"""Unit tests for Prometheus metric helpers."""
+
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+from src.infra import metrics
+
+
+class TestCardinalityGuard:
+    """Tests for the per-metric series cap."""
+
+    def setup_method(self):
+        """Create a guarded counter on a private registry."""
+        self.counter = metrics.BoundedCounter(
+            "test_requests_total",
+            "Test requests",
+            ["endpoint"],
+            registry=CollectorRegistry(),
+        )
+
+    def _value(self, endpoint):
+        return self.counter.labels(endpoint=endpoint)._value.get()
+
+    def test_new_label_sets_collapse_when_full(self):
+        """Test label sets past the cap share the overflow series."""
+        overflow = metrics.metric_series_overflow.labels(
+            metric="test_requests"
+        )
+        before = overflow._value.get()
+
+        with patch.object(metrics.settings, "metrics_max_series", 2):
+            for endpoint in ("/a", "/b", "/c", "/d"):
+                self.counter.labels(endpoint=endpoint).inc()
+            self.counter.labels("/a").inc()
+
+        assert self._value("/a") == 2
+        assert self._value("/b") == 1
+        assert self._value(metrics.OVERFLOW_LABEL) == 2
+        assert overflow._value.get() == before + 2
+        assert self.counter._series == {
+            ("/a",),
+            ("/b",),
+            (metrics.OVERFLOW_LABEL,),
+        }
+
+    def test_label_errors_still_raised(self):
+        """Test wrong label names are reported by prometheus_client."""
+        with pytest.raises(ValueError, match="Incorrect label names"):
+            self.counter.labels(path="/a")
+
+    def test_tracked_series_match_exported_samples(self):
+        """Pin that prometheus_client exports one series per label set."""
+        registry = CollectorRegistry()
+        histogram = metrics.BoundedHistogram(
+            "test_duration_seconds",
+            "Test durations",
+            ["method", "endpoint"],
+            registry=registry,
+        )
+        for method, endpoint in (("GET", "/a"), ("POST", 1), ("GET", "/a")):
+            histogram.labels(method=method, endpoint=endpoint).observe(0.1)
+            self.counter.labels(endpoint).inc()
+
+        (family,) = histogram.collect()
+        exported = {
+            (sample.labels["method"], sample.labels["endpoint"])
+            for sample in family.samples
+            if sample.name == "test_duration_seconds_count"
+        }
+        assert exported == histogram._series == {("GET", "/a"), ("POST", "1")}
+        (family,) = self.counter.collect()
+        assert {
+            (sample.labels["endpoint"],)
+            for sample in family.samples
+            if sample.name == "test_requests_total"
+        } == self.counter._series
@@ -0,0 +1,147 @@
+"""Unit tests for the request metrics middleware."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import middleware
+
+
+def make_scope(path="/api/v1/fibonacci/10"):
+    """Build the scope of a GET request."""
+    return {"type": "http", "method": "GET", "path": path}
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+class TestRequestMetricsMiddleware:
+    """Tests for RequestMetricsMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_records_response_status(self):
+        """Test the request is recorded once with the response status."""
+        sent = []
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 404})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def send(message):
+            sent.append(message["type"])
+
+        with patch.object(
+            middleware.kafka_producer, "submit_api_event"
+        ) as submit:
+            await middleware.RequestMetricsMiddleware(app)(
+                make_scope(), receive, send
+            )
+
+        assert sent == ["http.response.start", "http.response.body"]
+        submit.assert_called_once()
+        assert submit.call_args.kwargs["endpoint"] == "/api/v1/fibonacci/10"
+        assert submit.call_args.kwargs["status_code"] == 404
+        assert submit.call_args.kwargs["duration_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_failed_request_recorded_as_500(self):
+        """Test an unhandled error is still recorded, then re-raised."""
+
+        async def app(scope, receive, send):
+            raise RuntimeError("boom")
+
+        async def send(message):
+            pass
+
+        with patch.object(
+            middleware.kafka_producer, "submit_api_event"
+        ) as submit:
+            with pytest.raises(RuntimeError):
+                await middleware.RequestMetricsMiddleware(app)(
+                    make_scope(), receive, send
+                )
+
+        assert submit.call_args.kwargs["status_code"] == 500
+
+    @pytest.mark.asyncio
+    async def test_non_http_scope_passed_through(self):
+        """Test lifespan and websocket scopes are not recorded."""
+        scopes = []
+
+        async def app(scope, receive, send):
+            scopes.append(scope["type"])
+
+        with patch.object(
+            middleware.kafka_producer, "submit_api_event"
+        ) as submit:
+            await middleware.RequestMetricsMiddleware(app)(
+                {"type": "lifespan"}, receive, None
+            )
+
+        assert scopes == ["lifespan"]
+        submit.assert_not_called()
+
+
+class TestRouteTemplate:
+    """Tests for route template metric labels."""
+
+    def test_matched_route_uses_template(self):
+        """Test a routed request is labelled with its path template."""
+        router = APIRouter(prefix="/v1/fibonacci")
+
+        @router.get("/{n}")
+        async def fibonacci(n: int):
+            return {"n": n}
+
+        api_router = APIRouter(prefix="/api")
+        api_router.include_router(router)
+        app = FastAPI()
+        app.include_router(api_router)
+        app.add_middleware(middleware.RequestMetricsMiddleware)
+
+        with (
+            patch.object(middleware.kafka_producer, "submit_api_event"),
+            patch.object(middleware, "request_count") as request_count,
+        ):
+            TestClient(app).get("/api/v1/fibonacci/12345")
+
+        request_count.labels.assert_called_once_with(
+            method="GET", endpoint="/api/v1/fibonacci/{n}", status_code=200
+        )
+
+    def test_unmatched_path_collapsed(self):
+        """Test paths that matched no route share one label."""
+        assert middleware.route_template(make_scope("/wp-login.php")) == (
+            middleware.UNMATCHED_ROUTE
+        )
+
+    def test_fastapi_scope_contract(self):
+        """Pin the scope keys route_template reads from FastAPI."""
+        router = APIRouter(prefix="/v1/power")
+        scopes = []
+
+        @router.get("/{base}/{exponent}")
+        async def power(base: int, exponent: int):
+            return {}
+
+        api_router = APIRouter(prefix="/api")
+        api_router.include_router(router)
+        app = FastAPI()
+        app.include_router(api_router)
+
+        async def capture(scope, receive, send):
+            scopes.append(scope)
+            await app(scope, receive, send)
+
+        TestClient(capture).get("/api/v1/power/2/10")
+
+        (scope,) = scopes
+        assert scope["path"] == "/api/v1/power/2/10"
+        assert scope["path_params"] == {"base": "2", "exponent": "10"}
+        assert scope["route"].path_format.endswith("/{base}/{exponent}")
+        assert middleware.route_template(scope) == (
+            "/api/v1/power/{base}/{exponent}"
+        )
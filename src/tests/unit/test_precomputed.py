@@ -0,0 +1,165 @@
+"""Tests for the precomputed small-n table."""
+
+import math
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.domain.models import FactorialRequest, PowerRequest
+from src.services import fibonacci, precomputed
+from src.services.factorial import FactorialService
+from src.services.fibonacci import FibonacciService, fibonacci_linear
+from src.services.power import PowerService
+from src.services.precomputed import PrecomputedTable
+
+
+@pytest.fixture
+def small_limits():
+    """Shrink the table so tests build it quickly."""
+    with patch.multiple(
+        precomputed.settings,
+        precomputed_fibonacci_limit=100,
+        precomputed_factorial_limit=50,
+        precomputed_power_max_base=4,
+        precomputed_power_max_exponent=10,
+    ):
+        yield
+
+
+@pytest.fixture
+def loaded_table(small_limits):
+    """Load the global table used by the services."""
+    table = fibonacci.precomputed_table
+    table.load()
+    yield table
+    table.close()
+
+
+class TestPrecomputedTable:
+    """Test building, mapping and querying the table."""
+
+    def test_empty_until_loaded(self):
+        """Test lookups miss before the startup stage runs."""
+        table = PrecomputedTable()
+
+        assert table.loaded is False
+        assert table.fibonacci(10) is None
+        assert table.factorial(5) is None
+        assert table.power(2, 3) is None
+
+    def test_built_in_memory(self, small_limits):
+        """Test every covered value matches direct calculation."""
+        table = PrecomputedTable()
+        table.load()
+
+        assert table.limits == (100, 50, 4, 10)
+        assert [table.fibonacci(n) for n in range(100)] == [
+            fibonacci_linear(n) for n in range(100)
+        ]
+        assert [table.factorial(n) for n in range(50)] == [
+            math.factorial(n) for n in range(50)
+        ]
+        assert table.power(3, 7) == 3**7
+        assert table.power(0, 0) == 1
+
+    def test_out_of_range_misses(self, small_limits):
+        """Test inputs outside the covered ranges are not answered."""
+        table = PrecomputedTable()
+        table.load()
+
+        assert table.fibonacci(100) is None
+        assert table.factorial(-1) is None
+        assert table.power(5, 2) is None
+        assert table.power(-2, 2) is None
+        assert table.power(2, 11) is None
+
+    def test_memory_mapped_file(self, small_limits, tmp_path):
+        """Test the table is written once and then mapped from disk."""
+        path = str(tmp_path / "table.bin")
+        table = PrecomputedTable()
+        table.load(path)
+        table.close()
+        written = os.path.getmtime(path)
+
+        with patch.object(precomputed, "write_table") as write_table:
+            table.load(path)
+
+        write_table.assert_not_called()
+        assert os.path.getmtime(path) == written
+        assert table.fibonacci(99) == fibonacci_linear(99)
+        assert table.factorial(49) == math.factorial(49)
+        assert table.power(4, 10) == 4**10
+        table.close()
+
+    def test_stale_file_is_rebuilt(self, small_limits, tmp_path):
+        """Test a file built for other ranges is replaced."""
+        path = str(tmp_path / "table.bin")
+        table = PrecomputedTable()
+        table.load(path)
+        table.close()
+
+        with patch.object(
+            precomputed.settings, "precomputed_factorial_limit", 60
+        ):
+            table.load(path)
+
+        assert table.factorial(59) == math.factorial(59)
+        table.close()
+
+    def test_hits_are_counted(self, small_limits):
+        """Test lookups are counted by result."""
+        table = PrecomputedTable()
+        table.load()
+        hits = precomputed.precomputed_lookups.labels(
+            operation_type="fibonacci", result="hit"
+        )
+        before = hits._value.get()
+
+        table.fibonacci(10)
+
+        assert hits._value.get() == before + 1
+
+
+class TestServicesUsePrecomputedTable:
+    """Test services answer from the table before the cache."""
+
+    @pytest.mark.asyncio
+    async def test_fibonacci_skips_cache(self, loaded_table):
+        """Test a covered Fibonacci input never reaches the cache."""
+        service = FibonacciService(AsyncMock())
+
+        with patch.object(fibonacci, "cache") as cache:
+            result = await service.calculate_fibonacci(90)
+
+        assert result.result == fibonacci_linear(90)
+        cache.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_factorial_and_power(self, loaded_table):
+        """Test covered factorial and power inputs are answered."""
+        repository = AsyncMock()
+
+        factorial = await FactorialService(repository).calculate_factorial(
+            FactorialRequest(n=20)
+        )
+        power = await PowerService(repository).calculate_power(
+            PowerRequest(base=2, exponent=10)
+        )
+
+        assert factorial.result == math.factorial(20)
+        assert power.result == 1024
+        repository.save_operation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batch_mixes_table_and_computed(self, loaded_table):
+        """Test a batch takes covered inputs from the table."""
+        repository = AsyncMock()
+        service = FibonacciService(repository)
+
+        results = await service.calculate_fibonacci_batch([10, 150])
+
+        assert [r.result for r in results] == [55, fibonacci_linear(150)]
+        # Only the computed input is recorded, as in the single path
+        (operations,) = repository.save_operations.call_args.args
+        assert [op.parameters for op in operations] == [{"n": 150}]
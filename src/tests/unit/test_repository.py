@@ -0,0 +1,216 @@
+"""Tests for SQLite repository persistence."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.domain.models import MathOperation
+from src.infra.db import build_engine, sqlite_pragmas
+from src.repositories import sqlite_repo
+from src.repositories.sqlite_repo import (
+    Base,
+    OperationWriteBuffer,
+    SqliteRepository,
+)
+
+
+def make_operation(n: int) -> MathOperation:
+    """Create a math operation for tests."""
+    return MathOperation(
+        operation_type="fibonacci",
+        parameters={"n": n},
+        result=n,
+        duration_ms=1.0,
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """Create a session factory bound to a fresh SQLite file."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+class SlowSession:
+    """Session stand-in whose inserts take a while to complete."""
+
+    def __init__(self, written):
+        self.written = written
+        self.rows = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, rows):
+        await asyncio.sleep(0.05)
+        self.rows = rows
+
+    async def commit(self):
+        self.written.extend(self.rows)
+
+
+async def count_operations(session_factory) -> int:
+    """Count persisted math operations."""
+    async with session_factory() as session:
+        return await SqliteRepository(session).get_operation_count()
+
+
+class TestOperationWriteBuffer:
+    """Test write-behind batching of math operations."""
+
+    @pytest.mark.asyncio
+    async def test_flush_inserts_batch(self, session_factory):
+        """Test buffered operations are written in one flush."""
+        buffer = OperationWriteBuffer(session_factory)
+        for n in range(10):
+            buffer.add(make_operation(n))
+
+        assert await buffer.flush() == 10
+        assert buffer.pending == 0
+        assert await count_operations(session_factory) == 10
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending(self, session_factory):
+        """Test shutdown writes everything still buffered."""
+        buffer = OperationWriteBuffer(session_factory)
+        await buffer.start()
+        async with session_factory() as session:
+            repository = SqliteRepository(
+                session, durability="write_behind", write_buffer=buffer
+            )
+            for n in range(3):
+                await repository.save_operation(make_operation(n))
+
+        assert buffer.pending == 3
+        await buffer.stop()
+
+        assert await count_operations(session_factory) == 3
+
+    @pytest.mark.asyncio
+    async def test_sync_mode_bypasses_buffer(self, session_factory):
+        """Test callers can still require synchronous writes."""
+        buffer = OperationWriteBuffer(session_factory)
+        await buffer.start()
+        try:
+            async with session_factory() as session:
+                repository = SqliteRepository(
+                    session, durability="sync", write_buffer=buffer
+                )
+                await repository.save_operation(make_operation(1))
+
+            assert buffer.pending == 0
+            assert await count_operations(session_factory) == 1
+        finally:
+            await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_flush_in_progress(self):
+        """Test stopping during an insert neither loses nor drops a batch."""
+        written = []
+        with patch.object(sqlite_repo.settings, "db_write_batch_size", 2):
+            buffer = OperationWriteBuffer(lambda: SlowSession(written))
+            await buffer.start()
+            for n in range(3):
+                buffer.add(make_operation(n))
+            await asyncio.sleep(0.01)  # The flusher is inside execute()
+            await buffer.stop()
+
+        assert len(written) == 3
+        assert buffer.pending == 0
+
+    def test_full_buffer_drops_oldest(self):
+        """Test the buffer stays bounded by evicting the oldest operation."""
+        with patch.object(sqlite_repo.settings, "db_write_max_pending", 3):
+            buffer = OperationWriteBuffer()
+        for n in range(5):
+            buffer.add(make_operation(n))
+
+        assert buffer.pending == 3
+        assert [op.parameters["n"] for op in buffer._pending] == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_writes_synchronously_when_not_started(
+        self, session_factory
+    ):
+        """Test operations are not lost when no flusher is running."""
+        buffer = OperationWriteBuffer(session_factory)
+        async with session_factory() as session:
+            repository = SqliteRepository(
+                session, durability="write_behind", write_buffer=buffer
+            )
+            await repository.save_operation(make_operation(1))
+
+        assert await count_operations(session_factory) == 1
+
+
+class TestBulkSave:
+    """Test bulk persistence of math operations."""
+
+    @pytest.mark.asyncio
+    async def test_save_operations_inserts_all(self, session_factory):
+        """Test a batch is written in one synchronous insert."""
+        async with session_factory() as session:
+            repository = SqliteRepository(session, durability="sync")
+            await repository.save_operations(
+                [make_operation(n) for n in range(5)]
+            )
+
+        assert await count_operations(session_factory) == 5
+
+    @pytest.mark.asyncio
+    async def test_save_operations_buffered(self, session_factory):
+        """Test a batch is handed to a running write buffer."""
+        buffer = OperationWriteBuffer(session_factory)
+        await buffer.start()
+        async with session_factory() as session:
+            repository = SqliteRepository(
+                session, durability="write_behind", write_buffer=buffer
+            )
+            await repository.save_operations(
+                [make_operation(n) for n in range(4)]
+            )
+
+        assert buffer.pending == 4
+        await buffer.stop()
+        assert await count_operations(session_factory) == 4
+
+
+class TestSqliteProfile:
+    """Test the SQLite performance profile."""
+
+    @pytest.mark.asyncio
+    async def test_pragmas_applied_to_connections(self, tmp_path):
+        """Test every pooled connection gets the tuned PRAGMAs."""
+        engine = build_engine(f"sqlite:///{tmp_path}/tuned.db")
+        try:
+            async with engine.connect() as conn:
+                journal_mode = await conn.execute(text("PRAGMA journal_mode"))
+                synchronous = await conn.execute(text("PRAGMA synchronous"))
+                busy_timeout = await conn.execute(text("PRAGMA busy_timeout"))
+
+                assert journal_mode.scalar() == "wal"
+                assert synchronous.scalar() == 1  # NORMAL
+                assert busy_timeout.scalar() == 5000
+        finally:
+            await engine.dispose()
+
+    def test_profile_can_be_disabled(self):
+        """Test an empty PRAGMA list when tuning is disabled."""
+        from src.infra import db
+
+        db.settings.sqlite_tuning_enabled = False
+        try:
+            assert sqlite_pragmas() == []
+        finally:
+            db.settings.sqlite_tuning_enabled = True
@@ -0,0 +1,292 @@
+"""Tests for the windowed rollup consumer."""
+
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from aiokafka.structs import TopicPartition
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.infra.events import encode_event
+from src.infra.messaging import KafkaProducer
+from src.infra.rollups import (
+    NS_PER_SECOND,
+    RollupAggregator,
+    RollupConsumer,
+    percentile,
+)
+from src.repositories.sqlite_repo import Base, SqliteRollupRepository
+
+TOPIC = "math-operations"
+PARTITION = TopicPartition(TOPIC, 0)
+WINDOW = 60 * NS_PER_SECOND
+T0 = 1_700_000_040 * NS_PER_SECOND  # A window boundary
+
+
+def operation(timestamp_ns, duration_ms=1.0, success=True, kind="power"):
+    return {
+        "event_type": "math_operation",
+        "operation_type": kind,
+        "parameters": {"base": 2, "exponent": 3},
+        "result": 8,
+        "duration_ms": duration_ms,
+        "success": success,
+        "error": None if success else "boom",
+        "timestamp_ns": timestamp_ns,
+    }
+
+
+def request(timestamp_ns, status_code=200, duration_ms=1.0):
+    return {
+        "event_type": "api_request",
+        "method": "GET",
+        "endpoint": "/health",
+        "status_code": status_code,
+        "duration_ms": duration_ms,
+        "user_agent": None,
+        "timestamp_ns": timestamp_ns,
+    }
+
+
+class FakeBroker:
+    """In-process stand-in for Kafka: one partition per topic."""
+
+    def __init__(self):
+        self.logs = defaultdict(list)
+        self.committed = {}
+
+    async def send(self, topic, value=None, key=None):
+        """Append a record, like AIOKafkaProducer.send."""
+        if not isinstance(value, bytes):
+            value = json.dumps(value).encode("utf-8")
+        log = self.logs[topic]
+        log.append(SimpleNamespace(offset=len(log), key=key, value=value))
+        delivery = asyncio.get_running_loop().create_future()
+        delivery.set_result(None)
+        return delivery
+
+    async def send_and_wait(self, topic, value=None, key=None):
+        """Append a record and return once it is stored."""
+        return await (await self.send(topic, value=value, key=key))
+
+    def consumer(self, topic=TOPIC):
+        """Create a consumer resuming from the committed offset."""
+        return FakeConsumer(self, TopicPartition(topic, 0))
+
+
+class FakeConsumer:
+    """The subset of AIOKafkaConsumer used by RollupConsumer."""
+
+    def __init__(self, broker, partition):
+        self.broker = broker
+        self.partition = partition
+        self.position = broker.committed.get(partition, 0)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def getmany(self, timeout_ms=0, max_records=None):
+        log = self.broker.logs[self.partition.topic]
+        records = log[self.position : self.position + max_records]
+        self.position += len(records)
+        return {self.partition: records} if records else {}
+
+    async def commit(self, offsets):
+        self.broker.committed.update(offsets)
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """Create a session factory bound to a fresh SQLite file."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def stored_rollups(session_factory):
+    """Return stored rollups keyed by (window start, event type, name)."""
+    async with session_factory() as session:
+        rollups = await SqliteRollupRepository(session).get_rollups()
+    return {(r.window_start, r.event_type, r.name): r for r in rollups}
+
+
+class TestRollupAggregator:
+    """Tests for windowed aggregation."""
+
+    def test_counts_percentiles_and_errors(self):
+        """Test a closed window reports counts, percentiles and errors."""
+        aggregator = RollupAggregator(window_seconds=60)
+        for i in range(100):
+            aggregator.add(
+                operation(T0 + i, duration_ms=i + 1, success=i >= 5)
+            )
+        aggregator.add(request(T0, status_code=503))
+        aggregator.add(request(T0, status_code=404))
+
+        assert aggregator.close() == []
+        aggregator.add(operation(T0 + WINDOW))
+        api, power = sorted(aggregator.close(), key=lambda r: r.event_type)
+
+        assert (api.event_type, api.name) == ("api_request", "GET")
+        assert (api.count, api.errors) == (2, 1)
+        assert (power.event_type, power.name) == ("math_operation", "power")
+        assert (power.count, power.errors, power.error_rate) == (100, 5, 0.05)
+        assert (power.p50_ms, power.p95_ms, power.p99_ms) == (50, 95, 99)
+        assert power.window_start == datetime.fromtimestamp(
+            T0 // NS_PER_SECOND, timezone.utc
+        )
+
+    def test_late_events_dropped_after_lateness(self):
+        """Test a window accepts events until allowed lateness has passed."""
+        aggregator = RollupAggregator(
+            window_seconds=60, allowed_lateness_seconds=10
+        )
+        aggregator.add(operation(T0))
+        aggregator.add(operation(T0 + WINDOW + 5 * NS_PER_SECOND))
+        assert aggregator.close() == []
+        assert aggregator.add(operation(T0 + 1)) == T0
+
+        aggregator.add(operation(T0 + WINDOW + 10 * NS_PER_SECOND))
+        (rollup,) = aggregator.close()
+        assert rollup.count == 2
+        assert aggregator.add(operation(T0 + 2)) is None
+
+    def test_samples_bounded(self):
+        """Test percentiles use a bounded sample of large windows."""
+        aggregator = RollupAggregator(
+            window_seconds=60, max_samples=50, rng=random.Random(1)
+        )
+        for i in range(1000):
+            aggregator.add(operation(T0 + i, duration_ms=i))
+        (window,) = aggregator._windows.values()
+        assert len(window.samples) == 50
+
+        aggregator.add(operation(T0 + WINDOW, kind="factorial"))
+        (rollup,) = aggregator.close()
+        assert rollup.count == 1000
+        assert 300 < rollup.p50_ms < 700
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles."""
+        assert percentile([], 0.5) == 0.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 0.99) == 4.0
+
+
+class TestRollupConsumer:
+    """Tests for the consumer against an in-process broker."""
+
+    @pytest.mark.asyncio
+    async def test_produced_events_rolled_up(self, session_factory):
+        """Test events from KafkaProducer end up as stored rollups."""
+        broker = FakeBroker()
+        producer = KafkaProducer()
+        producer._producer = broker
+        await producer.send_operation_events(
+            [
+                {
+                    "operation_type": "fibonacci",
+                    "parameters": {"n": n},
+                    "result": n,
+                    "duration_ms": float(n),
+                    "success": n != 3,
+                }
+                for n in range(1, 5)
+            ]
+        )
+        await producer.send_api_event("GET", "/health", 200, 2.0)
+        later = time.time_ns() + WINDOW
+        await broker.send(TOPIC, encode_event(request(later), "binary"))
+        await broker.send(TOPIC, b"not an event")
+
+        consumer = RollupConsumer(
+            broker.consumer(),
+            RollupAggregator(window_seconds=60),
+            session_factory,
+        )
+        await consumer.start()
+        assert await consumer.poll() == 7
+        await consumer.stop()
+
+        rollups = {
+            (event_type, name): rollup
+            for (_, event_type, name), rollup in (
+                await stored_rollups(session_factory)
+            ).items()
+        }
+        fibonacci = rollups[("math_operation", "fibonacci")]
+        assert (fibonacci.count, fibonacci.errors) == (4, 1)
+        assert fibonacci.p99_ms == 4.0
+        assert rollups[("api_request", "GET")].count == 1
+        # The record of the still-open window is not committed
+        assert broker.committed == {PARTITION: 5}
+
+    @pytest.mark.asyncio
+    async def test_restart_does_not_double_count(self, session_factory):
+        """Test a restarted consumer rebuilds open windows only."""
+        broker = FakeBroker()
+        events = [
+            operation(T0),
+            operation(T0 + WINDOW),
+            operation(T0 + 2),  # Read again after the restart
+            operation(T0 + 2 * WINDOW),
+        ]
+        for event in events[:3]:
+            await broker.send(TOPIC, encode_event(event, "binary"))
+
+        first = RollupConsumer(
+            broker.consumer(), RollupAggregator(60), session_factory
+        )
+        await first.start()
+        await first.poll()
+        await first.stop()
+        assert broker.committed == {PARTITION: 1}
+
+        await broker.send(TOPIC, encode_event(events[3], "json"))
+        second = RollupConsumer(
+            broker.consumer(), RollupAggregator(60), session_factory
+        )
+        await second.start()
+        await second.poll()
+
+        counts = {
+            key[0]: rollup.count
+            for key, rollup in (await stored_rollups(session_factory)).items()
+        }
+        assert sorted(counts.values()) == [1, 2]
+        assert broker.committed == {PARTITION: 3}
+
+    @pytest.mark.asyncio
+    async def test_malformed_event_mid_batch_skipped(self, session_factory):
+        """Test a malformed event does not stop the rest of its batch."""
+        broker = FakeBroker()
+        bad = json.loads(encode_event(operation(T0 + 1), "json"))
+        bad["duration_ms"] = "fast"
+        events = [
+            encode_event(operation(T0), "json"),
+            json.dumps(bad).encode("utf-8"),
+            encode_event(operation(T0 + 2), "json"),
+            encode_event(operation(T0 + WINDOW), "json"),
+        ]
+        for value in events:
+            await broker.send(TOPIC, value)
+
+        consumer = RollupConsumer(
+            broker.consumer(), RollupAggregator(60), session_factory
+        )
+        await consumer.start()
+        assert await consumer.poll() == 4
+
+        (rollup,) = (await stored_rollups(session_factory)).values()
+        assert rollup.count == 2
+        assert broker.committed == {PARTITION: 3}
@@ -1,11 +1,30 @@
 """Unit tests for services."""
 
+import math
+
 import pytest
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 from src.domain.models import FactorialRequest, PowerRequest
-from src.services.factorial import FactorialService
-from src.services.fibonacci import FibonacciService
+from src.api.responses import DecimalJSONResponse, render_json
+from src.api.streaming import ndjson_terms
+from src.services import factorial, fibonacci
+from src.services.factorial import (
+    FactorialService,
+    factorial_binary_split,
+    factorial_iterative,
+    factorial_many,
+    factorial_range,
+)
+from src.services.fibonacci import (
+    FibonacciMemo,
+    FibonacciService,
+    fibonacci_advance,
+    fibonacci_fast_doubling,
+    fibonacci_linear,
+    fibonacci_pair,
+    fibonacci_range,
+)
 from src.services.power import PowerService
 
 
@@ -148,3 +167,314 @@ class TestFactorialService:
 
         assert result.n == 1
         assert result.result == 1  # 1! = 1
+
+
+class TestFibonacciEngines:
+    """Tests for the Fibonacci algorithm engines."""
+
+    def test_fast_doubling_matches_linear(self):
+        """Test fast doubling agrees with the linear reference loop."""
+        for n in range(0, 300):
+            assert fibonacci_fast_doubling(n) == fibonacci_linear(n)
+
+    def test_fast_doubling_known_values(self):
+        """Test fast doubling against known Fibonacci numbers."""
+        assert fibonacci_fast_doubling(0) == 0
+        assert fibonacci_fast_doubling(1) == 1
+        assert fibonacci_fast_doubling(10) == 55
+        assert fibonacci_fast_doubling(100) == 354224848179261915075
+
+    def test_fibonacci_pair(self):
+        """Test fast doubling returns consecutive Fibonacci numbers."""
+        a, b = fibonacci_pair(5000)
+        assert a == fibonacci_linear(5000)
+        assert b == fibonacci_linear(5001)
+
+    @pytest.mark.asyncio
+    async def test_linear_engine_selectable(self):
+        """Test the linear reference engine can be selected."""
+        service = FibonacciService(AsyncMock(), engine="linear")
+
+        result = await service.calculate_fibonacci(90)
+
+        assert result.result == fibonacci_fast_doubling(90)
+
+    def test_unknown_engine_rejected(self):
+        """Test an unknown engine name is rejected."""
+        with pytest.raises(ValueError, match="Unknown Fibonacci engine"):
+            FibonacciService(AsyncMock(), engine="matrix")
+
+
+class TestFibonacciMemo:
+    """Tests for the shared Fibonacci checkpoint memo."""
+
+    def test_advance_matches_direct(self):
+        """Test advancing a pair lands on the expected Fibonacci numbers."""
+        pair = fibonacci_pair(1000)
+        assert fibonacci_advance(pair, 0) == pair
+        assert fibonacci_advance(pair, 777) == fibonacci_pair(1777)
+
+    def test_memo_stores_sparse_checkpoints(self):
+        """Test only checkpoint indices are stored."""
+        memo = FibonacciMemo(interval=100, max_checkpoints=10)
+
+        assert memo.fibonacci(450) == fibonacci_linear(450)
+        assert len(memo) == 1
+        assert memo.nearest(499) == (400, fibonacci_pair(400))
+
+    def test_memo_is_bounded(self):
+        """Test the least recently used checkpoints are evicted."""
+        memo = FibonacciMemo(interval=10, max_checkpoints=3)
+
+        for n in (15, 25, 35, 45):
+            memo.fibonacci(n)
+
+        assert len(memo) == 3
+        assert memo.nearest(19) == (0, (0, 1))
+
+    def test_linear_resumes_from_checkpoint(self):
+        """Test the linear engine records and reuses checkpoints."""
+        memo = FibonacciMemo(interval=64, max_checkpoints=100)
+
+        assert memo.fibonacci_linear(300) == fibonacci_fast_doubling(300)
+        assert len(memo) == 4
+        assert memo.fibonacci_linear(310) == fibonacci_fast_doubling(310)
+        assert memo.nearest(310)[0] == 256
+
+    @pytest.mark.asyncio
+    async def test_memo_shared_between_services(self):
+        """Test separate service instances share one memo."""
+        memo = FibonacciMemo(interval=100, max_checkpoints=10)
+        first = FibonacciService(AsyncMock(), memo=memo)
+        second = FibonacciService(AsyncMock(), memo=memo)
+
+        await first.calculate_fibonacci(250)
+        result = await second.calculate_fibonacci(260)
+
+        assert memo.nearest(260)[0] == 200
+        assert result.result == fibonacci_linear(260)
+
+
+class TestFactorialEngines:
+    """Tests for the factorial algorithm engines."""
+
+    def test_binary_split_matches_math(self):
+        """Test binary splitting agrees with math.factorial."""
+        for n in range(0, 600):
+            assert factorial_binary_split(n) == math.factorial(n)
+        assert factorial_binary_split(5000) == math.factorial(5000)
+
+    def test_iterative_matches_math(self):
+        """Test the iterative reference loop agrees with math.factorial."""
+        assert factorial_iterative(0) == 1
+        assert factorial_iterative(300) == math.factorial(300)
+
+    @pytest.mark.asyncio
+    async def test_service_beyond_float_range(self):
+        """Test factorials above 170 are served."""
+        service = FactorialService(AsyncMock())
+
+        result = await service.calculate_factorial(FactorialRequest(n=1000))
+
+        assert result.result == math.factorial(1000)
+
+    def test_unknown_engine_rejected(self):
+        """Test an unknown engine name is rejected."""
+        with pytest.raises(ValueError, match="Unknown factorial engine"):
+            FactorialService(AsyncMock(), engine="gamma")
+
+
+class TestBatchCalculations:
+    """Tests for batch calculations."""
+
+    def test_fibonacci_many_shares_one_pass(self):
+        """Test the ascending pass agrees with direct calculation."""
+        ns = [5000, 3, 0, 1024, 3, 777]
+
+        for memo_method in ("fibonacci_many", "fibonacci_linear_many"):
+            memo = FibonacciMemo(interval=256, max_checkpoints=100)
+            results = getattr(memo, memo_method)(ns)
+            assert results == {n: fibonacci_fast_doubling(n) for n in ns}
+
+    def test_factorial_many_running_product(self):
+        """Test the running product agrees with math.factorial."""
+        ns = [0, 1, 17, 400, 401, 2500]
+
+        for engine in ("binary_split", "iterative"):
+            results = factorial_many(ns, engine)
+            assert results == {n: math.factorial(n) for n in ns}
+
+    @pytest.mark.asyncio
+    async def test_fibonacci_batch_keeps_request_order(self):
+        """Test results follow the request, duplicates included."""
+        repository = AsyncMock()
+        service = FibonacciService(repository)
+
+        results = await service.calculate_fibonacci_batch([10, 1, 10, 20])
+
+        assert [(r.n, r.result) for r in results] == [
+            (10, 55),
+            (1, 1),
+            (10, 55),
+            (20, 6765),
+        ]
+        repository.save_operations.assert_awaited_once()
+        assert len(repository.save_operations.await_args.args[0]) == 4
+
+    @pytest.mark.asyncio
+    async def test_fibonacci_batch_uses_cached_values(self):
+        """Test cached values are served without recomputation."""
+        service = FibonacciService(AsyncMock())
+        await fibonacci.cache.set("math:fibonacci:n=30", 12345)
+
+        results = await service.calculate_fibonacci_batch([30, 31])
+
+        assert [r.result for r in results] == [12345, 1346269]
+
+    @pytest.mark.asyncio
+    async def test_factorial_batch(self):
+        """Test a factorial batch is computed and saved in bulk."""
+        repository = AsyncMock()
+        service = FactorialService(repository)
+
+        results = await service.calculate_factorial_batch(
+            [FactorialRequest(n=n) for n in (5, 0, 300)]
+        )
+
+        assert [r.result for r in results] == [120, 1, math.factorial(300)]
+        repository.save_operations.assert_awaited_once()
+        repository.save_operation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_power_batch(self):
+        """Test a power batch is computed and saved in bulk."""
+        repository = AsyncMock()
+        service = PowerService(repository)
+
+        results = await service.calculate_power_batch(
+            [
+                PowerRequest(base=2, exponent=10),
+                PowerRequest(base=3, exponent=3),
+            ]
+        )
+
+        assert [r.result for r in results] == [1024, 27]
+        repository.save_operations.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_batch_validates_every_item(self):
+        """Test one invalid item rejects the whole batch."""
+        repository = AsyncMock()
+        service = PowerService(repository)
+
+        with pytest.raises(ValueError):
+            await service.calculate_power_batch(
+                [
+                    PowerRequest(base=2, exponent=3),
+                    PowerRequest(base=10000, exponent=10000),
+                ]
+            )
+        repository.save_operations.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_is_limited(self):
+        """Test batches above max_batch_size are rejected."""
+        service = FibonacciService(AsyncMock())
+        too_many = list(range(fibonacci.settings.max_batch_size + 1))
+
+        with pytest.raises(ValueError, match="Batch size"):
+            await service.calculate_fibonacci_batch(too_many)
+
+
+class TestSequenceStreams:
+    """Tests for streamed sequence ranges."""
+
+    def test_fibonacci_range_from_running_pair(self):
+        """Test each term of a range matches direct calculation."""
+        terms = list(fibonacci_range(1000, 1300))
+
+        assert [n for n, _ in terms] == list(range(1000, 1301))
+        assert all(value == fibonacci_pair(n)[0] for n, value in terms)
+
+    def test_factorial_range_from_running_product(self):
+        """Test each term of a range matches math.factorial."""
+        terms = list(factorial_range(0, 300))
+
+        assert all(value == math.factorial(n) for n, value in terms)
+
+    @pytest.mark.asyncio
+    async def test_service_stream(self):
+        """Test the service yields the requested range in order."""
+        service = FactorialService(AsyncMock())
+
+        terms = [term async for term in service.stream_factorial(3, 6)]
+
+        assert terms == [(3, 6), (4, 24), (5, 120), (6, 720)]
+
+    @pytest.mark.asyncio
+    async def test_stream_seed_goes_through_executor(self):
+        """Test the first term of a stream is costed and can be offloaded."""
+        for module, stream in (
+            (factorial, FactorialService(AsyncMock()).stream_factorial),
+            (fibonacci, FibonacciService(AsyncMock()).stream_fibonacci),
+        ):
+            executor = AsyncMock()
+            executor.should_offload = Mock(return_value=False)
+            executor.run.side_effect = lambda func, *args, **kwargs: func(
+                *args
+            )
+            with patch.object(module, "compute_executor", executor):
+                terms = [term async for term in stream(2000, 2001)]
+
+            assert [n for n, _ in terms] == [2000, 2001]
+            assert executor.run.await_args.kwargs["cost"] > 0
+
+    def test_stream_validated_before_iteration(self):
+        """Test invalid ranges are rejected when the stream is created."""
+        service = FibonacciService(AsyncMock())
+
+        with pytest.raises(ValueError, match="Start must be <= end"):
+            service.stream_fibonacci(10, 5)
+        with pytest.raises(ValueError, match="N must be <="):
+            service.stream_fibonacci(0, fibonacci.settings.max_fibonacci_n + 1)
+
+    @pytest.mark.asyncio
+    async def test_ndjson_stops_when_client_disconnects(self):
+        """Test the stream is closed early once the client is gone."""
+        service = FibonacciService(AsyncMock())
+        terms = service.stream_fibonacci(0, 10000)
+        request = Mock()
+        request.is_disconnected = AsyncMock(return_value=True)
+
+        lines = [line async for line in ndjson_terms(request, terms)]
+
+        assert len(lines) == 64
+        assert lines[10] == '{"n": 10, "result": 55}\n'
+        with pytest.raises(StopAsyncIteration):
+            await terms.__anext__()
+
+
+class TestRenderedResults:
+    """Tests for results carried with their decimal text."""
+
+    @pytest.mark.asyncio
+    async def test_computed_result_is_rendered_and_cached(self):
+        """Test a computed result is cached together with its text."""
+        service = FactorialService(AsyncMock())
+
+        result = await service.calculate_factorial(FactorialRequest(n=900))
+
+        assert result.result.rendered == str(math.factorial(900))
+        cached = await fibonacci.cache.get("math:factorial:n=900")
+        assert cached is result.result
+
+    def test_response_reuses_rendered_text(self):
+        """Test responses write the cached text verbatim."""
+        value = fibonacci.DecimalInt(55, "55")
+
+        body = DecimalJSONResponse({"n": 10, "result": value}).body
+
+        assert body == b'{"n": 10, "result": 55}'
+        assert render_json({"ok": True, "items": [1, None, "a"]}) == (
+            '{"ok": true, "items": [1, null, "a"]}'
+        )
@@ -0,0 +1,98 @@
+"""Unit tests for the local Kafka event spool."""
+
+import json
+import os
+
+from src.infra.spool import EventSpool
+
+
+def make_spool(directory, **overrides):
+    """Create and open a spool in directory."""
+    options = dict(segment_bytes=1024, max_bytes=1024 * 1024, fsync="never")
+    options.update(overrides)
+    spool = EventSpool(str(directory), **options)
+    spool.open()
+    return spool
+
+
+def event(n):
+    return ("math-operations", "fibonacci", json.dumps({"n": n}).encode())
+
+
+class TestEventSpool:
+    """Tests for EventSpool."""
+
+    def test_events_read_in_order_and_committed(self, tmp_path):
+        """Test events come back in append order until committed."""
+        spool = make_spool(tmp_path)
+        assert spool.empty
+
+        spool.append([event(0), event(1)])
+        spool.append([event(2)])
+        events, consumed = spool.read(2)
+
+        assert [json.loads(e[2])["n"] for e in events] == [0, 1]
+        assert spool.read(10)[0][0] == event(0)
+
+        spool.commit(consumed)
+        events, consumed = spool.read(10)
+        assert events == [event(2)]
+        spool.commit(consumed)
+
+        assert spool.empty
+        assert os.listdir(tmp_path) == []
+
+    def test_segments_roll_over_and_are_removed(self, tmp_path):
+        """Test segments roll at segment_bytes and are deleted once read."""
+        spool = make_spool(tmp_path, segment_bytes=100)
+        for n in range(5):
+            spool.append([event(n)])
+        assert len(os.listdir(tmp_path)) > 1
+
+        replayed = []
+        while not spool.empty:
+            events, consumed = spool.read(10)
+            replayed.extend(json.loads(e[2])["n"] for e in events)
+            spool.commit(consumed)
+
+        assert replayed == [0, 1, 2, 3, 4]
+        assert os.listdir(tmp_path) == []
+
+    def test_full_spool_drops_new_events(self, tmp_path):
+        """Test appends beyond max_bytes are dropped."""
+        spool = make_spool(tmp_path, max_bytes=120)
+
+        assert spool.append([event(0), event(1), event(2)]) == 2
+        assert spool.size <= 120
+
+    def test_survives_restart(self, tmp_path):
+        """Test unread events are replayed by the next process."""
+        spool = make_spool(tmp_path, fsync="always")
+        spool.append([event(0), event(1)])
+        spool.close()
+
+        restarted = make_spool(tmp_path)
+        restarted.append([event(2)])
+
+        replayed = []
+        while not restarted.empty:
+            events, consumed = restarted.read(10)
+            replayed.extend(json.loads(e[2])["n"] for e in events)
+            restarted.commit(consumed)
+        assert replayed == [0, 1, 2]
+
+    def test_torn_record_skipped(self, tmp_path):
+        """Test a record cut short by a crash ends its segment."""
+        spool = make_spool(tmp_path)
+        spool.append([event(0), event(1)])
+        spool.close()
+        (segment,) = os.listdir(tmp_path)
+        path = tmp_path / segment
+        path.write_bytes(path.read_bytes()[:-5])
+
+        restarted = make_spool(tmp_path)
+        events, consumed = restarted.read(10)
+        restarted.commit(consumed)
+
+        assert events == [event(0)]
+        assert restarted.empty